@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import StudentProfile, Project, ProjectView, ProjectLike, StudentFollow, Notification, RecruiterProfile
+from .models import StudentProfile, Project, ProjectView, ProjectLike, StudentFollow, Notification, RecruiterProfile, Tag
 
 @admin.register(RecruiterProfile)
 class RecruiterProfileAdmin(admin.ModelAdmin):
@@ -43,3 +43,4 @@ admin.site.register(ProjectView)
 admin.site.register(ProjectLike)
 admin.site.register(StudentFollow)
 admin.site.register(Notification)
+admin.site.register(Tag)
@@ -1,9 +1,31 @@
 from django.contrib.auth.decorators import user_passes_test
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
+from django.http import HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from accounts.models import StudentProfile, Project
+from accounts.facets import category_facets, course_facets, year_facets
+from accounts import developer_snapshots, exports, student_import
+from accounts.image_derivatives import prefetch_variants
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.core.paginator import Paginator
+from django.utils import timezone
 from django.utils.timesince import timesince
 
+# Students per page of the admin profiles list
+PROFILES_PAGE_SIZE = 30
+
+# Projects per page of the admin project listings
+ADMIN_PROJECTS_PAGE_SIZE = 24
+
+# Sort options of the admin project listings; the id tie-break keeps pages stable
+ADMIN_PROJECT_SORTS = {
+    'recent': ('-created_at', '-id'),
+    'oldest': ('created_at', 'id'),
+    'views': ('-views_count', '-id'),
+    'likes': ('-likes_count', '-id'),
+    'title': ('title', 'id'),
+}
+
 def admin_required(view_func):
     decorated_view_func = user_passes_test(lambda u: u.is_superuser)(view_func)
     return decorated_view_func
@@ -17,12 +39,56 @@ def admin_home(request):
         'total_projects': total_projects,
     })
 
+def admin_project_queryset(params, student=None):
+    """
+    Projects for the admin listings, filtered and sorted by the request's
+    `visibility`, `category`, `student` and `sort` parameters. Each row carries
+    its student and its view/like counters, so rendering needs no more queries.
+    Returns (queryset, applied filters).
+    """
+    projects = Project.objects.select_related('student')
+    filters = {}
+
+    visibility = params.get('visibility', '').strip()
+    if visibility in ('Public', 'Private'):
+        projects = projects.filter(visibility=visibility)
+        filters['visibility'] = visibility
+
+    category = params.get('category', '').strip()
+    if category:
+        projects = projects.filter(category=category)
+        filters['category'] = category
+
+    if student is None:
+        student_id = params.get('student', '').strip()
+        if student_id.isdigit():
+            student = get_object_or_404(StudentProfile, id=int(student_id))
+    if student is not None:
+        projects = projects.filter(student=student)
+        filters['student'] = student
+
+    sort = params.get('sort', '')
+    if sort not in ADMIN_PROJECT_SORTS:
+        sort = 'recent'
+    filters['sort'] = sort
+    return projects.order_by(*ADMIN_PROJECT_SORTS[sort]), filters
+
 @admin_required
 def admin_projects(request):
-    # Get all projects ordered by most recent first
-    projects = Project.objects.all().order_by('-created_at')
+    projects, filters = admin_project_queryset(request.GET)
+    page = Paginator(projects, ADMIN_PROJECTS_PAGE_SIZE).get_page(request.GET.get('page'))
+    prefetch_variants(page, 'screenshot')
+
+    # Current filters, for the pager links
+    query = request.GET.copy()
+    query.pop('page', None)
+
     return render(request, 'accounts/admin_projects.html', {
-        'projects': projects
+        'projects': page,
+        'filters': filters,
+        'filter_query': query.urlencode(),
+        'categories': category_facets(),
+        'sorts': ADMIN_PROJECT_SORTS,
     })
 
 @admin_required
@@ -35,41 +101,47 @@ def admin_profiles(request):
         if search_query:
             students = students.filter(student_name__icontains=search_query)
         
-        # Month filter
+        # Month filter (on the stored joined_month column, which is indexed)
         month = request.GET.get('month', '').strip()
         selected_month = month  # Store original value for template
         if month and month.isdigit():
             month_int = int(month)
             if 1 <= month_int <= 12:  # Validate month range
-                students = students.filter(course_joined_date__month=month_int)
+                students = students.filter(joined_month=month_int)
         
         # Year filter
         year = request.GET.get('year', '').strip()
         selected_year = year  # Store original value for template
         if year and year.isdigit():
-            students = students.filter(course_joined_date__year=int(year))
+            students = students.filter(joined_year=int(year))
         
         # Course filter
         course = request.GET.get('course', '').strip()
         if course:
             students = students.filter(course_details__icontains=course)
         
-        # Get unique years and courses for filter options
-        unique_years = StudentProfile.objects.dates('course_joined_date', 'year', order='DESC')
-        unique_courses = StudentProfile.objects.exclude(course_details='').values_list('course_details', flat=True).distinct().order_by('course_details')
-        
-        # Order the results
-        students = students.order_by('student_name')
-
-        # Calculate derived properties for each student to use in template
-        for student in students:
-            # number of projects
-            student.projects_count = student.projects.count()
-            # total views across all projects
-            student.projects_views = sum(p.views.count() for p in student.projects.all())
+        # Cached year and course filter options, with student counts
+        unique_years = year_facets()
+        unique_courses = course_facets()
         
+        # Project count and total project views per student, as correlated
+        # subqueries over the denormalized Project counters
+        student_projects = Project.objects.filter(student=OuterRef('pk')).order_by().values('student')
+        students = students.annotate(
+            projects_count=Coalesce(Subquery(student_projects.annotate(n=Count('pk')).values('n')), 0),
+            projects_views=Coalesce(Subquery(student_projects.annotate(n=Sum('views_count')).values('n')), 0),
+        ).order_by('student_name', 'id')
+
+        page = Paginator(students, PROFILES_PAGE_SIZE).get_page(request.GET.get('page'))
+        prefetch_variants(page, 'image')
+
+        # Current filters, for the pager links
+        filters = request.GET.copy()
+        filters.pop('page', None)
+
         context = {
-            'students': students,
+            'students': page,
+            'filter_query': filters.urlencode(),
             'unique_years': unique_years,
             'unique_courses': unique_courses,
             'months': [
@@ -94,22 +166,70 @@ def admin_profiles(request):
     
     return render(request, 'accounts/admin_profiles.html', context)
 
+@admin_required
+def export_data(request, kind):
+    """Download every student or project as CSV (default) or NDJSON (?format=ndjson), streamed."""
+    fmt = request.GET.get('format', 'csv')
+    try:
+        chunks = exports.stream(kind, fmt)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    response = StreamingHttpResponse(chunks, content_type=exports.FORMATS[fmt])
+    filename = f'{kind}-{timezone.now():%Y%m%d-%H%M}.{fmt}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@admin_required
+def import_students(request):
+    """
+    Bulk-create students from an uploaded CSV or JSON `file` (see accounts.student_import).
+    Valid rows are imported, invalid ones reported; `dry_run=1` only validates.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'success': False, 'error': 'Invalid request.'})
+    upload = request.FILES.get('file')
+    if upload is None:
+        return JsonResponse({'success': False, 'error': 'Upload a CSV or JSON file as "file".'})
+    try:
+        rows = student_import.parse(upload.read(), student_import.format_for(upload.name))
+    except (ValueError, UnicodeDecodeError) as e:
+        return JsonResponse({'success': False, 'error': f'Could not read {upload.name}: {e}'})
+    result = student_import.import_students(rows, dry_run=request.POST.get('dry_run') == '1')
+    return JsonResponse({
+        'success': True,
+        'rows': len(rows),
+        'created': result['created'],
+        'errors': result['errors'],
+        'candidates': StudentProfile.objects.count(),
+    })
+
 @admin_required
 def student_projects_api(request, student_id):
     student = get_object_or_404(StudentProfile, id=student_id)
-    projects = student.projects.all().order_by('-created_at')
+    projects, filters = admin_project_queryset(request.GET, student=student)
+    page = Paginator(projects, ADMIN_PROJECTS_PAGE_SIZE).get_page(request.GET.get('page'))
     
     projects_data = [{
         'id': project.id,
         'title': project.title,
         'description': project.description,
+        'category': project.category,
+        'visibility': project.visibility,
         'project_link': project.project_link,
         'output_link': project.output_link,
         'screenshot': project.screenshot.url if project.screenshot else None,
+        'views': project.views_count,
+        'likes': project.likes_count,
         'created_at_display': timesince(project.created_at)
-    } for project in projects]
+    } for project in page]
     
-    return JsonResponse({'projects': projects_data})
+    return JsonResponse({
+        'projects': projects_data,
+        'page': page.number,
+        'num_pages': page.paginator.num_pages,
+        'has_next': page.has_next(),
+        'sort': filters['sort'],
+    })
 
 @admin_required
 def student_project_details(request, student_id):
@@ -122,10 +242,12 @@ def student_project_details(request, student_id):
         'is_admin': True
     })
 
-def public_student_projects(request):
-    students = StudentProfile.objects.all().order_by('student_name')
-    for student in students:
-        student.public_projects = student.projects.filter(visibility='Public').order_by('-created_at')
-    return render(request, 'accounts/public_student_projects.html', {
-        'students': students
-    })
+def public_student_projects(request, page=1):
+    # Anonymous visitors get the pre-rendered page (see accounts.developer_snapshots);
+    # the trending section's own ?page= pager is always rendered live
+    if not request.user.is_authenticated and 'page' not in request.GET:
+        response = developer_snapshots.serve(request, page)
+        if response is not None:
+            return response
+    return render(request, 'accounts/public_student_projects.html',
+                  developer_snapshots.page_context(page, request.GET.get('page')))
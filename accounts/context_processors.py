@@ -1,13 +1,7 @@
-from .models import Notification
+from .notification_cache import student_id_for_user, unread_count
 
 def notifications_processor(request):
-    unread_count = 0
-    if request.user.is_authenticated and not request.user.is_superuser:
-        try:
-            unread_count = Notification.objects.filter(
-                recipient=request.user.student_profile,
-                is_read=False
-            ).count()
-        except:
-            pass
-    return {'unread_notifications_count': unread_count}
\ No newline at end of file
+    student_id = student_id_for_user(request.user)
+    if student_id is None:
+        return {'unread_notifications_count': 0}
+    return {'unread_notifications_count': unread_count(student_id)}
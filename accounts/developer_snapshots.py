@@ -0,0 +1,227 @@
+"""
+Pre-rendered snapshots of the public developers directory (/developers/).
+
+The directory is crawler-facing and identical for every anonymous visitor, so
+each page of it is rendered once to ``DEVELOPERS_SNAPSHOT_ROOT/page-N.html``
+and anonymous requests are answered straight from that file, without touching
+the database or the template engine.
+
+Pages are kept current incrementally, off the request thread: after a
+StudentProfile or Project change commits, the student's id is queued for a
+background thread, which waits DEVELOPERS_SNAPSHOT_DELAY seconds so a burst of
+saves is handled in one pass. ``refresh_pages()`` then recomputes the ordered list of listed students (one
+query on ids) and re-renders only the pages whose students changed position,
+or that show the changed student. ``manifest.json`` records which students each
+page was rendered with. ``manage.py rebuild_developer_snapshots`` re-renders
+everything, e.g. after a deploy.
+
+Snapshots leave out what can't be shared or frozen: the logout form (its CSRF
+token is per visitor) and the trending section, which changes with every like
+and view. They link to the trending section instead, and that link (with its
+``?page=``) is always rendered live.
+
+Snapshots are only written when the DEVELOPERS_SNAPSHOTS setting is on.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.paginator import InvalidPage, Paginator
+from django.db import close_old_connections, transaction
+from django.db.models import Count, Q
+from django.http import FileResponse, Http404, HttpRequest, HttpResponseNotModified
+from django.template.loader import render_to_string
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .image_derivatives import prefetch_variants
+from .models import Project, StudentProfile
+from .prefetch import prefetch_top_n
+from .trending import FEED_PAGE_SIZE, trending_projects
+
+TEMPLATE = 'accounts/public_student_projects.html'
+
+# Students per page of the directory
+PAGE_SIZE = 30
+
+# Student ids waiting for the background refresh
+_pending = set()
+_scheduled = False
+_lock = threading.Lock()
+_executor = None
+
+
+def enabled():
+    return getattr(settings, 'DEVELOPERS_SNAPSHOTS', False)
+
+
+def _delay():
+    return float(getattr(settings, 'DEVELOPERS_SNAPSHOT_DELAY', 2))
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None:
+            # One thread, so refreshes never overlap within a process
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='developer-snapshots')
+        return _executor
+
+
+def snapshot_root():
+    return Path(getattr(settings, 'DEVELOPERS_SNAPSHOT_ROOT', Path(settings.BASE_DIR) / 'snapshots' / 'developers'))
+
+
+def _page_path(number):
+    return snapshot_root() / f'page-{number}.html'
+
+
+def listed_students():
+    """Students with at least one public project, in directory order, with their count and newest one."""
+    return StudentProfile.objects.annotate(
+        public_project_count=Count('projects', filter=Q(projects__visibility='Public'))
+    ).filter(public_project_count__gt=0).order_by('student_name', 'id').prefetch_related(
+        prefetch_top_n(
+            'projects', Project.objects.filter(visibility='Public'),
+            'student', 1, ['-created_at', '-id'], to_attr='public_projects',
+        )
+    )
+
+
+def page_context(number=1, trending_page=None, snapshot=False):
+    """
+    Template context for page `number` of the directory; Http404 past the last
+    page. A `snapshot` context has no trending section.
+    """
+    try:
+        students = Paginator(listed_students(), PAGE_SIZE, allow_empty_first_page=True).page(number)
+    except InvalidPage:
+        raise Http404('No such page')
+    prefetch_variants(students, 'image')
+    if snapshot:
+        return {'students': students, 'snapshot': True}
+    # Trending public projects, one page at a time
+    trending = Paginator(
+        trending_projects().select_related('student'), FEED_PAGE_SIZE
+    ).get_page(trending_page)
+    return {'students': students, 'trending_projects': trending}
+
+
+def _render(number):
+    request = HttpRequest()
+    request.method = 'GET'
+    request.user = AnonymousUser()
+    return render_to_string(TEMPLATE, page_context(number, snapshot=True), request=request)
+
+
+def _write(path, content):
+    """Replace `path` atomically, so readers never see a half-written page."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _read_manifest():
+    try:
+        return json.loads((snapshot_root() / 'manifest.json').read_text())
+    except (OSError, ValueError):
+        return {'pages': []}
+
+
+def refresh_pages(student_ids=None):
+    """
+    Re-render the pages that changed since they were last written: pages whose
+    list of students differs, that show one of `student_ids`, or all of them if
+    `student_ids` is None or the number of pages changed. Stale trailing pages
+    are removed. Returns the page numbers written.
+    """
+    ids = list(listed_students().values_list('id', flat=True))
+    pages = [ids[i:i + PAGE_SIZE] for i in range(0, len(ids), PAGE_SIZE)] or [[]]
+    old_pages = _read_manifest()['pages']
+    everything = student_ids is None or len(old_pages) != len(pages)
+    touched = set(student_ids or ())
+
+    written = []
+    for number, page_ids in enumerate(pages, 1):
+        old = old_pages[number - 1] if number <= len(old_pages) else None
+        if everything or old != page_ids or touched.intersection(page_ids) or not _page_path(number).exists():
+            _write(_page_path(number), _render(number))
+            written.append(number)
+
+    for number in range(len(pages) + 1, len(old_pages) + 1):
+        _page_path(number).unlink(missing_ok=True)
+    _write(snapshot_root() / 'manifest.json', json.dumps({'pages': pages}))
+    return written
+
+
+def _refresh(student_ids):
+    try:
+        refresh_pages(student_ids)
+    except Exception as e:
+        # A stale snapshot is better than a failed save; the next change or rebuild fixes it
+        print(f"Error refreshing developer snapshots: {str(e)}")
+
+
+def _refresh_pending():
+    global _scheduled
+    time.sleep(_delay())
+    with _lock:
+        student_ids = list(_pending)
+        _pending.clear()
+        _scheduled = False
+    try:
+        _refresh(student_ids)
+    finally:
+        close_old_connections()
+
+
+def _queue(student_id):
+    global _scheduled
+    with _lock:
+        _pending.add(student_id)
+        if _scheduled:
+            return
+        _scheduled = True
+    _pool().submit(_refresh_pending)
+
+
+def schedule_refresh(student_id):
+    """
+    Refresh the pages showing `student_id` after the current transaction
+    commits: in the background, or inline if DEVELOPERS_SNAPSHOT_DELAY is 0.
+    """
+    if not enabled():
+        return
+    if _delay() <= 0:
+        transaction.on_commit(lambda: _refresh([student_id]))
+    else:
+        transaction.on_commit(lambda: _queue(student_id))
+
+
+def serve(request, number):
+    """The snapshot of page `number` as a response, or None if there isn't one."""
+    if not enabled():
+        return None
+    path = _page_path(number)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+    response = FileResponse(path.open('rb'), content_type='text/html; charset=utf-8')
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
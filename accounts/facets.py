@@ -0,0 +1,74 @@
+"""
+Cached filter options ("facets") for the talent, admin and project pages.
+
+Each facet is a list of ``{'value', 'label', 'count'}`` dicts, computed with
+one grouped query on first use and cached until a StudentProfile (courses,
+years) or Project (tags, categories) is saved or deleted (see
+accounts.signals). The FACET_CACHE_TIMEOUT setting bounds staleness for
+changes that bypass signals, such as ``QuerySet.update()`` or other workers'
+per-process caches.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Project, StudentProfile, Tag
+
+COURSES_KEY = 'accounts:facets:courses'
+YEARS_KEY = 'accounts:facets:years'
+TAGS_KEY = 'accounts:facets:tags'
+CATEGORIES_KEY = 'accounts:facets:categories'
+
+
+def _timeout():
+    return getattr(settings, 'FACET_CACHE_TIMEOUT', 3600)
+
+
+def _compute_courses():
+    rows = (StudentProfile.objects.exclude(course_details='')
+            .values('course_details').annotate(count=Count('id')).order_by('course_details'))
+    return [{'value': r['course_details'], 'label': r['course_details'], 'count': r['count']} for r in rows]
+
+
+def _compute_years():
+    rows = (StudentProfile.objects.values('joined_year')
+            .annotate(count=Count('id')).order_by('-joined_year'))
+    return [{'value': r['joined_year'], 'label': str(r['joined_year']), 'count': r['count']} for r in rows]
+
+
+def _compute_tags():
+    rows = Tag.objects.with_project_counts().values('key', 'name', 'project_count')
+    return [{'value': r['key'], 'label': r['name'], 'count': r['project_count']} for r in rows]
+
+
+def _compute_categories():
+    rows = Project.objects.values('category').annotate(count=Count('id')).order_by('category')
+    return [{'value': r['category'], 'label': r['category'], 'count': r['count']} for r in rows]
+
+
+def course_facets():
+    """Distinct student courses, alphabetically, with the number of students in each."""
+    return cache.get_or_set(COURSES_KEY, _compute_courses, _timeout())
+
+
+def year_facets():
+    """Course joining years, newest first, with the number of students who joined that year."""
+    return cache.get_or_set(YEARS_KEY, _compute_years, _timeout())
+
+
+def tag_facets():
+    """Tags on public projects, alphabetically, with their public project counts."""
+    return cache.get_or_set(TAGS_KEY, _compute_tags, _timeout())
+
+
+def category_facets():
+    """Project categories, alphabetically, with the number of projects (public or not) in each."""
+    return cache.get_or_set(CATEGORIES_KEY, _compute_categories, _timeout())
+
+
+def invalidate_student_facets():
+    cache.delete_many([COURSES_KEY, YEARS_KEY])
+
+
+def invalidate_project_facets():
+    cache.delete_many([TAGS_KEY, CATEGORIES_KEY])
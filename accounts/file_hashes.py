@@ -0,0 +1,210 @@
+"""
+SHA-256 inventory of the files under media/, static/ and templates/, written to
+``scan_reports/file_hashes.csv`` (``manage.py export_file_hashes``).
+
+Runs are incremental. ``file_hashes_manifest.json`` records the size, mtime and
+hash of every file seen, and a file is only re-read when its size or mtime
+changed. Files that do need hashing are spread over a thread pool: hashlib
+releases the GIL on large buffers, so the threads hash in parallel. Larger
+files are hashed straight from an mmap, smaller ones in one buffered read.
+
+Every run writes the full CSV and ``file_hashes_diff.csv``, which lists the
+files added, changed (different content) or removed since the previous run,
+and those that could not be read (``error``; their last known hash is kept).
+Without a manifest, the previous CSV is the baseline for the diff.
+"""
+import csv
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+TARGET_DIRS = ('media', 'static', 'templates')
+
+CSV_NAME = 'file_hashes.csv'
+DIFF_NAME = 'file_hashes_diff.csv'
+MANIFEST_NAME = 'file_hashes_manifest.json'
+MANIFEST_VERSION = 1
+
+# Files at least this large are hashed from an mmap, smaller ones read whole
+MMAP_THRESHOLD = 4 * 1024 * 1024
+BUFFER_SIZE = 1024 * 1024
+
+
+def base_dir():
+    return Path(settings.BASE_DIR)
+
+
+def report_dir():
+    return base_dir() / 'scan_reports'
+
+
+def hash_file(path):
+    """SHA-256 hex digest of the file at `path`."""
+    with open(path, 'rb', buffering=0) as f:
+        # Size of the open file, not the scan's: it may have changed since
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return hashlib.sha256(mapped).hexdigest()
+        digest = hashlib.sha256()
+        buffer = bytearray(BUFFER_SIZE)
+        view = memoryview(buffer)
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+        return digest.hexdigest()
+
+
+def _walk(directory):
+    """(path, size, mtime_ns) of every regular file under `directory`, via scandir's cached stats."""
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk(entry.path)
+            elif entry.is_file():
+                st = entry.stat()
+                yield entry.path, st.st_size, st.st_mtime_ns
+        except OSError:
+            continue
+
+
+def scan(root, targets=TARGET_DIRS):
+    """{relative posix path: (absolute path, size, mtime_ns)} for the files under `targets` of `root`."""
+    found = {}
+    for target in targets:
+        for path, size, mtime_ns in _walk(os.path.join(root, target)):
+            found[Path(path).relative_to(root).as_posix()] = (path, size, mtime_ns)
+    return found
+
+
+def _read_manifest(out_dir):
+    try:
+        manifest = json.loads((out_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest['files']
+
+
+def _read_csv(out_dir):
+    """{path: sha256} from the previous CSV (paths normalised to '/'), or {}."""
+    try:
+        with (out_dir / CSV_NAME).open(newline='', encoding='utf-8') as f:
+            return {
+                row['path'].replace('\\', '/'): row['sha256']
+                for row in csv.DictReader(f)
+                if not row['sha256'].startswith('ERROR')
+            }
+    except (OSError, KeyError):
+        return {}
+
+
+def _write(path, write_rows):
+    """Write the CSV produced by `write_rows(writer)` to `path` atomically."""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            write_rows(f)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def diff(old, new, errors=()):
+    """
+    [(status, path, old sha256, new sha256)] between two {path: sha256} maps,
+    sorted by path. Paths in `errors` exist but couldn't be hashed.
+    """
+    rows = []
+    for path in sorted(old.keys() | new.keys() | set(errors)):
+        before, after = old.get(path), new.get(path)
+        if path in errors:
+            rows.append(('error', path, before or '', ''))
+        elif before is None:
+            rows.append(('added', path, '', after))
+        elif after is None:
+            rows.append(('removed', path, before, ''))
+        elif before != after:
+            rows.append(('changed', path, before, after))
+    return rows
+
+
+def export(root=None, out_dir=None, targets=TARGET_DIRS, workers=None, full=False):
+    """
+    Hash the files under `targets` of `root` (BASE_DIR), re-using the manifest
+    unless `full`, and write the CSV, diff and manifest to `out_dir`
+    (scan_reports/). Returns counts: files, hashed, errors, added, changed, removed.
+    """
+    root = Path(root or base_dir())
+    out_dir = Path(out_dir or report_dir())
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = _read_manifest(out_dir)
+    if previous is None:
+        baseline = _read_csv(out_dir)
+        previous = {}
+    else:
+        baseline = {path: entry[2] for path, entry in previous.items()}
+
+    files = scan(root, targets)
+    hashes, errors, pending = {}, {}, []
+    for path, (absolute, size, mtime_ns) in files.items():
+        known = previous.get(path)
+        if not full and known and known[0] == size and known[1] == mtime_ns:
+            hashes[path] = known[2]
+        else:
+            pending.append(path)
+
+    def work(path):
+        try:
+            return path, hash_file(files[path][0]), None
+        except (OSError, ValueError) as e:
+            # ValueError: mmap of a file truncated to 0 bytes since the scan
+            return path, None, e
+
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='file-hashes') as pool:
+        for path, digest, error in pool.map(work, pending):
+            if error is None:
+                hashes[path] = digest
+            else:
+                errors[path] = error
+
+    def write_csv(f):
+        writer = csv.writer(f)
+        writer.writerow(['path', 'sha256'])
+        for path in sorted(files):
+            writer.writerow([path, hashes[path] if path in hashes else f'ERROR: {errors[path]}'])
+
+    changes = diff(baseline, hashes, errors)
+
+    def write_diff(f):
+        writer = csv.writer(f)
+        writer.writerow(['status', 'path', 'old_sha256', 'new_sha256'])
+        writer.writerows(changes)
+
+    _write(out_dir / CSV_NAME, write_csv)
+    _write(out_dir / DIFF_NAME, write_diff)
+    manifest = {path: [files[path][1], files[path][2], digest] for path, digest in hashes.items()}
+    # Files that failed keep their last known hash for the next diff, with no
+    # size/mtime so the next run hashes them again
+    manifest.update({path: [None, None, baseline[path]] for path in errors if path in baseline})
+    _write(out_dir / MANIFEST_NAME, lambda f: json.dump({'version': MANIFEST_VERSION, 'files': manifest}, f))
+
+    counts = {'files': len(files), 'hashed': len(pending) - len(errors), 'errors': len(errors)}
+    for status in ('added', 'changed', 'removed'):
+        counts[status] = sum(1 for change in changes if change[0] == status)
+    return counts
@@ -0,0 +1,233 @@
+"""
+Resized WebP/JPEG derivatives of uploaded screenshots, avatars and logos.
+
+When a Project, StudentProfile or RecruiterProfile is saved with an image,
+``schedule()`` hands the file to a small background thread pool (after the
+transaction commits) which:
+
+* hashes the file's content (SHA-256),
+* writes ``derivatives/<hash>/<width>.webp`` and ``.jpg`` for each of the
+  field's WIDTHS narrower than the original, unless that hash was already
+  processed (identical uploads share one set of files),
+* records the result in an ImageDerivatives row for the upload's name.
+
+Templates use ``{% picture %}`` / ``{% srcset %}`` from the ``images`` tag
+library, which read that row through the cache and fall back to the original
+file until derivatives exist. Views rendering grids call ``prefetch_variants()``
+first, so the rows of a whole page are fetched together. ``manage.py generate_image_derivatives``
+backfills existing media.
+
+IMAGE_DERIVATIVE_WORKERS sets the pool size; 0 generates inline (tests,
+management commands).
+"""
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .models import ImageDerivatives
+
+logger = logging.getLogger(__name__)
+
+# Target widths per image field name
+WIDTHS = {
+    'screenshot': (320, 640, 1280),
+    'image': (96, 192, 384),
+    'company_logo': (128, 256),
+}
+
+# Derivative formats: file extension -> (Pillow format, save options)
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+ROOT = 'derivatives'
+CACHE_KEY = 'accounts:images:{}'
+CACHE_TIMEOUT = 24 * 3600
+MISS_TIMEOUT = 60
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _workers():
+    return getattr(settings, 'IMAGE_DERIVATIVE_WORKERS', 2)
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix='image-derivatives')
+        return _executor
+
+
+def _cache_key(name):
+    # Upload names may contain characters memcached keys can't
+    return CACHE_KEY.format(hashlib.md5(name.encode()).hexdigest())
+
+
+def derivative_name(content_hash, width, ext):
+    return f'{ROOT}/{content_hash}/{width}.{ext}'
+
+
+def _render(image, width, ext):
+    fmt, options = FORMATS[ext]
+    height = round(image.height * width / image.width)
+    resized = image.resize((width, height), Image.LANCZOS)
+    if fmt == 'JPEG' and resized.mode != 'RGB':
+        # JPEG has no alpha: flatten onto white
+        background = Image.new('RGB', resized.size, (255, 255, 255))
+        background.paste(resized, mask=resized.getchannel('A') if 'A' in resized.getbands() else None)
+        resized = background
+    out = io.BytesIO()
+    resized.save(out, fmt, **options)
+    return out.getvalue()
+
+
+def generate(name, field_name, force=False):
+    """
+    Create the derivatives of the stored file `name` (an upload of `field_name`)
+    and record them. Returns the ImageDerivatives row, or None if the file is
+    missing or not an image.
+    """
+    if not force:
+        existing = ImageDerivatives.objects.filter(source=name).first()
+        if existing is not None:
+            return existing
+    try:
+        with default_storage.open(name, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    content_hash = hashlib.sha256(data).hexdigest()
+    try:
+        image = Image.open(io.BytesIO(data))
+        image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, OSError):
+        return None
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info or image.mode in ('LA', 'PA') else 'RGB')
+
+    widths = [w for w in WIDTHS.get(field_name, WIDTHS['screenshot']) if w < image.width]
+    for width in widths:
+        for ext in FORMATS:
+            target = derivative_name(content_hash, width, ext)
+            # Same content, same files: another upload may have made them already
+            if default_storage.exists(target):
+                if not force:
+                    continue
+                default_storage.delete(target)
+            default_storage.save(target, ContentFile(_render(image, width, ext)))
+
+    row, _ = ImageDerivatives.objects.update_or_create(source=name, defaults={
+        'content_hash': content_hash,
+        'width': image.width,
+        'height': image.height,
+        'widths': widths,
+    })
+    cache.delete(_cache_key(name))
+    return row
+
+
+def _generate_in_background(name, field_name):
+    try:
+        generate(name, field_name)
+    except Exception:
+        logger.exception('Could not generate derivatives of %s', name)
+    finally:
+        close_old_connections()
+
+
+def schedule(fieldfile):
+    """Generate derivatives of `fieldfile` once the current transaction commits."""
+    if not fieldfile:
+        return
+    name, field_name = fieldfile.name, fieldfile.field.name
+    if _workers() <= 0:
+        transaction.on_commit(lambda: generate(name, field_name))
+    else:
+        transaction.on_commit(lambda: _pool().submit(_generate_in_background, name, field_name))
+
+
+def discard(name):
+    """
+    Forget the derivatives of the stored file `name`, deleting their files
+    unless another upload with the same content still uses them.
+    """
+    rows = ImageDerivatives.objects.filter(source=name)
+    hashes = set(rows.values_list('content_hash', flat=True))
+    rows.delete()
+    cache.delete(_cache_key(name))
+    for content_hash in hashes:
+        if ImageDerivatives.objects.filter(content_hash=content_hash).exists():
+            continue
+        directory = f'{ROOT}/{content_hash}'
+        try:
+            _, files = default_storage.listdir(directory)
+        except OSError:
+            continue
+        for filename in files:
+            default_storage.delete(f'{directory}/{filename}')
+
+
+def _lookup(names):
+    """{name: (content_hash, widths) or ()} for `names`: one cache round trip, at most one query."""
+    keys = {_cache_key(name): name for name in names}
+    cached = cache.get_many(keys)
+    found = {keys[key]: value for key, value in cached.items()}
+    missing = [name for name in names if name not in found]
+    if missing:
+        rows = {
+            source: (content_hash, widths)
+            for source, content_hash, widths in ImageDerivatives.objects.filter(source__in=missing)
+            .values_list('source', 'content_hash', 'widths')
+        }
+        # Misses are cached briefly too, so pages don't query for every image
+        # still waiting for (or without) derivatives
+        cache.set_many({_cache_key(name): rows[name] for name in rows}, CACHE_TIMEOUT)
+        cache.set_many({_cache_key(name): () for name in missing if name not in rows}, MISS_TIMEOUT)
+        for name in missing:
+            found[name] = rows.get(name, ())
+    return found
+
+
+def prefetch_variants(objects, field_name):
+    """
+    Look up the derivatives of the `field_name` image of every object in
+    `objects` at once, so a grid of {% picture %} tags costs one cache round
+    trip and at most one query instead of one per card. Returns `objects`.
+    """
+    fieldfiles = [fieldfile for fieldfile in (getattr(obj, field_name) for obj in objects) if fieldfile]
+    found = _lookup({fieldfile.name for fieldfile in fieldfiles})
+    for fieldfile in fieldfiles:
+        fieldfile._derivatives = found[fieldfile.name]
+    return objects
+
+
+def variants(fieldfile):
+    """
+    [(width, {ext: url})] for the derivatives of `fieldfile`, narrowest first;
+    empty until they have been generated.
+    """
+    if not fieldfile:
+        return []
+    found = getattr(fieldfile, '_derivatives', None)
+    if found is None:
+        found = _lookup({fieldfile.name})[fieldfile.name]
+    if not found:
+        return []
+    content_hash, widths = found
+    return [
+        (width, {ext: default_storage.url(derivative_name(content_hash, width, ext)) for ext in FORMATS})
+        for width in widths
+    ]
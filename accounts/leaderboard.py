@@ -0,0 +1,192 @@
+"""
+Materialized top-students leaderboard for the recruiter dashboard.
+
+``refresh_leaderboard()`` computes every student's totals in one query, using
+correlated subqueries over the denormalized Project counters and the
+(following, status) follow index, so view history is never joined or
+multiplied. Only rows whose totals or score changed are written. The
+dashboard then reads the top N from the ``-score`` index.
+
+Scores are the weighted sum of the totals, with weights taken from the
+LEADERBOARD_WEIGHTS setting. The dashboard only reads the table. It is kept
+current incrementally, off the request thread: project, follow, like and
+profile-view changes queue their student's id once they commit, and a
+background thread waits LEADERBOARD_REFRESH_DELAY seconds so a burst of
+changes is handled in one pass, then refreshes only those students.
+``manage.py refresh_leaderboard`` recomputes everyone (run on deploy, and
+after a weights change).
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import LeaderboardEntry, Project, StudentFollow, StudentProfile
+
+METRICS = ('project_count', 'project_views', 'project_likes', 'profile_views', 'followers')
+
+DEFAULT_WEIGHTS = {
+    'project_count': 10.0,
+    'project_views': 1.0,
+    'project_likes': 3.0,
+    'profile_views': 0.5,
+    'followers': 2.0,
+}
+
+BATCH_SIZE = 500
+
+# Student ids waiting for the background refresh
+_pending = set()
+_scheduled = False
+_lock = threading.Lock()
+_executor = None
+
+
+def weights():
+    configured = getattr(settings, 'LEADERBOARD_WEIGHTS', {})
+    return {metric: float(configured.get(metric, DEFAULT_WEIGHTS[metric])) for metric in METRICS}
+
+
+def per_student(queryset, field, aggregate):
+    """Correlated subquery: `aggregate` over the rows of `queryset` whose `field` is the outer student."""
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by().values(field).annotate(total=aggregate).values('total')
+    ), Value(0), output_field=IntegerField())
+
+
+def student_totals(student_ids=None):
+    """Yield (student_id, {metric: total}) for every student (or those in `student_ids`), from a single query."""
+    students = StudentProfile.objects.all()
+    if student_ids is not None:
+        students = students.filter(id__in=student_ids)
+    # `followers` is a reverse relation on StudentProfile, so annotate under another name
+    rows = students.annotate(
+        project_count=per_student(Project.objects.all(), 'student', Count('pk')),
+        project_views=per_student(Project.objects.all(), 'student', Sum('views_count')),
+        project_likes=per_student(Project.objects.all(), 'student', Sum('likes_count')),
+        follower_total=per_student(StudentFollow.objects.filter(status='accepted'), 'following', Count('pk')),
+    ).values_list('id', 'project_count', 'project_views', 'project_likes', 'profile_views', 'follower_total')
+    for row in rows.iterator(chunk_size=2000):
+        yield row[0], dict(zip(METRICS, row[1:]))
+
+
+def score(totals, weights):
+    return round(sum(totals[metric] * weights[metric] for metric in METRICS), 4)
+
+
+def refresh_leaderboard(full=False, student_ids=None):
+    """
+    Bring LeaderboardEntry in line with the current totals and weights, for
+    every student or only those in `student_ids`. Only changed rows are
+    written unless `full` is set. Returns (written, students).
+    """
+    current_weights = weights()
+    now = timezone.now()
+    entries = LeaderboardEntry.objects.all()
+    if student_ids is not None:
+        entries = entries.filter(student_id__in=student_ids)
+    stored = {
+        row[0]: row[1:]
+        for row in entries.values_list('student_id', *METRICS, 'score').iterator(chunk_size=2000)
+    }
+
+    changed, students = [], 0
+    for student_id, totals in student_totals(student_ids):
+        students += 1
+        values = tuple(totals[metric] for metric in METRICS) + (score(totals, current_weights),)
+        if full or stored.get(student_id) != values:
+            changed.append(LeaderboardEntry(student_id=student_id, refreshed_at=now, **dict(
+                zip(METRICS + ('score',), values)
+            )))
+
+    with transaction.atomic():
+        for start in range(0, len(changed), BATCH_SIZE):
+            LeaderboardEntry.objects.bulk_create(
+                changed[start:start + BATCH_SIZE],
+                update_conflicts=True,
+                unique_fields=['student'],
+                update_fields=[*METRICS, 'score', 'refreshed_at'],
+            )
+    return len(changed), students
+
+
+def _delay():
+    return float(getattr(settings, 'LEADERBOARD_REFRESH_DELAY', 5))
+
+
+def _pool():
+    global _executor
+    with _lock:
+        if _executor is None:
+            # One thread, so refreshes never overlap within a process
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='leaderboard')
+        return _executor
+
+
+def _refresh(student_ids):
+    try:
+        refresh_leaderboard(student_ids=student_ids)
+    except Exception as e:
+        # A stale rank is better than a failed save; the next change or full refresh fixes it
+        print(f"Error refreshing leaderboard: {str(e)}")
+
+
+def _refresh_pending():
+    global _scheduled
+    time.sleep(_delay())
+    with _lock:
+        student_ids = list(_pending)
+        _pending.clear()
+        _scheduled = False
+    try:
+        _refresh(student_ids)
+    finally:
+        close_old_connections()
+
+
+def _queue(student_ids):
+    global _scheduled
+    with _lock:
+        _pending.update(student_ids)
+        if _scheduled:
+            return
+        _scheduled = True
+    _pool().submit(_refresh_pending)
+
+
+def schedule_refresh(*student_ids):
+    """
+    Refresh the entries of `student_ids` after the current transaction
+    commits: in the background, or inline if LEADERBOARD_REFRESH_DELAY is 0.
+    """
+    student_ids = [student_id for student_id in student_ids if student_id is not None]
+    if not student_ids:
+        return
+    if _delay() <= 0:
+        transaction.on_commit(lambda: _refresh(student_ids))
+    else:
+        transaction.on_commit(lambda: _queue(student_ids))
+
+
+def top_students(limit=6):
+    """
+    The `limit` best-ranked students, with their leaderboard totals attached
+    as `project_count`, `total_views`, `total_likes`, `followers_count` and `score`.
+    """
+    entries = LeaderboardEntry.objects.select_related('student').order_by('-score', 'student_id')[:limit]
+    students = []
+    for entry in entries:
+        student = entry.student
+        student.project_count = entry.project_count
+        student.total_views = entry.project_views
+        student.total_likes = entry.project_likes
+        student.followers_count = entry.followers
+        student.score = entry.score
+        students.append(student)
+    return students
@@ -0,0 +1,95 @@
+import datetime
+import time
+import tracemalloc
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from accounts import exports
+from accounts.models import Project, StudentProfile
+
+BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway test database and time the streaming student/project exports, '
+            'reporting throughput and peak Python memory for each format')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1_000_000, help='Seeded projects (default 1,000,000)')
+        parser.add_argument('--students', type=int, default=100_000, help='Seeded students (default 100,000)')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            started = time.monotonic()
+            self._seed(options['students'], options['projects'])
+            self.stdout.write(
+                f"Seeded {options['students']} students and {options['projects']} projects "
+                f'in {time.monotonic() - started:.0f}s'
+            )
+            self.stdout.write(f"{'export':<10}{'format':<8}{'rows':>10}{'seconds':>9}{'rows/s':>10}"
+                              f"{'output MB':>11}{'peak MB':>9}")
+            for kind in exports.EXPORTS:
+                for fmt in exports.FORMATS:
+                    self._run(kind, fmt)
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def _run(self, kind, fmt):
+        tracemalloc.start()
+        started = time.monotonic()
+        size = rows = 0
+        for chunk in exports.stream(kind, fmt):
+            size += len(chunk)
+            rows += chunk.count(b'\n')
+        elapsed = time.monotonic() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if fmt == 'csv':
+            rows -= 1  # header
+        self.stdout.write(
+            f'{kind:<10}{fmt:<8}{rows:>10}{elapsed:>9.1f}{rows / max(elapsed, 1e-9):>10.0f}'
+            f'{size / 2**20:>11.1f}{peak / 2**20:>9.1f}'
+        )
+
+    def _seed(self, student_count, project_count):
+        password = make_password(None)
+        today = datetime.date.today()
+        for start in range(0, student_count, BATCH_SIZE):
+            users = User.objects.bulk_create([
+                User(username=f'export_student_{i}', password=password)
+                for i in range(start, min(start + BATCH_SIZE, student_count))
+            ])
+            StudentProfile.objects.bulk_create([
+                StudentProfile(
+                    user=user,
+                    student_name=user.username,
+                    student_contact='',
+                    student_email=f'{user.username}@example.com',
+                    student_address='',
+                    course_joined_date=today,
+                    course_details='Python Full Stack',
+                    joined_year=today.year,
+                    joined_month=today.month,
+                )
+                for user in users
+            ])
+
+        student_ids = list(StudentProfile.objects.values_list('id', flat=True))
+        for start in range(0, project_count, BATCH_SIZE):
+            Project.objects.bulk_create([
+                Project(
+                    student_id=student_ids[i % len(student_ids)],
+                    title=f'Project {i}',
+                    tags='django, python',
+                    views_count=i % 97,
+                    likes_count=i % 13,
+                    visibility='Public' if i % 4 else 'Private',
+                )
+                for i in range(start, min(start + BATCH_SIZE, project_count))
+            ])
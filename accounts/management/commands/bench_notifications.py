@@ -0,0 +1,154 @@
+import asyncio
+import datetime
+import json
+import statistics
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from accounts.models import Notification, StudentProfile
+
+
+class Command(BaseCommand):
+    help = ('Compare notification polling against the SSE push channel on a throwaway '
+            'test database: requests per second and delivery latency for the same event load')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=50, help='Simulated open tabs (default 50)')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per mode (default 10)')
+        parser.add_argument('--interval', type=float, default=3.0, help='Polling interval in seconds (default 3)')
+        parser.add_argument('--events', type=int, default=20, help='Notifications created per mode (default 20)')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(NOTIFICATION_STREAM_KEEPALIVE=3600, NOTIFICATION_STREAM_MAX_AGE=3600):
+                students, sender = self._seed(options['clients'])
+                results = [
+                    ('poll', *self._run_poll(students, sender, options)),
+                    ('push', *self._run_push(students, sender, options)),
+                ]
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        duration = options['duration']
+        self.stdout.write(f"{options['clients']} clients, {options['events']} notifications, {duration:.0f}s per mode")
+        self.stdout.write(f"{'mode':<6}{'requests':>10}{'req/s':>10}{'delivered':>11}{'avg latency':>14}")
+        for mode, requests, delivered, latencies in results:
+            latency = f'{statistics.mean(latencies) * 1000:.0f} ms' if latencies else '-'
+            self.stdout.write(
+                f'{mode:<6}{requests:>10}{requests / duration:>10.1f}{delivered:>11}{latency:>14}'
+            )
+
+    def _seed(self, count):
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            [User(username=f'bench_student_{i}', password=password) for i in range(count + 1)]
+        )
+        sender, users = users[0], users[1:]
+        students = StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user=user,
+                student_name=user.username,
+                student_contact='',
+                student_email=f'{user.username}@example.com',
+                student_address='',
+                course_joined_date=datetime.date.today(),
+                course_details='',
+            )
+            for user in users
+        ])
+        return students, sender
+
+    def _produce(self, students, sender, options, created):
+        """Create `events` notifications spread evenly over the run."""
+        pause = options['duration'] / (options['events'] + 1)
+        for i in range(options['events']):
+            time.sleep(pause)
+            started = time.monotonic()
+            notification = Notification.objects.create(
+                recipient=students[i % len(students)], sender=sender, notification_type='follow'
+            )
+            created[notification.id] = started
+
+    def _run_poll(self, students, sender, options):
+        created, received = {}, {}
+        requests = 0
+        lock = threading.Lock()
+        deadline = None
+
+        def tab(client):
+            nonlocal requests
+            while time.monotonic() < deadline:
+                started = time.monotonic()
+                data = client.get('/accounts/notifications/unread-json/').json()
+                now = time.monotonic()
+                with lock:
+                    requests += 1
+                    for item in data.get('notifications', []):
+                        received.setdefault(item['id'], now)
+                time.sleep(max(0, options['interval'] - (now - started)))
+
+        clients = []
+        for student in students:
+            client = Client()
+            client.force_login(student.user)
+            clients.append(client)
+
+        deadline = time.monotonic() + options['duration']
+        threads = [threading.Thread(target=tab, args=(c,)) for c in clients]
+        threads.append(threading.Thread(target=self._produce, args=(students, sender, options, created)))
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return requests, len(received), self._latencies(created, received)
+
+    def _run_push(self, students, sender, options):
+        created, received = {}, {}
+
+        async def tab(student, ready):
+            client = AsyncClient()
+            await sync_to_async(client.force_login)(student.user)
+            response = await client.get('/accounts/notifications/stream/')
+            chunks = response.streaming_content.__aiter__()
+            ready.release()
+            try:
+                while True:
+                    chunk = (await chunks.__anext__()).decode()
+                    if chunk.startswith('data: '):
+                        event = json.loads(chunk[len('data: '):])
+                        if 'notification' in event:
+                            received.setdefault(event['notification']['id'], time.monotonic())
+            except asyncio.CancelledError:
+                pass
+
+        async def run():
+            ready = asyncio.Semaphore(0)
+            tasks = [asyncio.create_task(tab(s, ready)) for s in students]
+            for _ in students:
+                await ready.acquire()
+            producer = threading.Thread(target=self._produce, args=(students, sender, options, created))
+            producer.start()
+            await asyncio.sleep(options['duration'])
+            await asyncio.to_thread(producer.join)
+            await asyncio.sleep(0.1)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks)
+
+        asyncio.run(run())
+        # One request per open stream; afterwards traffic only flows on events.
+        return len(students), len(received), self._latencies(created, received)
+
+    @staticmethod
+    def _latencies(created, received):
+        return [received[i] - created[i] for i in received if i in created]
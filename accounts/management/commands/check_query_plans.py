@@ -0,0 +1,151 @@
+import datetime
+import re
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.utils import timezone
+
+from accounts.models import Notification, Project, StudentFollow, StudentProfile
+
+
+def hot_queries(student):
+    """The query shapes behind the busiest pages, bound to one seeded student."""
+    today = datetime.date.today()
+    newest = Notification.objects.filter(recipient=student).order_by('-created_at', '-id').first()
+    return [
+        ('unread notifications',
+         Notification.objects.filter(recipient=student, is_read=False).order_by('-created_at')[:10]),
+        ('notifications page',
+         Notification.objects.filter(recipient=student).order_by('-created_at', '-id')[:21]),
+        ('notifications page (cursor)',
+         Notification.objects.filter(recipient=student).filter(
+             Q(created_at__lt=newest.created_at) | Q(created_at=newest.created_at, id__lt=newest.id)
+         ).order_by('-created_at', '-id')[:21]),
+        ('trending public projects',
+         Project.objects.filter(visibility='Public').order_by('-trending_score', '-id')[:12]),
+        ('recent public projects',
+         Project.objects.filter(visibility='Public').select_related('student').order_by('-created_at')[:6]),
+        ('student projects',
+         Project.objects.filter(student=student).order_by('-created_at')),
+        ('student public projects',
+         student.projects.filter(visibility='Public').order_by('-created_at')[:3]),
+        ('admin profiles by year and month',
+         StudentProfile.objects.filter(joined_year=today.year, joined_month=today.month).order_by('student_name', 'id')[:30]),
+        ('admin profiles by month',
+         StudentProfile.objects.filter(joined_month=today.month).order_by('student_name', 'id')[:30]),
+        ('followers count',
+         StudentFollow.objects.filter(following=student, status='accepted')),
+        ('following count',
+         StudentFollow.objects.filter(follower=student.user, status='accepted')),
+        ('pending follow requests',
+         StudentFollow.objects.filter(following=student, status='pending')),
+    ]
+
+
+class Command(BaseCommand):
+    help = ('Seed a throwaway test database and EXPLAIN the hot notification/project/follow queries; '
+            'exit non-zero if any of them falls back to a full table scan (SQLite and PostgreSQL)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=300, help='Seeded students (default 300)')
+        parser.add_argument('--rows', type=int, default=20,
+                            help='Projects, notifications and follows per student (default 20)')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the full plan for every query')
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'Query plan checks are only implemented for SQLite and PostgreSQL, not {vendor}.')
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            student = self._seed(options['students'], options['rows'])
+            tables = {m._meta.db_table for m in (Notification, Project, StudentFollow, StudentProfile, User)}
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+                if vendor == 'postgresql':
+                    # Tiny seeded tables make a sequential scan look cheap; with it
+                    # disabled the planner only picks one if no index can serve the query.
+                    cursor.execute('SET enable_seqscan = off')
+            results = [(label, qs.explain()) for label, qs in hot_queries(student)]
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        failures = 0
+        for label, plan in results:
+            scans = self._full_scans(vendor, plan, tables)
+            if scans:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f'FULL SCAN  {label}: {", ".join(sorted(scans))}'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'ok         {label}'))
+            if scans or options['verbose_plans']:
+                for line in plan.splitlines():
+                    self.stdout.write(f'    {line}')
+
+        if failures:
+            raise CommandError(f'{failures} of {len(results)} hot queries fall back to a full table scan.')
+        self.stdout.write(self.style.SUCCESS(f'All {len(results)} hot queries use an index ({vendor}).'))
+
+    @staticmethod
+    def _full_scans(vendor, plan, tables):
+        if vendor == 'sqlite':
+            # "SEARCH t USING INDEX ..." is a lookup; "SCAN t" walks the whole table
+            # (or a whole index, which is just as bad for a filtered query).
+            found = re.findall(r'\bSCAN (?:TABLE )?(\w+)', plan)
+        else:
+            found = re.findall(r'Seq Scan on (\w+)', plan)
+        return {table for table in found if table in tables}
+
+    def _seed(self, count, rows):
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            [User(username=f'plan_student_{i}', password=password) for i in range(count)]
+        )
+        students = StudentProfile.objects.bulk_create([
+            StudentProfile(
+                user=user,
+                student_name=user.username,
+                student_contact='',
+                student_email=f'{user.username}@example.com',
+                student_address='',
+                course_joined_date=datetime.date.today(),
+                joined_year=datetime.date.today().year,
+                joined_month=datetime.date.today().month,
+                course_details='',
+            )
+            for user in users
+        ])
+
+        now = timezone.now()
+        projects, notifications, follows = [], [], []
+        for i, student in enumerate(students):
+            for j in range(rows):
+                projects.append(Project(
+                    student=student,
+                    title=f'Project {i}-{j}',
+                    visibility='Public' if j % 4 else 'Private',
+                ))
+                notifications.append(Notification(
+                    recipient=student,
+                    sender=users[(i + j + 1) % count],
+                    notification_type='follow',
+                    is_read=j % 3 == 0,
+                    created_at=now - datetime.timedelta(minutes=j),
+                ))
+            for j in range(1, min(rows, count - 1) + 1):
+                follows.append(StudentFollow(
+                    follower=users[(i + j) % count],
+                    following=student,
+                    status='accepted' if j % 2 else 'pending',
+                ))
+        Project.objects.bulk_create(projects, batch_size=1000)
+        Notification.objects.bulk_create(notifications, batch_size=1000)
+        StudentFollow.objects.bulk_create(follows, batch_size=1000)
+        return students[0]
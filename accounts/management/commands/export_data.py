@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import exports
+
+
+class Command(BaseCommand):
+    help = 'Stream every student or project, with their aggregated counts, as CSV or NDJSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(exports.EXPORTS), help='What to export')
+        parser.add_argument('--format', choices=sorted(exports.FORMATS), default='csv', help='Output format (default csv)')
+        parser.add_argument('--output', '-o', help='File to write (default: standard output)')
+
+    def handle(self, *args, **options):
+        try:
+            out = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        except OSError as e:
+            raise CommandError(f'Cannot write {options["output"]}: {e}')
+        written = 0
+        try:
+            for chunk in exports.stream(options['kind'], options['format']):
+                out.write(chunk)
+                written += len(chunk)
+        finally:
+            if options['output']:
+                out.close()
+            else:
+                out.flush()
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'Wrote {written} bytes to {options["output"]}.'))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.image_derivatives import generate
+from accounts.models import Project, RecruiterProfile, StudentProfile
+
+SOURCES = (
+    (Project, 'screenshot'),
+    (StudentProfile, 'image'),
+    (RecruiterProfile, 'company_logo'),
+)
+
+
+class Command(BaseCommand):
+    help = ('Generate resized WebP/JPEG derivatives for existing project screenshots, student photos '
+            'and company logos (new uploads get them automatically)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate files that already exist')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        done = skipped = 0
+        hashes = set()
+        for model, field in SOURCES:
+            names = (model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                     .values_list(field, flat=True).distinct())
+            for name in names.iterator(chunk_size=500):
+                row = generate(name, field, force=options['force'])
+                if row is None:
+                    skipped += 1
+                    self.stdout.write(self.style.WARNING(f'Skipped {name}: missing or not an image'))
+                else:
+                    done += 1
+                    hashes.add(row.content_hash)
+        self.stdout.write(self.style.SUCCESS(
+            f'{done} images have derivatives ({len(hashes)} distinct), {skipped} skipped, '
+            f'in {time.monotonic() - started:.1f}s.'
+        ))
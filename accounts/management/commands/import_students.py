@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import student_import
+
+
+class Command(BaseCommand):
+    help = ('Create student accounts in bulk from a CSV (with a header line) or JSON file. Columns: '
+            + ', '.join(student_import.REQUIRED_FIELDS + student_import.OPTIONAL_FIELDS))
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file to import')
+        parser.add_argument('--format', choices=['csv', 'json'], help='File format (default: from the extension)')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: STUDENT_IMPORT_WORKERS)')
+        parser.add_argument('--dry-run', action='store_true', help='Only validate and report errors')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with open(path, 'rb') as f:
+                rows = student_import.parse(f.read(), options['format'] or student_import.format_for(path))
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            raise CommandError(f'Could not read {path}: {e}')
+
+        started = time.monotonic()
+        result = student_import.import_students(rows, dry_run=options['dry_run'], workers=options['workers'])
+        for error in result['errors']:
+            where = f"row {error['row']}" if error['row'] else 'import'
+            name = f" ({error['username']})" if error['username'] else ''
+            self.stdout.write(self.style.WARNING(f"{where}{name}: {' '.join(error['errors'])}"))
+
+        elapsed = time.monotonic() - started
+        if options['dry_run']:
+            valid = len(rows) - len(result['errors'])
+            self.stdout.write(self.style.SUCCESS(f'{valid} of {len(rows)} rows are valid (dry run, nothing written).'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Created {result['created']} of {len(rows)} students in {elapsed:.1f}s."
+            ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from accounts import developer_snapshots
+
+
+class Command(BaseCommand):
+    help = ('Re-render every page of the public developers directory into DEVELOPERS_SNAPSHOT_ROOT '
+            '(served to anonymous visitors when DEVELOPERS_SNAPSHOTS is on)')
+
+    def handle(self, *args, **options):
+        written = developer_snapshots.refresh_pages()
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(written)} developer page(s) to {developer_snapshots.snapshot_root()}.'
+        ))
+        if not developer_snapshots.enabled():
+            self.stdout.write(self.style.WARNING('DEVELOPERS_SNAPSHOTS is off, so these pages are not served yet.'))
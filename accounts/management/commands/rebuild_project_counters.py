@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from accounts.models import Project, ProjectView, ProjectLike
+
+
+def _count_subquery(model):
+    return Coalesce(Subquery(
+        model.objects.filter(project=OuterRef('pk'))
+        .order_by().values('project').annotate(c=Count('pk')).values('c')
+    ), Value(0))
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized view/like counters on Project from ProjectView/ProjectLike rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only report drifted counters; exit non-zero if any are found')
+
+    def handle(self, *args, **options):
+        actual = Project.objects.annotate(
+            actual_views=_count_subquery(ProjectView),
+            actual_likes=_count_subquery(ProjectLike),
+        ).values_list('id', 'title', 'views_count', 'actual_views', 'likes_count', 'actual_likes')
+
+        drifted = [row for row in actual if row[2] != row[3] or row[4] != row[5]]
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All project counters are in sync.'))
+            return
+
+        self.stdout.write(self.style.WARNING(f'Found {len(drifted)} projects with drifted counters:'))
+        for pid, title, views, actual_views, likes, actual_likes in drifted:
+            self.stdout.write(
+                f'- Project ID {pid} | {title} | views {views} -> {actual_views} | likes {likes} -> {actual_likes}'
+            )
+
+        if options['check']:
+            raise CommandError('Project counters are out of sync.')
+
+        with transaction.atomic():
+            updated = Project.objects.filter(id__in=[row[0] for row in drifted]).update(
+                views_count=_count_subquery(ProjectView),
+                likes_count=_count_subquery(ProjectLike),
+            )
+        self.stdout.write(self.style.SUCCESS(f'Reconciled {updated} projects.'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from accounts.project_search import is_supported, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text project search index (FTS5 on SQLite, tsvector on PostgreSQL) from Project rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Projects read per query (default 500)')
+
+    def handle(self, *args, **options):
+        if not is_supported():
+            raise CommandError(f'Project search is not available on {connection.vendor}.')
+
+        with transaction.atomic():
+            indexed = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} public projects.'))
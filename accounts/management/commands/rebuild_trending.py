@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.trending import rebuild_scores, trending_projects
+
+
+class Command(BaseCommand):
+    help = ('Recompute every project\'s trending score from its full like/view history '
+            '(after changing TRENDING_WEIGHTS or TRENDING_HALF_LIFE_HOURS)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--show', type=int, default=0, metavar='N', help='Print the top N trending projects afterwards')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_scores()
+        self.stdout.write(self.style.SUCCESS(f'Rescored {count} projects.'))
+
+        for rank, project in enumerate(trending_projects()[:options['show']], start=1):
+            self.stdout.write(f'{rank:>3}. {project.title} | score {project.trending_score:.3f}')
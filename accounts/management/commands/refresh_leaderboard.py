@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from accounts.leaderboard import refresh_leaderboard, weights
+from accounts.models import LeaderboardEntry
+
+
+class Command(BaseCommand):
+    help = ('Refresh the materialized top-students leaderboard used by the recruiter dashboard; '
+            'only students whose totals or score changed are rewritten')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Rewrite every entry, not just changed ones')
+        parser.add_argument('--show', type=int, default=0, metavar='N', help='Print the top N entries afterwards')
+
+    def handle(self, *args, **options):
+        written, students = refresh_leaderboard(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Updated {written} of {students} leaderboard entries.'))
+
+        if options['show']:
+            self.stdout.write('Weights: ' + ', '.join(f'{k}={v:g}' for k, v in weights().items()))
+            entries = LeaderboardEntry.objects.select_related('student').order_by('-score', 'student_id')
+            for rank, entry in enumerate(entries[:options['show']], start=1):
+                self.stdout.write(
+                    f'{rank:>3}. {entry.student.student_name} | score {entry.score:g} | '
+                    f'projects {entry.project_count} | views {entry.project_views} | '
+                    f'likes {entry.project_likes} | profile views {entry.profile_views} | '
+                    f'followers {entry.followers}'
+                )
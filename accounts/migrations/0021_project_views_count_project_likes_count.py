@@ -0,0 +1,43 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:07
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Project = apps.get_model('accounts', 'Project')
+    ProjectView = apps.get_model('accounts', 'ProjectView')
+    ProjectLike = apps.get_model('accounts', 'ProjectLike')
+
+    def count_subquery(model):
+        return Coalesce(Subquery(
+            model.objects.filter(project=OuterRef('pk'))
+            .order_by().values('project').annotate(c=Count('pk')).values('c')
+        ), Value(0))
+
+    Project.objects.update(
+        views_count=count_subquery(ProjectView),
+        likes_count=count_subquery(ProjectLike),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0020_notification_data_notification_hiring_process'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='likes_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='views_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0021_project_views_count_project_likes_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='notifications_version',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:19
+
+import json
+
+from django.db import migrations, models
+
+
+def format_data(data):
+    # Frozen copy of Notification.format_data at the time of this migration.
+    if not data:
+        return ''
+    try:
+        payload = json.loads(data)
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return str(data)
+    if isinstance(payload, dict) and 'job_title' in payload:
+        text = f"Job Title: {payload.get('job_title')}"
+        if 'message' in payload:
+            text += f"\nMessage: {payload.get('message')}"
+        return text
+    return str(data)
+
+
+def backfill_display_text(apps, schema_editor):
+    Notification = apps.get_model('accounts', 'Notification')
+    batch = []
+    rows = Notification.objects.exclude(data__isnull=True).exclude(data='').only('id', 'data')
+    for notification in rows.iterator(chunk_size=500):
+        notification.display_text = format_data(notification.data)
+        batch.append(notification)
+        if len(batch) >= 500:
+            Notification.objects.bulk_update(batch, ['display_text'])
+            batch = []
+    if batch:
+        Notification.objects.bulk_update(batch, ['display_text'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0022_studentprofile_notifications_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='display_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_display_text, migrations.RunPython.noop),
+    ]
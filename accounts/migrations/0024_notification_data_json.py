@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0023_notification_display_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='data_json',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:24
+
+import json
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def parse(value):
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        # Not JSON: keep the original text as a JSON string
+        return value
+
+
+def copy_data_to_json(apps, schema_editor):
+    Notification = apps.get_model('accounts', 'Notification')
+    rows = Notification.objects.exclude(data__isnull=True).exclude(data='').order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(rows.filter(pk__gt=last_pk).only('pk', 'data')[:BATCH_SIZE])
+        if not batch:
+            break
+        for notification in batch:
+            notification.data_json = parse(notification.data)
+        Notification.objects.bulk_update(batch, ['data_json'])
+        last_pk = batch[-1].pk
+
+
+def copy_json_to_data(apps, schema_editor):
+    Notification = apps.get_model('accounts', 'Notification')
+    rows = Notification.objects.exclude(data_json__isnull=True).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(rows.filter(pk__gt=last_pk).only('pk', 'data_json')[:BATCH_SIZE])
+        if not batch:
+            break
+        for notification in batch:
+            value = notification.data_json
+            notification.data = value if isinstance(value, str) else json.dumps(value)
+        Notification.objects.bulk_update(batch, ['data'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0024_notification_data_json'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_data_to_json, copy_json_to_data),
+    ]
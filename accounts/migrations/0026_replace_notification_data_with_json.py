@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:24
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0025_copy_notification_data_to_json'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='notification',
+            name='data',
+        ),
+        migrations.RenameField(
+            model_name='notification',
+            old_name='data_json',
+            new_name='data',
+        ),
+    ]
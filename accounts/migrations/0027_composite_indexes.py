@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0026_replace_notification_data_with_json'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'is_read', '-created_at'], name='notif_recipient_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-created_at', '-id'], name='notif_recipient_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['visibility', '-created_at'], name='project_visibility_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['student', '-created_at'], name='project_student_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfollow',
+            index=models.Index(fields=['following', 'status'], name='follow_following_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfollow',
+            index=models.Index(fields=['follower', 'status'], name='follow_follower_status_idx'),
+        ),
+    ]
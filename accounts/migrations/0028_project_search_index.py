@@ -0,0 +1,48 @@
+from django.db import migrations
+
+# The index tables are backend specific (see accounts/project_search.py), so
+# they're created with raw SQL per vendor and backfilled from existing public
+# projects in the same step. Other backends get no index; search returns nothing.
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE accounts_project_fts USING fts5("
+    "title, tags, description, tokenize = 'porter unicode61')",
+    "INSERT INTO accounts_project_fts (rowid, title, tags, description) "
+    "SELECT id, title, tags, description FROM accounts_project WHERE visibility = 'Public'",
+]
+SQLITE_REVERSE = ['DROP TABLE IF EXISTS accounts_project_fts']
+
+POSTGRES_FORWARD = [
+    "CREATE TABLE accounts_project_search ("
+    "project_id integer PRIMARY KEY REFERENCES accounts_project (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX accounts_project_search_document_gin ON accounts_project_search USING GIN (document)",
+    "INSERT INTO accounts_project_search (project_id, document) "
+    "SELECT id, setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', tags), 'B') || "
+    "setweight(to_tsvector('english', description), 'C') "
+    "FROM accounts_project WHERE visibility = 'Public'",
+]
+POSTGRES_REVERSE = ['DROP TABLE IF EXISTS accounts_project_search']
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0027_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
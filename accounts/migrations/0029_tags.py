@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:29
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0028_project_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=50, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProjectTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_tags', to='accounts.project')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_tags', to='accounts.tag')),
+            ],
+            options={
+                'unique_together': {('tag', 'project')},
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, related_name='projects', through='accounts.ProjectTag', to='accounts.tag'),
+        ),
+    ]
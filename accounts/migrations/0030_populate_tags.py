@@ -0,0 +1,59 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def parse_tags(value):
+    # Frozen copy of accounts.models.parse_tags
+    names, seen = [], set()
+    for name in (value or '').split(','):
+        name = name.strip()[:50]
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def populate_tags(apps, schema_editor):
+    Project = apps.get_model('accounts', 'Project')
+    Tag = apps.get_model('accounts', 'Tag')
+    ProjectTag = apps.get_model('accounts', 'ProjectTag')
+
+    rows = list(Project.objects.exclude(tags='').values_list('id', 'tags'))
+    parsed = [(pk, parse_tags(tags)) for pk, tags in rows]
+
+    # One spelling per key: the first one seen
+    names = {}
+    for _, tags in parsed:
+        for name in tags:
+            names.setdefault(name.lower(), name)
+    Tag.objects.bulk_create(
+        [Tag(name=name, key=key) for key, name in names.items()],
+        batch_size=BATCH_SIZE, ignore_conflicts=True,
+    )
+    tag_ids = dict(Tag.objects.values_list('key', 'id'))
+
+    ProjectTag.objects.bulk_create(
+        [
+            ProjectTag(project_id=pk, tag_id=tag_ids[name.lower()], position=position)
+            for pk, tags in parsed
+            for position, name in enumerate(tags)
+        ],
+        batch_size=BATCH_SIZE, ignore_conflicts=True,
+    )
+
+
+def clear_tags(apps, schema_editor):
+    apps.get_model('accounts', 'ProjectTag').objects.all().delete()
+    apps.get_model('accounts', 'Tag').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0029_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_tags, clear_tags),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0030_populate_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='leaderboard_entry', serialize=False, to='accounts.studentprofile')),
+                ('project_count', models.IntegerField(default=0)),
+                ('project_views', models.IntegerField(default=0)),
+                ('project_likes', models.IntegerField(default=0)),
+                ('profile_views', models.IntegerField(default=0)),
+                ('followers', models.IntegerField(default=0)),
+                ('score', models.FloatField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-score', 'student'], name='leaderboard_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0031_leaderboard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['visibility', '-trending_score'], name='project_visibility_trend_idx'),
+        ),
+    ]
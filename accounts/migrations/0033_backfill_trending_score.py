@@ -0,0 +1,54 @@
+import datetime
+import math
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Case, FloatField, Value, When
+
+# Frozen copy of the scoring in accounts.trending
+EPOCH = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+BATCH_SIZE = 500
+
+
+def backfill_trending_score(apps, schema_editor):
+    Project = apps.get_model('accounts', 'Project')
+    ProjectView = apps.get_model('accounts', 'ProjectView')
+    ProjectLike = apps.get_model('accounts', 'ProjectLike')
+
+    tau = float(getattr(settings, 'TRENDING_HALF_LIFE_HOURS', 48.0)) * 3600 / math.log(2)
+    weights = {'view': 1.0, 'like': 3.0, 'new': 2.0}
+    weights.update(getattr(settings, 'TRENDING_WEIGHTS', {}))
+
+    def event_score(when, kind):
+        return (when - EPOCH).total_seconds() / tau + math.log(max(float(weights[kind]), 1e-9))
+
+    def logaddexp(a, b):
+        if a < b:
+            a, b = b, a
+        return a + math.log1p(math.exp(b - a))
+
+    scores = {pk: event_score(created_at, 'new') for pk, created_at in Project.objects.values_list('id', 'created_at')}
+    for rows, kind in ((ProjectView.objects.values_list('project_id', 'viewed_at'), 'view'),
+                       (ProjectLike.objects.values_list('project_id', 'created_at'), 'like')):
+        for pk, when in rows.iterator(chunk_size=2000):
+            if pk in scores:
+                scores[pk] = logaddexp(scores[pk], event_score(when, kind))
+
+    pks = sorted(scores)
+    for start in range(0, len(pks), BATCH_SIZE):
+        batch = pks[start:start + BATCH_SIZE]
+        Project.objects.filter(pk__in=batch).update(trending_score=Case(
+            *[When(pk=pk, then=Value(scores[pk])) for pk in batch],
+            output_field=FloatField(),
+        ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0032_project_trending_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_trending_score, migrations.RunPython.noop),
+    ]
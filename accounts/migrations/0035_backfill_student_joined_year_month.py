@@ -0,0 +1,21 @@
+from django.db import migrations
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+
+def backfill_joined_year_month(apps, schema_editor):
+    StudentProfile = apps.get_model('accounts', 'StudentProfile')
+    StudentProfile.objects.update(
+        joined_year=ExtractYear('course_joined_date'),
+        joined_month=ExtractMonth('course_joined_date'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0034_student_joined_year_month'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_joined_year_month, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:23
+
+import accounts.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0036_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('refcount', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='screenshot',
+            field=models.ImageField(blank=True, null=True, storage=accounts.storage.upload_storage, upload_to='project_screenshots/'),
+        ),
+        migrations.AlterField(
+            model_name='recruiterprofile',
+            name='company_logo',
+            field=models.ImageField(blank=True, null=True, storage=accounts.storage.upload_storage, upload_to='company_logos/'),
+        ),
+        migrations.AlterField(
+            model_name='studentprofile',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=accounts.storage.upload_storage, upload_to='student_images/'),
+        ),
+    ]
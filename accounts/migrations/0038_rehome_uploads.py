@@ -0,0 +1,89 @@
+import os
+import shutil
+from collections import Counter
+
+from django.conf import settings
+from django.db import migrations, transaction
+from django.db.models import F
+
+from accounts.storage import CHUNK_SIZE, ROOT, content_hash, hashed_name
+
+UPLOAD_FIELDS = [
+    ('Project', 'screenshot'),
+    ('StudentProfile', 'image'),
+    ('RecruiterProfile', 'company_logo'),
+]
+
+
+def _link_or_copy(source, target):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if os.path.exists(target):
+        return
+    try:
+        # A hard link moves nothing and takes no extra space
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def rehome_uploads(apps, schema_editor):
+    """
+    Move existing uploads to their content-addressed names under cas/, one
+    copy per distinct content, and index them with their reference counts.
+    Files missing from disk are left under their old names.
+    """
+    StoredFile = apps.get_model('accounts', 'StoredFile')
+    ImageDerivatives = apps.get_model('accounts', 'ImageDerivatives')
+    media_root = str(settings.MEDIA_ROOT)
+    moved = {}
+
+    for model_name, field in UPLOAD_FIELDS:
+        model = apps.get_model('accounts', model_name)
+        names = (model.objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+                 .exclude(**{f'{field}__startswith': f'{ROOT}/'}).values_list(field, flat=True))
+        for old, references in Counter(names).items():
+            if old not in moved:
+                path = os.path.join(media_root, old)
+                try:
+                    with open(path, 'rb') as f:
+                        digest = content_hash(iter(lambda: f.read(CHUNK_SIZE), b''))
+                except OSError:
+                    continue
+                stored = StoredFile.objects.filter(content_hash=digest).first()
+                if stored is None:
+                    stored = StoredFile.objects.create(
+                        content_hash=digest, name=hashed_name(digest, old), size=os.path.getsize(path), refcount=0,
+                    )
+                _link_or_copy(path, os.path.join(media_root, stored.name))
+                moved[old] = stored.name
+
+                # Derivatives are keyed by content, so only the source name changes
+                if ImageDerivatives.objects.filter(source=stored.name).exists():
+                    ImageDerivatives.objects.filter(source=old).delete()
+                else:
+                    ImageDerivatives.objects.filter(source=old).update(source=stored.name)
+
+            StoredFile.objects.filter(name=moved[old]).update(refcount=F('refcount') + references)
+            model.objects.filter(**{field: old}).update(**{field: moved[old]})
+
+    def remove_originals():
+        for old in moved:
+            try:
+                os.unlink(os.path.join(media_root, old))
+            except OSError:
+                pass
+
+    # Keep the originals until the new names are committed
+    transaction.on_commit(remove_originals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0037_content_addressed_uploads'),
+    ]
+
+    operations = [
+        # Not reversible in place: rows keep their cas/ names, which stay valid files
+        migrations.RunPython(rehome_uploads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations
+
+# accounts_project_search (0028) is unmanaged, so Django's flush truncates
+# accounts_project without knowing about its foreign key, which PostgreSQL
+# refuses. Drop the constraint (signals.project_deleted removes index rows
+# already) and widen the column to match the bigint Project.id.
+
+POSTGRES_FORWARD = [
+    'ALTER TABLE accounts_project_search DROP CONSTRAINT IF EXISTS accounts_project_search_project_id_fkey',
+    'ALTER TABLE accounts_project_search ALTER COLUMN project_id TYPE bigint',
+]
+POSTGRES_REVERSE = [
+    'ALTER TABLE accounts_project_search ALTER COLUMN project_id TYPE integer',
+    'DELETE FROM accounts_project_search WHERE project_id NOT IN (SELECT id FROM accounts_project)',
+    'ALTER TABLE accounts_project_search ADD CONSTRAINT accounts_project_search_project_id_fkey '
+    'FOREIGN KEY (project_id) REFERENCES accounts_project (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED',
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            for sql in statements:
+                schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0038_rehome_uploads'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run(POSTGRES_FORWARD), _run(POSTGRES_REVERSE)),
+    ]
@@ -1,13 +1,19 @@
+import json
+
 from django.db import models
+from django.db.models import Count, F, Q
+from django.db.models.fields.json import KT
 from django.contrib.auth.models import User
 from django.utils.functional import cached_property
 
+from .storage import upload_storage
+
 
 class RecruiterProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='recruiter_profile')
     company_name = models.CharField(max_length=200)
     company_linkedin = models.URLField(blank=True, null=True)
-    company_logo = models.ImageField(upload_to='company_logos/', blank=True, null=True)
+    company_logo = models.ImageField(upload_to='company_logos/', blank=True, null=True, storage=upload_storage)
     company_address = models.TextField()
     contact_person = models.CharField(max_length=150)
     phone_number = models.CharField(max_length=30)
@@ -45,16 +51,66 @@ class StudentProfile(models.Model):
     student_address = models.TextField()
     course_joined_date = models.DateField()
     course_details = models.TextField()
-    image = models.ImageField(upload_to='student_images/', blank=True, null=True)
+    image = models.ImageField(upload_to='student_images/', blank=True, null=True, storage=upload_storage)
     bio = models.TextField(blank=True, null=True)
     profile_views = models.IntegerField(default=0)
+    # Bumped whenever this student's notifications change; used as the ETag
+    # of notifications_unread_json so idle polls can be answered with a 304.
+    notifications_version = models.IntegerField(default=0, editable=False)
+    # Copies of course_joined_date's year and month, kept in sync by save(), so
+    # the admin year/month filters are indexed equality lookups rather than
+    # date extraction on every row.
+    joined_year = models.PositiveSmallIntegerField(default=0, editable=False)
+    joined_month = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['student_name'], name='student_name_idx'),
+            models.Index(fields=['joined_year', 'joined_month', 'student_name'], name='student_joined_idx'),
+            models.Index(fields=['joined_month', 'student_name'], name='student_joined_month_idx'),
+        ]
 
     def __str__(self):
         return self.student_name
+
+    def save(self, *args, **kwargs):
+        # course_joined_date may still be the posted 'YYYY-MM-DD' string here
+        joined = self._meta.get_field('course_joined_date').to_python(self.course_joined_date)
+        if joined:
+            self.joined_year, self.joined_month = joined.year, joined.month
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and 'course_joined_date' in update_fields:
+                kwargs['update_fields'] = {*update_fields, 'joined_year', 'joined_month'}
+        super().save(*args, **kwargs)
         
     def increment_profile_views(self):
-        self.profile_views += 1
-        self.save()
+        StudentProfile.objects.filter(pk=self.pk).update(profile_views=F('profile_views') + 1)
+        self.refresh_from_db(fields=['profile_views'])
+
+def parse_tags(value):
+    """Split a comma-separated tag string into unique, stripped names (first spelling wins)."""
+    names, seen = [], set()
+    for name in (value or '').split(','):
+        name = name.strip()[:50]
+        if name and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+class ProjectQuerySet(models.QuerySet):
+    def with_tags(self):
+        """Prefetch each project's tags in their original order (see Project.tag_names)."""
+        return self.prefetch_related(models.Prefetch(
+            'project_tags', queryset=ProjectTag.objects.select_related('tag').order_by('position')
+        ))
+
+    def tagged(self, tag):
+        """Projects carrying `tag` (a Tag or a tag name, case-insensitive)."""
+        if isinstance(tag, Tag):
+            return self.filter(project_tags__tag=tag)
+        return self.filter(project_tags__tag__key=tag.strip().lower())
+
 
 class Project(models.Model):
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='projects')
@@ -67,20 +123,107 @@ class Project(models.Model):
     project_link = models.URLField(blank=True)
     tags = models.CharField(blank=True, max_length=200)
     visibility = models.CharField(choices=[('Public', 'Public'), ('Private', 'Private')], default='Public', max_length=20)
-    screenshot = models.ImageField(upload_to='project_screenshots/', null=True, blank=True)
+    screenshot = models.ImageField(upload_to='project_screenshots/', null=True, blank=True, storage=upload_storage)
+    # Denormalized counters kept in sync with ProjectView/ProjectLike rows so
+    # card grids don't need a COUNT(*) per project. Rebuild with
+    # `manage.py rebuild_project_counters` if they ever drift.
+    views_count = models.IntegerField(default=0)
+    likes_count = models.IntegerField(default=0)
+    # Normalized tags; `tags` stays the editable comma-separated string and
+    # ProjectTag rows are synced from it on save (see sync_tags).
+    tag_set = models.ManyToManyField('Tag', through='ProjectTag', related_name='projects', blank=True)
+    # Time-decayed popularity in log space, updated as likes/views arrive (see accounts.trending)
+    trending_score = models.FloatField(default=0, editable=False)
+
+    objects = ProjectQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['visibility', '-created_at'], name='project_visibility_recent_idx'),
+            models.Index(fields=['student', '-created_at'], name='project_student_recent_idx'),
+            models.Index(fields=['visibility', '-trending_score'], name='project_visibility_trend_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
     def view_count(self):
-        return self.views.count()
+        return self.views_count
         
     def like_count(self):
-        return self.likes.count()
+        return self.likes_count
+
+    def adjust_counters(self, views=0, likes=0):
+        """Atomically add `views`/`likes` to the stored counters and refresh them."""
+        updates = {}
+        if views:
+            updates['views_count'] = F('views_count') + views
+        if likes:
+            updates['likes_count'] = F('likes_count') + likes
+        if not updates:
+            return
+        Project.objects.filter(pk=self.pk).update(**updates)
+        self.refresh_from_db(fields=['views_count', 'likes_count'])
         
     def is_liked_by(self, user):
         return self.likes.filter(user=user).exists()
 
+    @property
+    def tag_names(self):
+        """Tag names in display order; uses with_tags() prefetching when available."""
+        if 'project_tags' in getattr(self, '_prefetched_objects_cache', {}):
+            return [pt.tag.name for pt in self.project_tags.all()]
+        return parse_tags(self.tags)
+
+    def sync_tags(self):
+        """Bring the ProjectTag rows in line with the `tags` string. Returns True if anything changed."""
+        names = parse_tags(self.tags)
+        wanted = {name.lower(): position for position, name in enumerate(names)}
+        current = {
+            pt.tag.key: pt for pt in ProjectTag.objects.filter(project=self).select_related('tag')
+        }
+        if {key: pt.position for key, pt in current.items()} == wanted:
+            return False
+
+        Tag.objects.bulk_create([Tag(name=n, key=n.lower()) for n in names], ignore_conflicts=True)
+        tags = Tag.objects.in_bulk(list(wanted), field_name='key')
+        ProjectTag.objects.filter(project=self).exclude(tag__key__in=list(wanted)).delete()
+        ProjectTag.objects.bulk_create(
+            [ProjectTag(project=self, tag=tags[key], position=pos) for key, pos in wanted.items()],
+            update_conflicts=True, unique_fields=['tag', 'project'], update_fields=['position'],
+        )
+        return True
+
+
+class TagQuerySet(models.QuerySet):
+    def with_project_counts(self, public_only=True):
+        """Tags in use, alphabetically, annotated with `project_count` (one grouped query)."""
+        projects = Q(project_tags__project__visibility='Public') if public_only else Q()
+        return self.annotate(
+            project_count=Count('project_tags', filter=projects)
+        ).filter(project_count__gt=0).order_by('name')
+
+
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+    # Lower-cased name; tags are matched case-insensitively
+    key = models.CharField(max_length=50, unique=True)
+
+    objects = TagQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
+
+
+class ProjectTag(models.Model):
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='project_tags')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='project_tags')
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        # Leading with tag makes "projects with tag X" an index range scan
+        unique_together = ('tag', 'project')
+
 class ProjectView(models.Model):
     project = models.ForeignKey('Project', on_delete=models.CASCADE, related_name='views')
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -111,6 +254,10 @@ class StudentFollow(models.Model):
 
     class Meta:
         unique_together = ('follower', 'following')
+        indexes = [
+            models.Index(fields=['following', 'status'], name='follow_following_status_idx'),
+            models.Index(fields=['follower', 'status'], name='follow_follower_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.follower.username} follows {self.following.student_name} ({self.status})"
@@ -123,6 +270,56 @@ class StudentFollow(models.Model):
         self.status = 'rejected'
         self.save()
 
+class LeaderboardEntry(models.Model):
+    """Materialized per-student ranking for the recruiter dashboard (see accounts.leaderboard)."""
+    student = models.OneToOneField(StudentProfile, on_delete=models.CASCADE, primary_key=True,
+                                   related_name='leaderboard_entry')
+    project_count = models.IntegerField(default=0)
+    project_views = models.IntegerField(default=0)
+    project_likes = models.IntegerField(default=0)
+    profile_views = models.IntegerField(default=0)
+    followers = models.IntegerField(default=0)
+    score = models.FloatField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-score', 'student'], name='leaderboard_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id}: {self.score}"
+
+class ImageDerivatives(models.Model):
+    """
+    Resized copies of one uploaded image (see accounts.image_derivatives). The
+    files live under ``derivatives/<content_hash>/``, so identical uploads share them.
+    """
+    source = models.CharField(max_length=255, unique=True)
+    content_hash = models.CharField(max_length=64, db_index=True)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    # Widths that were generated, each in every format of image_derivatives.FORMATS
+    widths = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.source
+
+class StoredFile(models.Model):
+    """
+    Index of the content-addressed uploads (see accounts.storage): one row per
+    distinct file, with the number of image fields referencing it.
+    """
+    content_hash = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    refcount = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
+
 class HiringProcess(models.Model):
     recruiter = models.ForeignKey(RecruiterProfile, on_delete=models.CASCADE, related_name='hiring_processes')
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='hiring_processes')
@@ -144,6 +341,20 @@ class HiringProcess(models.Model):
     def __str__(self):
         return f"{self.recruiter.company_name} - {self.student.student_name} - {self.job_title}"
 
+class NotificationQuerySet(models.QuerySet):
+    """Accessors that read hire details out of `data` in the database."""
+
+    def hire_requests(self):
+        return self.filter(notification_type='hire')
+
+    def with_hire_details(self):
+        """Annotate `payload_job_title` / `payload_message` extracted from the JSON payload."""
+        return self.annotate(payload_job_title=KT('data__job_title'), payload_message=KT('data__message'))
+
+    def with_job_title(self, text):
+        return self.filter(data__job_title__icontains=text)
+
+
 class Notification(models.Model):
     NOTIFICATION_TYPES = (
         ('like', 'Project Like'),
@@ -158,13 +369,71 @@ class Notification(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, null=True, blank=True)
     # Optional link to a HiringProcess (if this notification represents a hire request)
     hiring_process = models.ForeignKey('HiringProcess', on_delete=models.CASCADE, null=True, blank=True)
-    # Optional JSON/text payload for extensible data (job title / message, etc.)
-    data = models.TextField(blank=True, null=True)
+    # Optional JSON payload for extensible data (job title / message, etc.)
+    data = models.JSONField(blank=True, null=True)
+    # Human-readable rendering of `data`, formatted once when the row is saved
+    display_text = models.TextField(blank=True, default='', editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     is_read = models.BooleanField(default=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Unread badge and polling: a recipient's unread rows, newest first
+            models.Index(fields=['recipient', 'is_read', '-created_at'], name='notif_recipient_unread_idx'),
+            # Keyset pagination of the notifications page on (created_at, id)
+            models.Index(fields=['recipient', '-created_at', '-id'], name='notif_recipient_recent_idx'),
+        ]
+
+    objects = NotificationQuerySet.as_manager()
+
+    @staticmethod
+    def format_data(data):
+        """Format a `data` payload for display (job title / message for hire requests)."""
+        if not data:
+            return ''
+        if isinstance(data, dict) and 'job_title' in data:
+            text = f"Job Title: {data.get('job_title')}"
+            if 'message' in data:
+                text += f"\nMessage: {data.get('message')}"
+            return text
+        if isinstance(data, str):
+            return data
+        return json.dumps(data)
+
+    @property
+    def job_title(self):
+        return self.data.get('job_title') if isinstance(self.data, dict) else None
+
+    @property
+    def hire_message(self):
+        return self.data.get('message') if isinstance(self.data, dict) else None
+
+    def save(self, *args, **kwargs):
+        if self.data and not self.display_text:
+            self.display_text = self.format_data(self.data)
+        super().save(*args, **kwargs)
+
+    def to_dict(self):
+        """JSON-ready representation used by the polling and push endpoints."""
+        item = {
+            'id': self.id,
+            'type': self.notification_type,
+            'sender': self.sender.username,
+            'created_at': self.created_at.isoformat(),
+            'is_read': self.is_read,
+        }
+        if self.project:
+            item['project'] = {'id': self.project.id, 'title': self.project.title}
+        if self.hiring_process:
+            item['hiring'] = {
+                'id': self.hiring_process.id,
+                'job_title': self.hiring_process.job_title,
+                'message': self.hiring_process.message
+            }
+        if self.data:
+            item['data'] = self.data
+        return item
 
     def __str__(self):
         if self.notification_type == 'like':
@@ -0,0 +1,60 @@
+"""
+Per-recipient cache of unread notification counts.
+
+The count is computed on first use and kept until a notification for that
+recipient is created, deleted or marked as read (see accounts.signals and
+the notifications view), with a TTL as a safety net for per-process caches.
+The same events bump StudentProfile.notifications_version, which the
+polling endpoint uses as its ETag.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Notification, StudentProfile
+
+UNREAD_COUNT_KEY = 'accounts:notifications:unread:{}'
+STUDENT_ID_KEY = 'accounts:student-id:{}'
+
+
+def _timeout():
+    return getattr(settings, 'NOTIFICATION_CACHE_TIMEOUT', 60)
+
+
+def student_id_for_user(user):
+    """Return the StudentProfile id for `user`, or None if they don't have one."""
+    if not user.is_authenticated or user.is_superuser or user.is_staff:
+        # Admins and approved recruiters never have a student profile.
+        return None
+    student_id = cache.get_or_set(
+        STUDENT_ID_KEY.format(user.pk),
+        lambda: StudentProfile.objects.filter(user_id=user.pk).values_list('id', flat=True).first() or 0,
+        _timeout(),
+    )
+    return student_id or None
+
+
+def unread_count(student_id):
+    return cache.get_or_set(
+        UNREAD_COUNT_KEY.format(student_id),
+        lambda: Notification.objects.filter(recipient_id=student_id, is_read=False).count(),
+        _timeout(),
+    )
+
+
+def invalidate_unread_count(student_id):
+    cache.delete(UNREAD_COUNT_KEY.format(student_id))
+
+
+def notifications_version(student_id):
+    return StudentProfile.objects.filter(pk=student_id).values_list('notifications_version', flat=True).first()
+
+
+def mark_notifications_changed(student_id):
+    """Drop the cached unread count and bump the recipient's version stamp."""
+    invalidate_unread_count(student_id)
+    StudentProfile.objects.filter(pk=student_id).update(notifications_version=F('notifications_version') + 1)
+
+
+def invalidate_student_id(user_id):
+    cache.delete(STUDENT_ID_KEY.format(user_id))
@@ -0,0 +1,88 @@
+"""
+In-process pub/sub for notification push (Server-Sent Events).
+
+`notifications_stream` subscribes one asyncio queue per open connection,
+keyed by the recipient's StudentProfile id. Publishing is thread-safe, so
+sync code (views, signal handlers) can publish into the ASGI event loop.
+
+Subscribers only receive events published by the same process. When the
+site runs several worker processes the stream also re-checks the (shared)
+cached unread count on every keepalive tick, so a missed event shows up
+within one keepalive interval instead of being lost.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+
+from .notification_cache import unread_count
+
+# Events queued per connection before the oldest ones are dropped.
+QUEUE_SIZE = 50
+
+
+def _put(queue, event):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+class NotificationBroker:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, student_id):
+        """Register a queue for `student_id`. Must be called from the event loop."""
+        queue = asyncio.Queue(QUEUE_SIZE)
+        entry = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers[student_id].add(entry)
+        return queue
+
+    def unsubscribe(self, student_id, queue):
+        with self._lock:
+            entries = self._subscribers.get(student_id)
+            if not entries:
+                return
+            entries.difference_update({e for e in entries if e[1] is queue})
+            if not entries:
+                del self._subscribers[student_id]
+
+    def subscriber_count(self, student_id=None):
+        with self._lock:
+            if student_id is not None:
+                return len(self._subscribers.get(student_id, ()))
+            return sum(len(entries) for entries in self._subscribers.values())
+
+    def publish(self, student_id, event):
+        """Deliver `event` to every open stream of `student_id`. Safe from any thread."""
+        with self._lock:
+            entries = list(self._subscribers.get(student_id, ()))
+        for loop, queue in entries:
+            try:
+                loop.call_soon_threadsafe(_put, queue, event)
+            except RuntimeError:
+                # The loop has shut down; the connection is gone.
+                self.unsubscribe(student_id, queue)
+        return len(entries)
+
+
+broker = NotificationBroker()
+
+
+def publish_notification(notification):
+    """Push a newly created notification and the new unread count to its recipient."""
+    student_id = notification.recipient_id
+    if not broker.subscriber_count(student_id):
+        return 0
+    return broker.publish(student_id, {
+        'unread_count': unread_count(student_id),
+        'notification': notification.to_dict(),
+    })
+
+
+def publish_unread_count(student_id):
+    """Push the current unread count, e.g. after notifications were marked read."""
+    if not broker.subscriber_count(student_id):
+        return 0
+    return broker.publish(student_id, {'unread_count': unread_count(student_id)})
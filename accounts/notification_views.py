@@ -1,10 +1,20 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render, get_object_or_404
-from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from asgiref.sync import sync_to_async
+from django.views.decorators.http import condition, require_POST
 from .models import Project, StudentProfile, StudentFollow, Notification
+from .notification_cache import (mark_notifications_changed, notifications_version,
+                                 student_id_for_user, unread_count)
+from .notification_events import broker, publish_unread_count
+from django.db.models import Q
 from django.utils import timezone
+import asyncio
+import datetime
 import json
+import time
 from django.http import JsonResponse
 
 @login_required
@@ -56,9 +66,29 @@ def toggle_follow(request, student_id):
         'following': following
     })
 
+# Notifications rendered (and marked as read) per page of the notifications view.
+NOTIFICATIONS_PAGE_SIZE = 20
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _encode_cursor(notification):
+    """Keyset cursor for the (created_at, id) position of `notification`."""
+    micros = (notification.created_at - _EPOCH) // datetime.timedelta(microseconds=1)
+    return f'{micros}-{notification.id}'
+
+
+def _decode_cursor(value):
+    try:
+        micros, pk = value.split('-')
+        return _EPOCH + datetime.timedelta(microseconds=int(micros)), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
 @login_required
 def notifications(request):
     error_message = None
+    next_cursor = None
     try:
         # Get the student profile - explicitly handle the case where it doesn't exist
         try:
@@ -69,90 +99,136 @@ def notifications(request):
                 'error_message': "You don't have a student profile."
             })
 
-        # Try to get notifications and related objects
+        # Keyset pagination on (created_at, id): newest first, one page at a time
         notifications = Notification.objects.filter(
             recipient=student_profile
-        ).select_related('sender', 'project', 'hiring_process').order_by('-created_at')
+        ).select_related('sender', 'project', 'hiring_process').order_by('-created_at', '-id')
+
+        cursor = _decode_cursor(request.GET.get('cursor', ''))
+        if cursor:
+            created_at, pk = cursor
+            notifications = notifications.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        notifications = list(notifications[:NOTIFICATIONS_PAGE_SIZE + 1])
+        if len(notifications) > NOTIFICATIONS_PAGE_SIZE:
+            notifications = notifications[:NOTIFICATIONS_PAGE_SIZE]
+            next_cursor = _encode_cursor(notifications[-1])
+
+        # Mark only the notifications on this page as read
+        unread_ids = [n.id for n in notifications if not n.is_read]
+        if unread_ids and Notification.objects.filter(id__in=unread_ids).update(is_read=True):
+            mark_notifications_changed(student_profile.id)
+            publish_unread_count(student_profile.id)
 
-        # Pre-process notification data safely
-        for notification in notifications:
-            if notification.data:
-                try:
-                    # Try to parse and validate JSON data
-                    json_data = json.loads(notification.data)
-                    if isinstance(json_data, dict):
-                        # Format message for display
-                        if 'job_title' in json_data:
-                            notification.data = f"Job Title: {json_data.get('job_title')}"
-                            if 'message' in json_data:
-                                notification.data += f"\nMessage: {json_data.get('message')}"
-                    else:
-                        notification.data = str(notification.data)
-                except (json.JSONDecodeError, TypeError, ValueError):
-                    # If JSON is invalid, display as is
-                    pass
-
-        # Mark notifications as read
-        notifications.filter(is_read=False).update(is_read=True)
-
-    except AttributeError as e:
-        # Handle case where user doesn't have a student profile
-        notifications = Notification.objects.none()
-        error_message = "You don't have a student profile."
     except Exception as e:
         # Handle other errors
         import traceback
         print('Error in notifications view:', str(e))
         traceback.print_exc()
-        notifications = Notification.objects.none()
+        notifications = []
         error_message = str(e)
 
     return render(request, 'accounts/notifications.html', {
         'notifications': notifications,
+        'next_cursor': next_cursor,
         'error_message': error_message
     })
 
 
+def _unread_json_etag(request):
+    student_id = student_id_for_user(request.user)
+    if student_id is None:
+        return None
+    version = notifications_version(student_id)
+    if version is None:
+        return None
+    return f'n{student_id}-{version}'
+
+
 @login_required
+@condition(etag_func=_unread_json_etag)
 def notifications_unread_json(request):
-    """Return unread notifications (count + list) as JSON for polling clients."""
-    try:
-        student = request.user.student_profile
-    except Exception:
+    """Return unread notifications (count + list) as JSON for polling clients.
+
+    Answers ``If-None-Match`` with 304 while the recipient's notifications
+    haven't changed. ``?since_id=N`` limits the list to notifications newer
+    than N, so a client only downloads what it hasn't seen yet.
+    """
+    student_id = student_id_for_user(request.user)
+    if student_id is None:
         return JsonResponse({'success': False, 'error': 'No student profile'}, status=400)
 
-    unread_qs = Notification.objects.filter(recipient=student, is_read=False).select_related('sender', 'project', 'hiring_process')
-
-    notifs = []
-    for n in unread_qs.order_by('-created_at')[:10]:
-        item = {
-            'id': n.id,
-            'type': n.notification_type,
-            'sender': n.sender.username,
-            'created_at': n.created_at.isoformat(),
-            'is_read': n.is_read,
-        }
-        if n.project:
-            item['project'] = {'id': n.project.id, 'title': n.project.title}
-        if n.hiring_process:
-            item['hiring'] = {
-                'id': n.hiring_process.id,
-                'job_title': n.hiring_process.job_title,
-                'message': n.hiring_process.message
-            }
-        # if data stored, try to include
-        if n.data:
-            try:
-                item['data'] = json.loads(n.data)
-            except Exception:
-                item['data'] = n.data
-        notifs.append(item)
+    unread_qs = Notification.objects.filter(recipient_id=student_id, is_read=False)
+    since_id = request.GET.get('since_id', '')
+    if since_id.isdigit():
+        unread_qs = unread_qs.filter(id__gt=int(since_id))
 
-    return JsonResponse({
+    notifs = [
+        n.to_dict()
+        for n in unread_qs.select_related('sender', 'project', 'hiring_process').order_by('-created_at')[:10]
+    ]
+
+    response = JsonResponse({
         'success': True,
-        'unread_count': unread_qs.count(),
+        'unread_count': unread_count(student_id),
         'notifications': notifs
     })
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _sse(payload):
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+async def notifications_stream(request):
+    """Server-Sent Events stream of new notifications and unread-count changes.
+
+    Only available when served through ASGI (core/asgi.py). Under WSGI it
+    answers 204, which tells EventSource clients to stop reconnecting and
+    fall back to polling notifications_unread_json.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    student_id = await sync_to_async(student_id_for_user)(request.user)
+    if student_id is None:
+        return JsonResponse({'success': False, 'error': 'No student profile'}, status=403)
+
+    keepalive = getattr(settings, 'NOTIFICATION_STREAM_KEEPALIVE', 25)
+    max_age = getattr(settings, 'NOTIFICATION_STREAM_MAX_AGE', 300)
+    get_unread_count = sync_to_async(unread_count)
+    queue = broker.subscribe(student_id)
+
+    async def events():
+        try:
+            last_count = await get_unread_count(student_id)
+            yield f"retry: {keepalive * 1000}\n\n"
+            yield _sse({'unread_count': last_count})
+            # Close after max_age so EventSource reconnects; this bounds the
+            # lifetime of streams whose client went away without us noticing.
+            deadline = time.monotonic() + max_age
+            while time.monotonic() < deadline:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    count = await get_unread_count(student_id)
+                    if count != last_count:
+                        last_count = count
+                        yield _sse({'unread_count': count})
+                    else:
+                        yield ": keepalive\n\n"
+                    continue
+                last_count = event.get('unread_count', last_count)
+                yield _sse(event)
+        finally:
+            broker.unsubscribe(student_id, queue)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 @login_required
 @require_POST
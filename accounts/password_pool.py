@@ -0,0 +1,17 @@
+"""
+Worker-side half of the password hashing pool used by accounts.student_import.
+
+Spawned workers unpickle these functions by importing this module, before
+Django is set up, so it must not import models (or anything that does) at
+module level.
+"""
+
+
+def setup_worker():
+    import django
+    django.setup()
+
+
+def hash_password(password):
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
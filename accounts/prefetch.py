@@ -0,0 +1,36 @@
+"""
+Top-N-per-group prefetching.
+
+``Prefetch('projects', queryset=...)[:3]`` isn't possible (Django refuses to
+prefetch a sliced queryset), so pages that show "the latest few projects of
+each student" used to run one query per student. ``top_n()`` instead numbers
+each group's rows with ``ROW_NUMBER() OVER (PARTITION BY <group> ORDER BY ...)``
+and keeps those numbered <= N, so ``prefetch_top_n()`` fetches the first N rows
+of every group on the page in a single query.
+"""
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+
+
+def _expression(field):
+    if not isinstance(field, str):
+        return field
+    if field.startswith('-'):
+        return F(field[1:]).desc()
+    return F(field).asc()
+
+
+def top_n(queryset, group_by, limit, order_by):
+    """
+    The first `limit` rows of `queryset` for each distinct value of `group_by`,
+    ranked by `order_by` (a list of field names / expressions, as for order_by()).
+    """
+    ordering = [_expression(field) for field in order_by]
+    return queryset.annotate(
+        group_rank=Window(RowNumber(), partition_by=F(group_by), order_by=ordering)
+    ).filter(group_rank__lte=limit).order_by(group_by, 'group_rank')
+
+
+def prefetch_top_n(lookup, queryset, group_by, limit, order_by, to_attr):
+    """A Prefetch of `lookup` holding only the first `limit` related rows per object, as a list on `to_attr`."""
+    return Prefetch(lookup, queryset=top_n(queryset, group_by, limit, order_by), to_attr=to_attr)
@@ -0,0 +1,154 @@
+"""
+Full-text search over public projects (title, tags, description).
+
+The index lives next to ``accounts_project`` in a backend-specific table
+created by migration 0028:
+
+* SQLite: an FTS5 virtual table ``accounts_project_fts`` keyed by project id,
+  ranked with ``bm25()`` and highlighted with ``snippet()``/``highlight()``.
+* PostgreSQL: ``accounts_project_search`` with a weighted ``tsvector`` column
+  behind a GIN index, ranked with ``ts_rank_cd()`` and highlighted with
+  ``ts_headline()``.
+
+Rows are kept current by the Project save/delete signals in signals.py;
+``manage.py rebuild_project_search`` backfills or repairs the whole index.
+Neither table has a foreign key to accounts_project (so ``flush`` can truncate
+it); searches join against live projects, so a stray row is never shown.
+"""
+import re
+
+from django.db import connection
+from django.utils.html import escape
+
+from .models import Project
+
+SQLITE_TABLE = 'accounts_project_fts'
+POSTGRES_TABLE = 'accounts_project_search'
+
+# Title matches outrank tag matches, which outrank description matches
+SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Highlight markers that can't appear in user text; swapped for <mark> after escaping
+_START, _STOP = '\x02', '\x03'
+
+SEARCH_PAGE_SIZE = 20
+
+
+def is_supported():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def _terms(query):
+    """Split user input into plain word tokens (no FTS operators)."""
+    return re.findall(r'\w+', query.lower())[:10]
+
+
+def _mark(text):
+    """Escape `text` and turn the highlight markers into <mark> tags."""
+    return escape(text).replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+def _insert(cursor, project):
+    if connection.vendor == 'sqlite':
+        cursor.execute(
+            f'INSERT INTO {SQLITE_TABLE} (rowid, title, tags, description) VALUES (%s, %s, %s, %s)',
+            [project.pk, project.title, project.tags or '', project.description or ''],
+        )
+    else:
+        cursor.execute(
+            f"INSERT INTO {POSTGRES_TABLE} (project_id, document) VALUES (%s, "
+            f"setweight(to_tsvector('english', %s), 'A') || "
+            f"setweight(to_tsvector('english', %s), 'B') || "
+            f"setweight(to_tsvector('english', %s), 'C'))",
+            [project.pk, project.title, project.tags or '', project.description or ''],
+        )
+
+
+def index_project(project):
+    """Insert or refresh `project` in the index (drops it when it isn't public)."""
+    if not is_supported():
+        return
+    remove_project(project.pk)
+    if project.visibility == 'Public':
+        with connection.cursor() as cursor:
+            _insert(cursor, project)
+
+
+def remove_project(project_id):
+    if not is_supported():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s', [project_id])
+        else:
+            cursor.execute(f'DELETE FROM {POSTGRES_TABLE} WHERE project_id = %s', [project_id])
+
+
+def rebuild_index(batch_size=500):
+    """Re-create the whole index from the Project table. Returns the number of indexed projects."""
+    if not is_supported():
+        return 0
+    indexed = 0
+    projects = Project.objects.filter(visibility='Public').only('id', 'title', 'tags', 'description')
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE if connection.vendor == "sqlite" else POSTGRES_TABLE}')
+        for project in projects.iterator(chunk_size=batch_size):
+            _insert(cursor, project)
+            indexed += 1
+    return indexed
+
+
+def search_projects(query, page=1, page_size=SEARCH_PAGE_SIZE):
+    """
+    Rank public projects against `query`. Returns (results, has_next), where
+    each result is a dict with the Project, its rank and escaped HTML
+    `title_html` / `snippet_html` with matches wrapped in <mark>.
+    """
+    terms = _terms(query)
+    if not terms or not is_supported():
+        return [], False
+    offset = (max(page, 1) - 1) * page_size
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            # Every term must match; the last one also matches as a prefix (search-as-you-type)
+            match = ' '.join(f'"{t}"' for t in terms[:-1]) + f' "{terms[-1]}"*'
+            cursor.execute(
+                f"SELECT rowid, bm25({SQLITE_TABLE}, %s, %s, %s) AS rank, "
+                f"highlight({SQLITE_TABLE}, 0, %s, %s), "
+                f"snippet({SQLITE_TABLE}, -1, %s, %s, '…', 24) "
+                f"FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s "
+                f"ORDER BY rank LIMIT %s OFFSET %s",
+                [*SQLITE_WEIGHTS, _START, _STOP, _START, _STOP, match.strip(), page_size + 1, offset],
+            )
+            rows = [(pk, -rank, title, snippet) for pk, rank, title, snippet in cursor.fetchall()]
+        else:
+            tsquery = ' & '.join(terms[:-1] + [f'{terms[-1]}:*'])
+            options = f'StartSel="{_START}", StopSel="{_STOP}", MaxFragments=2, MaxWords=24, MinWords=8'
+            cursor.execute(
+                f"SELECT s.project_id, ts_rank_cd(s.document, q) AS rank, "
+                f"ts_headline('english', p.title, q, %s), "
+                f"ts_headline('english', p.description || ' ' || p.tags, q, %s) "
+                f"FROM {POSTGRES_TABLE} s "
+                f"JOIN accounts_project p ON p.id = s.project_id, "
+                f"to_tsquery('english', %s) q "
+                f"WHERE s.document @@ q "
+                f"ORDER BY rank DESC, s.project_id DESC LIMIT %s OFFSET %s",
+                [f'{options}, HighlightAll=true', options, tsquery, page_size + 1, offset],
+            )
+            rows = cursor.fetchall()
+
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    projects = Project.objects.select_related('student').in_bulk([row[0] for row in rows])
+    results = [
+        {
+            'project': projects[pk],
+            'rank': rank,
+            'title_html': _mark(title),
+            'snippet_html': _mark(snippet),
+        }
+        for pk, rank, title, snippet in rows
+        if pk in projects
+    ]
+    return results, has_next
@@ -5,11 +5,19 @@ from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
 import razorpay
-import json
 
 from .models import RecruiterProfile
-from django.db.models import Count, Q, Sum
-from .models import StudentProfile, Project, HiringProcess, Notification
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.core.paginator import Paginator
+from .models import StudentProfile, Project, HiringProcess, Notification, StudentFollow
+from .facets import course_facets, tag_facets
+from .image_derivatives import prefetch_variants
+from . import leaderboard, project_search, trending
+from .prefetch import prefetch_top_n
+from .view_buffer import view_buffer
 
 @login_required
 def student_projects(request):
@@ -22,28 +30,26 @@ def student_projects(request):
         if recruiter.status != 'approved':
             return HttpResponseForbidden("Your account is pending approval")
 
-        # Get all public projects with their students
+        # Get all public projects with their students, optionally narrowed to one tag
         projects = Project.objects.filter(
             visibility='Public'
-        ).select_related('student').order_by('-created_at')
-
-        # Get unique tags from all projects
-        all_tags = set()
-        projects_with_tags = []
-        for project in projects:
-            tags = [tag.strip() for tag in project.tags.split(',')] if project.tags else []
-            all_tags.update(tags)
-            projects_with_tags.append({
-                'project': project,
-                'tags': tags
-            })
+        ).select_related('student').with_tags().order_by('-created_at')
+        active_tag = request.GET.get('tag', '').strip()
+        if active_tag:
+            projects = projects.tagged(active_tag)
+
+        projects_with_tags = [
+            {'project': project, 'tags': project.tag_names}
+            for project in projects
+        ]
 
-        # Sort tags alphabetically
-        sorted_tags = sorted(list(all_tags))
+        # Cached tag filter options, with public project counts
+        all_tags = tag_facets()
 
         return render(request, 'accounts/recruiter_student_projects.html', {
             'projects': projects_with_tags,
-            'all_tags': sorted_tags,
+            'all_tags': all_tags,
+            'active_tag': active_tag.lower(),
             'recruiter': recruiter,
             'company_name': recruiter.company_name,
             'contact_person': recruiter.contact_person,
@@ -53,6 +59,146 @@ def student_projects(request):
         print(f"Error in student_projects: {str(e)}")
         return HttpResponseForbidden(str(e))
 
+@login_required
+def search_projects(request):
+    """Ranked full-text search over public projects, one page of JSON results at a time"""
+    try:
+        if not hasattr(request.user, 'recruiter_profile'):
+            return JsonResponse({'success': False, 'error': 'No recruiter profile found'}, status=403)
+        if request.user.recruiter_profile.status != 'approved':
+            return JsonResponse({'success': False, 'error': 'Your account is pending approval'}, status=403)
+
+        query = request.GET.get('q', '').strip()
+        try:
+            page = max(1, int(request.GET.get('page', 1)))
+        except ValueError:
+            page = 1
+
+        results, has_next = project_search.search_projects(query, page=page)
+        return JsonResponse({
+            'success': True,
+            'query': query,
+            'page': page,
+            'has_next': has_next,
+            'results': [
+                {
+                    'id': r['project'].id,
+                    'title': r['project'].title,
+                    'title_html': r['title_html'],
+                    'snippet_html': r['snippet_html'],
+                    'tags': r['project'].tag_names,
+                    'student_name': r['project'].student.student_name,
+                    'views': r['project'].view_count(),
+                    'likes': r['project'].like_count(),
+                    'rank': r['rank'],
+                    'url': reverse('view_project_details', args=[r['project'].id]),
+                }
+                for r in results
+            ],
+        })
+    except Exception as e:
+        print(f"Error in search_projects: {str(e)}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+@login_required
+def trending_projects_feed(request):
+    """Paginated JSON feed of trending public projects"""
+    try:
+        if not hasattr(request.user, 'recruiter_profile'):
+            return JsonResponse({'success': False, 'error': 'No recruiter profile found'}, status=403)
+        if request.user.recruiter_profile.status != 'approved':
+            return JsonResponse({'success': False, 'error': 'Your account is pending approval'}, status=403)
+
+        projects = trending.trending_projects().select_related('student').with_tags()
+        paginator = Paginator(projects, trending.FEED_PAGE_SIZE)
+        page = paginator.get_page(request.GET.get('page'))
+        return JsonResponse({
+            'success': True,
+            'page': page.number,
+            'has_next': page.has_next(),
+            'results': [
+                {
+                    'id': project.id,
+                    'title': project.title,
+                    'description': project.description,
+                    'tags': project.tag_names,
+                    'screenshot': project.screenshot.url if project.screenshot else None,
+                    'student_name': project.student.student_name,
+                    'views': project.view_count(),
+                    'likes': project.like_count(),
+                    'url': reverse('view_project_details', args=[project.id]),
+                }
+                for project in page
+            ],
+        })
+    except Exception as e:
+        print(f"Error in trending_projects_feed: {str(e)}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+TALENT_PAGE_SIZE = 24
+
+# sort option -> annotation/field the talent grid is ordered by (newest id breaks ties)
+TALENT_SORTS = {
+    'recent': 'id',
+    'popular': 'profile_views',
+    'projects': 'project_count',
+}
+
+
+def _count_subquery(model, field):
+    return Coalesce(Subquery(
+        model.objects.filter(**{field: OuterRef('pk')})
+        .order_by().values(field).annotate(c=Count('pk')).values('c')
+    ), Value(0))
+
+
+def _talent_queryset(recruiter, params):
+    """Students matching the browse_talent search/course filter, with card counts annotated."""
+    students = StudentProfile.objects.annotate(
+        project_count=_count_subquery(Project, 'student'),
+        follower_count=_count_subquery(StudentFollow, 'following'),
+        is_saved=Exists(RecruiterProfile.saved_students.through.objects.filter(
+            recruiterprofile=recruiter, studentprofile=OuterRef('pk')
+        )),
+    ).prefetch_related(
+        Prefetch('projects', queryset=Project.objects.only('id', 'student_id', 'tags'))
+    )
+
+    search = params.get('q', '').strip()
+    if search:
+        students = students.filter(
+            Q(student_name__icontains=search)
+            | Q(course_details__icontains=search)
+            | Exists(Project.objects.filter(student=OuterRef('pk'), tags__icontains=search))
+        )
+    course = params.get('course', '').strip()
+    if course:
+        students = students.filter(course_details=course)
+    return students
+
+
+def _talent_page(recruiter, params):
+    """Return (students, next_cursor) for one page of the talent grid."""
+    sort = params.get('sort') if params.get('sort') in TALENT_SORTS else 'recent'
+    key = TALENT_SORTS[sort]
+    students = _talent_queryset(recruiter, params).order_by(f'-{key}', '-id')
+
+    # Cursor is "<sort value>-<id>" of the last card already shown
+    try:
+        value, pk = (int(part) for part in params.get('cursor', '').split('-'))
+        students = students.filter(Q(**{f'{key}__lt': value}) | Q(**{key: value, 'id__lt': pk}))
+    except ValueError:
+        pass
+
+    students = list(students[:TALENT_PAGE_SIZE + 1])
+    next_cursor = None
+    if len(students) > TALENT_PAGE_SIZE:
+        students = students[:TALENT_PAGE_SIZE]
+        last = students[-1]
+        next_cursor = f'{getattr(last, key)}-{last.id}'
+    return prefetch_variants(students, 'image'), next_cursor
+
+
 @login_required
 def browse_talent(request):
     """Browse student talent profiles"""
@@ -69,22 +215,20 @@ def browse_talent(request):
         print(f"Recruiter status: {recruiter.status}")
         if recruiter.status != 'approved':
             return HttpResponseForbidden("Your account is pending approval")
-            
-        # Get all students with their related data
-        students = StudentProfile.objects.all().prefetch_related(
-            'projects', 
-            'followers'
-        ).order_by('-profile_views')
-        
-        # Get unique courses for filter
-        courses = StudentProfile.objects.values_list(
-            'course_details', 
-            flat=True
-        ).distinct().order_by('course_details')
+
+        # First page of matching students; further pages come from browse_talent_more
+        students, next_cursor = _talent_page(recruiter, request.GET)
+
+        # Cached course filter options, with student counts
+        courses = course_facets()
         
         return render(request, 'accounts/browse_talent.html', {
             'students': students,
+            'next_cursor': next_cursor,
             'courses': courses,
+            'search': request.GET.get('q', ''),
+            'selected_course': request.GET.get('course', ''),
+            'sort': request.GET.get('sort') if request.GET.get('sort') in TALENT_SORTS else 'recent',
             'recruiter': recruiter,
             'company_name': recruiter.company_name,
             'contact_person': recruiter.contact_person,
@@ -93,6 +237,28 @@ def browse_talent(request):
     except Exception as e:
         return HttpResponseForbidden(str(e))
 
+@login_required
+def browse_talent_more(request):
+    """Next page of talent cards for the "Load more" button"""
+    try:
+        if not hasattr(request.user, 'recruiter_profile'):
+            return JsonResponse({'success': False, 'error': 'No recruiter profile found'}, status=403)
+        recruiter = request.user.recruiter_profile
+        if recruiter.status != 'approved':
+            return JsonResponse({'success': False, 'error': 'Your account is pending approval'}, status=403)
+
+        students, next_cursor = _talent_page(recruiter, request.GET)
+        html = render_to_string('accounts/talent_cards.html', {'students': students}, request=request)
+        return JsonResponse({
+            'success': True,
+            'html': html,
+            'count': len(students),
+            'next_cursor': next_cursor,
+        })
+    except Exception as e:
+        print(f"Error in browse_talent_more: {str(e)}")
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
 @login_required
 def toggle_save_student(request, student_id):
     """Toggle save/unsave a student profile"""
@@ -160,10 +326,10 @@ def initiate_hiring_process(request, student_id):
                 notification_type='hire',
                 project=None,  # No specific project for general hiring
                 hiring_process=hiring_process,
-                data=json.dumps({
+                data={
                     'job_title': hiring_process.job_title,
                     'message': hiring_process.message
-                })
+                }
             )
             
             return JsonResponse({
@@ -188,10 +354,10 @@ def view_student_profile(request, student_id):
     """View a student's profile"""
     try:
         student = get_object_or_404(StudentProfile, id=student_id)
-        projects = student.projects.filter(visibility='Public').order_by('-created_at')
+        projects = student.projects.filter(visibility='Public').with_tags().order_by('-created_at')
         
-        # Increment profile views
-        student.increment_profile_views()
+        # Increment profile views (buffered, written with an F() update)
+        view_buffer.record_profile_view(student.id)
         
         # Check if student is saved by the recruiter
         is_saved = request.user.recruiter_profile.saved_students.filter(id=student_id).exists()
@@ -218,13 +384,13 @@ def view_project_details(request, project_id):
         if project.visibility != 'Public':
             return HttpResponseForbidden("This project is private")
             
-        # Increment project views - using get_or_create to avoid duplicates
-        project.views.get_or_create(user=request.user)
+        # Record the view - buffered and de-duplicated per (project, user)
+        view_buffer.record_project_view(project.id, request.user.id)
         
         recruiter = request.user.recruiter_profile
         return render(request, 'accounts/project_details_recruiter_view.html', {
             'project': project,
-            'tags': project.tags.split(',') if project.tags else [],
+            'tags': project.tag_names,
             'recruiter': recruiter,
             'company_name': recruiter.company_name,
             'contact_person': recruiter.contact_person
@@ -251,25 +417,16 @@ def recruiter_home(request):
             print(f"Recruiter {request.user.username} is not approved")
             return HttpResponseForbidden("Your account is pending approval")
         
-        # Get top students (based on project count and views)
-        top_students = StudentProfile.objects.annotate(
-            project_count=Count('projects'),
-            total_views=Count('projects__views')
-        ).order_by('-project_count', '-total_views')[:6]
-
-        # Get recent public projects
-        recent_projects = Project.objects.filter(
-            visibility='Public'
-        ).select_related('student').order_by('-created_at')[:6]
-
-        # Prepare projects with split tags
-        projects_with_tags = []
-        for project in recent_projects:
-            tags = project.tags.split(',') if project.tags else []
-            projects_with_tags.append({
-                'project': project,
-                'tags': tags
-            })
+        # Top students from the materialized leaderboard (see accounts.leaderboard)
+        top_students = leaderboard.top_students(6)
+
+        # Trending public projects (time-decayed likes and views)
+        recent_projects = trending.trending_projects().select_related('student').with_tags()[:6]
+
+        projects_with_tags = [
+            {'project': project, 'tags': project.tag_names}
+            for project in recent_projects
+        ]
 
         # Calculate total profile views from all viewed student profiles
         total_profile_views = StudentProfile.objects.filter(
@@ -336,16 +493,21 @@ def saved_profiles(request):
     """View saved student profiles"""
     try:
         recruiter = request.user.recruiter_profile
-        saved_students = recruiter.saved_students.all().prefetch_related('projects')
-        
-        # For each student, get their public projects
+        # Each student's three latest public projects (and their tags), in one query per relation
+        saved_students = recruiter.saved_students.all().prefetch_related(
+            prefetch_top_n(
+                'projects', Project.objects.filter(visibility='Public').with_tags(),
+                'student', 3, ['-created_at', '-id'], to_attr='recent_public_projects',
+            )
+        )
+
         students_with_projects = []
         for student in saved_students:
-            public_projects = student.projects.filter(visibility='Public').order_by('-created_at')[:3]
+            public_projects = student.recent_public_projects
             students_with_projects.append({
                 'student': student,
                 'projects': public_projects,
-                'skills': set().union(*[set(p.tags.split(',')) for p in public_projects if p.tags])
+                'skills': set().union(*[p.tag_names for p in public_projects])
             })
         
         return render(request, 'accounts/saved_profiles.html', {
@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import developer_snapshots, image_derivatives, leaderboard, storage
+from .facets import invalidate_project_facets, invalidate_student_facets
+from .models import Notification, Project, RecruiterProfile, StudentFollow, StudentProfile
+from .notification_cache import invalidate_student_id, mark_notifications_changed
+from .notification_events import publish_notification
+from .project_search import index_project, remove_project
+from .trending import initial_score
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def notification_changed(sender, instance, **kwargs):
+    mark_notifications_changed(instance.recipient_id)
+    if kwargs.get('created'):
+        transaction.on_commit(lambda: publish_notification(instance))
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def student_profile_changed(sender, instance, **kwargs):
+    invalidate_student_id(instance.user_id)
+    invalidate_student_facets()
+    developer_snapshots.schedule_refresh(instance.pk)
+    if kwargs.get('created'):
+        leaderboard.schedule_refresh(instance.pk)
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=StudentProfile)
+@receiver(pre_save, sender=RecruiterProfile)
+def upload_replaced(sender, instance, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        storage.release_replaced(instance, update_fields)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=StudentProfile)
+@receiver(post_delete, sender=RecruiterProfile)
+def upload_deleted(sender, instance, **kwargs):
+    storage.release_deleted(instance)
+
+
+@receiver(post_save, sender=StudentProfile)
+def student_profile_saved(sender, instance, **kwargs):
+    image_derivatives.schedule(instance.image)
+
+
+@receiver(post_save, sender=RecruiterProfile)
+def recruiter_profile_saved(sender, instance, **kwargs):
+    image_derivatives.schedule(instance.company_logo)
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, **kwargs):
+    if kwargs.get('created'):
+        instance.trending_score = initial_score(instance)
+        Project.objects.filter(pk=instance.pk).update(trending_score=instance.trending_score)
+    instance.sync_tags()
+    index_project(instance)
+    invalidate_project_facets()
+    developer_snapshots.schedule_refresh(instance.student_id)
+    leaderboard.schedule_refresh(instance.student_id)
+    image_derivatives.schedule(instance.screenshot)
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    remove_project(instance.pk)
+    invalidate_project_facets()
+    developer_snapshots.schedule_refresh(instance.student_id)
+    leaderboard.schedule_refresh(instance.student_id)
+
+
+@receiver(post_save, sender=StudentFollow)
+@receiver(post_delete, sender=StudentFollow)
+def student_follow_changed(sender, instance, **kwargs):
+    leaderboard.schedule_refresh(instance.following_id)
@@ -0,0 +1,168 @@
+"""
+Content-addressed storage for uploaded images (project screenshots, student
+photos, company logos).
+
+An upload is stored as ``cas/<h[:2]>/<h><ext>``, where ``h`` is the SHA-256 of
+its content, whatever name it was uploaded under. The StoredFile table is the
+index: one row per stored file, with the number of model fields referencing it.
+
+* Saving content that is already stored writes nothing; it only adds a
+  reference and returns the existing name.
+* ``delete()`` (FieldFile.delete) and ``release()`` each drop one reference.
+  The signals call ``release()`` when a model is deleted or its image is
+  replaced or cleared, and ``retain()`` when a field is pointed at a file
+  that is already stored. The file, its derivatives and its index row are
+  removed once the transaction that dropped the last reference commits.
+
+The names contain a content hash, so /media/ serves them as immutable (see
+core.media). Migration 0038 moves older uploads into ``cas/``. Names that are
+not in the index (files uploaded before that, or missing from disk) act as
+they would on a plain FileSystemStorage.
+"""
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
+
+ROOT = 'cas'
+CHUNK_SIZE = 1024 * 1024
+
+
+def content_hash(chunks):
+    """SHA-256 hex digest of an iterable of byte strings."""
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hashed_name(digest, original_name):
+    """Storage name for content with `digest`, keeping the upload's extension."""
+    ext = os.path.splitext(original_name)[1].lower()
+    return f'{ROOT}/{digest[:2]}/{digest}{ext}'
+
+
+def _index():
+    # accounts.models imports this module for the fields' storage
+    from .models import StoredFile
+    return StoredFile
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def _save(self, name, content):
+        digest = content_hash(content.chunks(CHUNK_SIZE))
+        StoredFile = _index()
+        with transaction.atomic():
+            # The UPDATE locks the row, so concurrent saves and releases of the same content serialize
+            added = StoredFile.objects.filter(content_hash=digest).update(refcount=F('refcount') + 1)
+            if not added:
+                try:
+                    with transaction.atomic():
+                        StoredFile.objects.create(
+                            content_hash=digest, name=hashed_name(digest, name), size=content.size, refcount=1,
+                        )
+                except IntegrityError:
+                    # Another upload of the same content got there first
+                    StoredFile.objects.filter(content_hash=digest).update(refcount=F('refcount') + 1)
+            stored = StoredFile.objects.filter(content_hash=digest).values_list('name', flat=True).get()
+
+        if not self.exists(stored):
+            written = super()._save(stored, content)
+            if written != stored:
+                # Lost a race to write the same bytes: keep the first copy
+                super().delete(written)
+        return stored
+
+    def delete(self, name):
+        if not self.release(name):
+            super().delete(name)
+
+    def retain(self, name):
+        """Add a reference to the already stored `name` (a no-op for names that aren't indexed)."""
+        if name:
+            _index().objects.filter(name=name).update(refcount=F('refcount') + 1)
+
+    def release(self, name):
+        """
+        Drop one reference to `name`; once none are left, its file is removed
+        after the transaction commits. Returns False if `name` isn't indexed.
+        """
+        if not name:
+            return False
+        StoredFile = _index()
+        with transaction.atomic():
+            if not StoredFile.objects.filter(name=name, refcount__gt=0).update(refcount=F('refcount') - 1):
+                return False
+            unreferenced = StoredFile.objects.filter(name=name, refcount=0).exists()
+        if unreferenced:
+            transaction.on_commit(lambda: self._remove(name))
+        return True
+
+    def _remove(self, name):
+        from . import image_derivatives
+
+        # Delete the row and the file in one transaction: the DELETE locks the
+        # row, so a concurrent _save() of the same content either re-references
+        # it first (and nothing is deleted) or runs after the file is gone and
+        # writes it again.
+        with transaction.atomic():
+            deleted, _ = _index().objects.filter(name=name, refcount=0).delete()
+            if deleted:
+                super().delete(name)
+        if deleted:
+            image_derivatives.discard(name)
+
+
+_storage = ContentAddressedStorage()
+
+
+def upload_storage():
+    """Storage of the ImageField uploads (a callable, so migrations don't serialize the instance)."""
+    return _storage
+
+
+def _upload_fields(instance):
+    return [
+        field for field in instance._meta.concrete_fields
+        if isinstance(field, models.FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def release_replaced(instance, update_fields=None):
+    """
+    Before `instance` is saved: for each image field whose file changes
+    (a new upload, another stored file, or cleared), release the old file
+    once the save commits, and retain a newly assigned stored one.
+    """
+    fields = [
+        field for field in _upload_fields(instance)
+        if update_fields is None or field.name in update_fields or field.attname in update_fields
+    ]
+    if not fields:
+        return
+    stored = None
+    if instance.pk is not None:
+        stored = type(instance)._base_manager.filter(pk=instance.pk).values_list(
+            *[field.attname for field in fields]
+        ).first()
+    for number, field in enumerate(fields):
+        old = (stored[number] if stored else None) or None
+        fieldfile = getattr(instance, field.attname)
+        # A pending upload gets its reference when FieldFile.save() stores it
+        new = fieldfile.name if fieldfile and fieldfile._committed else None
+        if old == new:
+            continue
+        if new:
+            field.storage.retain(new)
+        if old:
+            transaction.on_commit(lambda field=field, old=old: field.storage.release(old))
+
+
+def release_deleted(instance):
+    """After `instance` is deleted: release its files once the delete commits."""
+    for field in _upload_fields(instance):
+        name = getattr(instance, field.attname).name
+        if name:
+            transaction.on_commit(lambda field=field, name=name: field.storage.release(name))
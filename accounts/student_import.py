@@ -0,0 +1,200 @@
+"""
+Bulk student import from CSV or JSON, for onboarding a whole course at once.
+
+Every row gets the same checks as ``add_student``, but run set-wise: the
+usernames, emails and contacts of the whole batch are looked up with one
+``__in`` query each, and duplicates inside the batch are caught in memory.
+Passwords (PBKDF2 by default, deliberately slow) are hashed in a process pool
+so a batch uses every core instead of blocking one worker for minutes.
+Valid rows are then written with two ``bulk_create`` calls in one
+transaction; invalid rows are skipped and reported by row number.
+
+Used by the admin endpoint ``/accounts/admin-import-students/`` and by
+``manage.py import_students``.
+"""
+import csv
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import EmailValidator
+from django.db import IntegrityError, transaction
+
+from . import password_pool
+from .facets import invalidate_student_facets
+from .models import StudentProfile
+
+REQUIRED_FIELDS = ('username', 'password', 'student_name', 'student_contact', 'student_email', 'course_joined_date')
+OPTIONAL_FIELDS = ('student_address', 'course_details')
+
+CONTACT_RE = re.compile(r'^\+?[1-9]\d{7,14}$')
+
+# Values per "__in" lookup, well under every backend's parameter limit
+LOOKUP_BATCH = 2000
+
+# Below this many passwords, starting worker processes costs more than it saves
+POOL_THRESHOLD = 8
+
+
+def parse(data, fmt):
+    """Rows (dicts) from the bytes/str of a CSV file with a header line, or a JSON list of objects."""
+    if isinstance(data, bytes):
+        data = data.decode('utf-8-sig')
+    if fmt == 'csv':
+        return list(csv.DictReader(io.StringIO(data)))
+    if fmt == 'json':
+        rows = json.loads(data)
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError('JSON imports must be a list of objects')
+        return rows
+    raise ValueError(f'Unknown import format {fmt!r}; use csv or json')
+
+
+def format_for(filename):
+    return 'json' if filename.lower().endswith('.json') else 'csv'
+
+
+def _clean(row):
+    return {
+        field: str(row.get(field) or '').strip()
+        for field in REQUIRED_FIELDS + OPTIONAL_FIELDS
+    }
+
+
+def _check_row(row, today):
+    """Format errors of a single row, as add_student reports them."""
+    errors = [f'{field} is required.' for field in REQUIRED_FIELDS if not row[field]]
+    if row['course_joined_date']:
+        try:
+            joined = datetime.datetime.strptime(row['course_joined_date'], '%Y-%m-%d').date()
+            if joined > today:
+                errors.append('Course joined date must not be in the future.')
+        except ValueError:
+            errors.append('Invalid course joined date.')
+    if row['student_email']:
+        try:
+            EmailValidator()(row['student_email'])
+        except ValidationError:
+            errors.append('Please enter a valid email address.')
+    if row['student_contact'] and not CONTACT_RE.match(row['student_contact']):
+        errors.append('Invalid contact number. Enter a valid international number (e.g., +14155552671).')
+    return errors
+
+
+def _existing(queryset, field, values):
+    """The subset of `values` already stored in `field`, in a few batched IN queries."""
+    values = list(values)
+    found = set()
+    for start in range(0, len(values), LOOKUP_BATCH):
+        found.update(queryset.filter(**{f'{field}__in': values[start:start + LOOKUP_BATCH]})
+                     .values_list(field, flat=True))
+    return found
+
+
+def validate(rows):
+    """
+    Clean and check every row. Returns (valid, errors): the cleaned valid rows
+    as (row number, row) pairs, and {row number: [messages]} for the rest.
+    Row numbers start at 1 for the first data row.
+    """
+    today = datetime.date.today()
+    cleaned = [(number, _clean(row)) for number, row in enumerate(rows, 1)]
+    errors = {}
+    for number, row in cleaned:
+        row_errors = _check_row(row, today)
+        if row_errors:
+            errors[number] = row_errors
+
+    # One query per unique column for the whole batch
+    taken = {
+        'username': _existing(User.objects, 'username', {r['username'] for _, r in cleaned}),
+        'student_email': _existing(StudentProfile.objects, 'student_email', {r['student_email'] for _, r in cleaned}),
+        'student_contact': _existing(StudentProfile.objects, 'student_contact',
+                                     {r['student_contact'] for _, r in cleaned}),
+    }
+    labels = {'username': 'Username', 'student_email': 'Email', 'student_contact': 'Contact'}
+    seen = {field: {} for field in taken}
+    for number, row in cleaned:
+        for field, label in labels.items():
+            value = row[field]
+            if not value:
+                continue
+            if value in taken[field]:
+                errors.setdefault(number, []).append(f'{label} already exists.')
+            elif value in seen[field]:
+                errors.setdefault(number, []).append(f'{label} duplicates row {seen[field][value]}.')
+            else:
+                seen[field][value] = number
+
+    valid = [(number, row) for number, row in cleaned if number not in errors]
+    return valid, errors
+
+
+def hash_passwords(passwords, workers=None):
+    """make_password() for each of `passwords`, in a pool of `workers` processes for larger batches."""
+    if workers is None:
+        workers = getattr(settings, 'STUDENT_IMPORT_WORKERS', None) or os.cpu_count() or 1
+    passwords = list(passwords)
+    if workers <= 1 or len(passwords) < POOL_THRESHOLD:
+        return [make_password(p) for p in passwords]
+    # spawn rather than fork: the web process may be running other threads
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(passwords)), mp_context=context,
+                             initializer=password_pool.setup_worker) as pool:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(pool.map(password_pool.hash_password, passwords, chunksize=chunksize))
+
+
+def import_students(rows, dry_run=False, workers=None):
+    """
+    Validate `rows` and create a user and profile for each valid one, in one
+    transaction. Returns {'created': count, 'errors': [{'row', 'username', 'errors'}]}.
+    Nothing is written when `dry_run` is set.
+    """
+    valid, errors = validate(rows)
+    report = [
+        {'row': number, 'username': str(rows[number - 1].get('username') or ''), 'errors': messages}
+        for number, messages in sorted(errors.items())
+    ]
+    if dry_run or not valid:
+        return {'created': 0, 'errors': report}
+
+    hashes = hash_passwords([row['password'] for _, row in valid], workers)
+    try:
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=row['username'], password=password, is_staff=False, is_superuser=False)
+                for (_, row), password in zip(valid, hashes)
+            ], batch_size=1000)
+            profiles = []
+            for user, (_, row) in zip(users, valid):
+                joined = datetime.date.fromisoformat(row['course_joined_date'])
+                profiles.append(StudentProfile(
+                    user=user,
+                    student_name=row['student_name'],
+                    student_contact=row['student_contact'],
+                    student_email=row['student_email'],
+                    student_address=row['student_address'],
+                    course_joined_date=joined,
+                    course_details=row['course_details'],
+                    # bulk_create skips save(), which normally fills these in
+                    joined_year=joined.year,
+                    joined_month=joined.month,
+                ))
+            StudentProfile.objects.bulk_create(profiles, batch_size=1000)
+    except IntegrityError as e:
+        # Someone registered one of these usernames since validation ran
+        report.append({'row': None, 'username': '', 'errors': [f'Import rolled back: {e}']})
+        return {'created': 0, 'errors': report}
+
+    # bulk_create sends no signals
+    invalidate_student_facets()
+    return {'created': len(valid), 'errors': report}
@@ -1,9 +1,16 @@
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+from django.db.models import Count
 from django.utils import timezone
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from .models import Project, ProjectView, ProjectLike, StudentProfile
+from .image_derivatives import prefetch_variants
+from .view_buffer import view_buffer, write_project_views
+from . import leaderboard, trending
+import json
 
 def check_student_profile(view_func):
     def _wrapped_view(request, *args, **kwargs):
@@ -27,11 +34,9 @@ def student_projects(request):
     # Build list of project IDs for which to record views (not admin, not owner)
     record_view_ids = []
     if not request.user.is_superuser:
-        for project in projects:
-            if request.user != project.student.user:
-                record_view_ids.append(project.id)
+        record_view_ids = list(projects.exclude(student__user=request.user).values_list('id', flat=True))
     return render(request, 'accounts/projects.html', {
-        'projects': projects,
+        'projects': prefetch_variants(projects, 'screenshot'),
         'record_view_ids': record_view_ids
     })
 
@@ -94,18 +99,26 @@ def remove_from_recent_uploads(request, project_id):
 def toggle_project_like(request, project_id):
     if request.method == 'POST':
         project = get_object_or_404(Project, id=project_id)
-        like, created = ProjectLike.objects.get_or_create(
-            project=project,
-            user=request.user,
-            defaults={'created_at': timezone.now()}
-        )
-        
-        if not created:
-            # User already liked the project, so unlike it
-            like.delete()
-            liked = False
-        else:
-            liked = True
+        with transaction.atomic():
+            like, created = ProjectLike.objects.get_or_create(
+                project=project,
+                user=request.user,
+                defaults={'created_at': timezone.now()}
+            )
+            
+            if not created:
+                # User already liked the project, so unlike it. A concurrent
+                # unlike (double click) may have deleted the row already.
+                deleted, _ = ProjectLike.objects.filter(pk=like.pk).delete()
+                if deleted:
+                    project.adjust_counters(likes=-1)
+                    trending.remove_like(project.id, like.created_at)
+                liked = False
+            else:
+                project.adjust_counters(likes=1)
+                trending.record_like(project.id, like.created_at)
+                liked = True
+            leaderboard.schedule_refresh(project.student_id)
             
         return JsonResponse({
             'success': True,
@@ -150,7 +163,8 @@ def student_home(request):
         project.delete_url = f'/accounts/project/{project.id}/remove-from-recent/'
         project.time_ago = project.created_at.strftime('%b %d, %Y')
         project.status = 'Published'  # All projects in Recent Uploads are considered published
-    
+    prefetch_variants(user_projects, 'screenshot')
+
     return render(request, 'accounts/student_home.html', {'user_projects': user_projects})
 
 def view_project(request, project_id):
@@ -158,7 +172,7 @@ def view_project(request, project_id):
     user = request.user
     # Only count if not admin and not the owner
     if not user.is_superuser and user != project.student.user:
-        ProjectView.objects.get_or_create(project=project, user=user)
+        view_buffer.record_project_view(project.id, user.id)
     return render(request, 'accounts/project_detail.html', {'project': project})
 
 
@@ -186,12 +200,9 @@ def record_project_view(request):
             
             # Only create new view if not admin and not the owner
             if not user.is_superuser and user != project.student.user:
-                view, created = ProjectView.objects.get_or_create(project=project, user=user)
-                print(f"View record {'created' if created else 'already exists'}")
-                if created:
-                    print("New view recorded!")
-                else:
-                    print("User has already viewed this project")
+                # Buffered; the ProjectView row and views_count are written
+                # by the next view_buffer flush.
+                view_buffer.record_project_view(project.id, user.id)
             else:
                 print("View not counted - user is admin or project owner")
             
@@ -216,3 +227,57 @@ def record_project_view(request):
     
     print("Invalid request - not POST or user not authenticated")
     return JsonResponse({'success': False, 'error': 'Invalid request.'})
+
+
+# Upper bound on project IDs accepted by one record_project_views call.
+MAX_BATCH_VIEW_IDS = 200
+
+
+@login_required
+@require_POST
+def record_project_views(request):
+    """Record views for a whole grid of projects in one request.
+
+    Accepts a JSON body ``{"project_ids": [...]}`` (or repeated ``project_ids``
+    form fields) and returns the current view count of every requested project.
+    Views are not counted for superusers or for the project's owner.
+    """
+    if request.content_type == 'application/json':
+        try:
+            raw_ids = json.loads(request.body or b'{}').get('project_ids', [])
+        except (ValueError, AttributeError):
+            return JsonResponse({'success': False, 'error': 'Invalid JSON body.'}, status=400)
+    else:
+        raw_ids = request.POST.getlist('project_ids')
+
+    if not isinstance(raw_ids, list):
+        return JsonResponse({'success': False, 'error': 'project_ids must be a list.'}, status=400)
+    try:
+        project_ids = list(dict.fromkeys(int(pid) for pid in raw_ids))
+    except (TypeError, ValueError):
+        return JsonResponse({'success': False, 'error': 'project_ids must be integers.'}, status=400)
+    if len(project_ids) > MAX_BATCH_VIEW_IDS:
+        return JsonResponse({
+            'success': False,
+            'error': f'At most {MAX_BATCH_VIEW_IDS} projects per request.'
+        }, status=400)
+
+    user = request.user
+    if project_ids and not user.is_superuser:
+        countable = Project.objects.filter(id__in=project_ids).exclude(
+            student__user=user
+        ).values_list('id', flat=True)
+        with transaction.atomic():
+            write_project_views([(pid, user.id) for pid in countable])
+
+    counts = dict.fromkeys(project_ids, 0)
+    counts.update(
+        ProjectView.objects.filter(project_id__in=project_ids)
+        .values_list('project_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    return JsonResponse({
+        'success': True,
+        'counts': {str(pid): count for pid, count in counts.items()}
+    })
@@ -0,0 +1,34 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from accounts.image_derivatives import variants
+
+register = template.Library()
+
+
+def _srcset(found, ext):
+    return ', '.join(f'{urls[ext]} {width}w' for width, urls in found)
+
+
+@register.simple_tag
+def srcset(fieldfile, ext='webp'):
+    """The srcset value listing `fieldfile`'s derivatives in one format ('' until they exist)."""
+    return _srcset(variants(fieldfile), ext)
+
+
+@register.simple_tag
+def picture(fieldfile, sizes='100vw', **attrs):
+    """
+    A <picture> serving `fieldfile`'s WebP derivatives, with JPEG ones on the
+    <img> as a fallback; a plain <img> of the original until derivatives exist.
+    Extra keyword arguments (alt, class, ...) become attributes of the <img>.
+    """
+    attributes = format_html_join('', ' {}="{}"', ((k.replace('_', '-'), v) for k, v in attrs.items()))
+    found = variants(fieldfile)
+    if not found:
+        return format_html('<img src="{}"{} loading="lazy">', fieldfile.url, attributes)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}"{} loading="lazy"></picture>',
+        _srcset(found, 'webp'), sizes, fieldfile.url, _srcset(found, 'jpg'), sizes, attributes,
+    )
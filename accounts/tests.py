@@ -1,3 +1,1194 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import io
+import json
+import re
+import threading
+from pathlib import Path
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.utils import timezone
+from django.test import AsyncClient, Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+
+from .context_processors import notifications_processor
+from .notification_events import broker
+from .models import (ImageDerivatives, LeaderboardEntry, Notification, Project, ProjectLike, ProjectView,
+                     RecruiterProfile, StoredFile, StudentFollow, StudentProfile, Tag)
+from .view_buffer import view_buffer
+
+
+def make_student(username, **kwargs):
+    user = User.objects.create_user(username=username, password='pass12345')
+    return StudentProfile.objects.create(
+        user=user,
+        student_name=username.title(),
+        student_contact='+14155550000',
+        student_email=f'{username}@example.com',
+        student_address='Somewhere',
+        course_joined_date=kwargs.pop('course_joined_date', datetime.date(2025, 1, 1)),
+        course_details=kwargs.pop('course_details', 'Python Full Stack'),
+        **kwargs
+    )
+
+
+def make_recruiter(username):
+    user = User.objects.create_user(username=username, password='pass12345', is_staff=True)
+    return RecruiterProfile.objects.create(
+        user=user,
+        company_name=f'{username} Inc',
+        company_address='Somewhere',
+        contact_person=username.title(),
+        phone_number='+14155550001',
+        email=f'{username}@example.com',
+        status='approved',
+    )
+
+
+@override_settings(
+    STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    VIEW_BUFFER_FLUSH_INTERVAL=3600,
+    VIEW_BUFFER_BATCH_SIZE=10000,
+    LEADERBOARD_REFRESH_DELAY=0,
+)
+class ViewBufferTests(TransactionTestCase):
+    def setUp(self):
+        view_buffer.flush()
+        self.student = make_student('alice')
+        self.project = Project.objects.create(student=self.student, title='Portfolio')
+        self.recruiters = [make_recruiter(f'recruiter{i}') for i in range(8)]
+
+    def test_concurrent_requests_do_not_lose_views(self):
+        requests_per_thread = 25
+        statuses = []
+        clients = []
+        for recruiter in self.recruiters:
+            client = Client()
+            client.force_login(recruiter.user)
+            clients.append(client)
+
+        def browse(client):
+            for _ in range(requests_per_thread):
+                statuses.append(client.get(f'/accounts/student/{self.student.id}/recruiter-view/').status_code)
+                statuses.append(client.get(f'/accounts/project/{self.project.id}/recruiter-view/').status_code)
+
+        threads = [threading.Thread(target=browse, args=(c,)) for c in clients]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        view_buffer.flush()
+
+        self.assertEqual(set(statuses), {200})
+        self.student.refresh_from_db()
+        self.project.refresh_from_db()
+        self.assertEqual(self.student.profile_views, len(self.recruiters) * requests_per_thread)
+        self.assertEqual(ProjectView.objects.filter(project=self.project).count(), len(self.recruiters))
+        self.assertEqual(self.project.views_count, len(self.recruiters))
+
+    def test_flush_concurrent_with_recording(self):
+        events_per_thread = 500
+        stop = threading.Event()
+
+        def record():
+            for _ in range(events_per_thread):
+                view_buffer.record_profile_view(self.student.id)
+
+        def flush_repeatedly():
+            while not stop.is_set():
+                view_buffer.flush()
+
+        flusher = threading.Thread(target=flush_repeatedly)
+        flusher.start()
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stop.set()
+        flusher.join()
+        view_buffer.flush()
+
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.profile_views, 8 * events_per_thread)
+
+    def test_flush_skips_existing_views(self):
+        user = self.recruiters[0].user
+        ProjectView.objects.create(project=self.project, user=user)
+        Project.objects.filter(pk=self.project.pk).update(views_count=1)
+
+        view_buffer.record_project_view(self.project.id, user.id)
+        view_buffer.record_project_view(self.project.id, self.recruiters[1].user.id)
+        view_buffer.flush()
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views_count, 2)
+        self.assertEqual(ProjectView.objects.filter(project=self.project).count(), 2)
+
+    def test_views_inserted_by_another_writer_are_not_counted_twice(self):
+        from unittest import mock
+
+        from . import view_buffer as module
+
+        user = self.recruiters[0].user
+        # Another worker inserted the row after this flush checked for it
+        ProjectView.objects.create(project=self.project, user=user)
+        Project.objects.filter(pk=self.project.pk).update(views_count=1)
+        with mock.patch.object(module, '_existing_views', return_value=set()), \
+                mock.patch.object(module.trending, 'record_views') as record_views:
+            module.write_project_views([(self.project.id, user.id)])
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.views_count, 1)
+        self.assertEqual(record_views.call_args[0][0][self.project.id], 0)
+
+
+class RecordProjectViewsTests(TestCase):
+    def setUp(self):
+        self.owner = make_student('bob')
+        self.viewer = make_student('carol')
+        self.projects = [Project.objects.create(student=self.owner, title=f'P{i}') for i in range(3)]
+        self.own_project = Project.objects.create(student=self.viewer, title='Mine')
+
+    def post_ids(self, ids):
+        return self.client.post(
+            '/accounts/record-project-views/',
+            data={'project_ids': ids},
+            content_type='application/json',
+        ).json()
+
+    def test_records_missing_views_and_returns_counts(self):
+        self.client.force_login(self.viewer.user)
+        ids = [p.id for p in self.projects] + [self.own_project.id]
+        ProjectView.objects.create(project=self.projects[0], user=self.viewer.user)
+
+        data = self.post_ids(ids)
+
+        self.assertTrue(data['success'])
+        self.assertEqual(data['counts'], {
+            str(self.projects[0].id): 1,
+            str(self.projects[1].id): 1,
+            str(self.projects[2].id): 1,
+            str(self.own_project.id): 0,
+        })
+        self.projects[1].refresh_from_db()
+        self.assertEqual(self.projects[1].views_count, 1)
+
+    def test_superuser_views_are_not_counted(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pass12345')
+        self.client.force_login(admin)
+
+        data = self.post_ids([p.id for p in self.projects])
+
+        self.assertEqual(set(data['counts'].values()), {0})
+        self.assertFalse(ProjectView.objects.exists())
+
+
+class UnreadNotificationCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student('dave')
+        self.sender = make_student('erin')
+
+    def unread_for(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return notifications_processor(request)['unread_notifications_count']
+
+    def test_count_is_cached_and_invalidated(self):
+        self.assertEqual(self.unread_for(self.student.user), 0)
+        Notification.objects.create(recipient=self.student, sender=self.sender.user, notification_type='follow')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.unread_for(self.student.user), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.unread_for(self.student.user), 1)
+
+        self.client.force_login(self.student.user)
+        with override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage'):
+            self.client.get('/accounts/notifications/')
+        self.assertEqual(self.unread_for(self.student.user), 0)
+
+    def test_recruiters_skip_the_query(self):
+        recruiter = make_recruiter('frank')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.unread_for(recruiter.user), 0)
+
+
+class UnreadJsonConditionalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student('ivan')
+        self.sender = make_student('judy')
+        self.client.force_login(self.student.user)
+
+    def notify(self):
+        return Notification.objects.create(recipient=self.student, sender=self.sender.user, notification_type='follow')
+
+    def test_not_modified_until_notifications_change(self):
+        first = self.notify()
+        response = self.client.get('/accounts/notifications/unread-json/')
+        etag = response['ETag']
+        self.assertEqual(response.json()['unread_count'], 1)
+
+        # session + user lookups, then a single version lookup
+        with self.assertNumQueries(3):
+            response = self.client.get('/accounts/notifications/unread-json/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        second = self.notify()
+        response = self.client.get(
+            f'/accounts/notifications/unread-json/?since_id={first.id}', HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        data = response.json()
+        self.assertEqual(data['unread_count'], 2)
+        self.assertEqual([n['id'] for n in data['notifications']], [second.id])
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class NotificationsPageTests(TestCase):
+    def setUp(self):
+        self.student = make_student('kate')
+        self.sender = make_student('liam')
+        self.client.force_login(self.student.user)
+
+    def test_pages_by_keyset_and_marks_only_rendered_page_read(self):
+        from .notification_views import NOTIFICATIONS_PAGE_SIZE
+
+        created = [
+            Notification.objects.create(recipient=self.student, sender=self.sender.user, notification_type='follow')
+            for _ in range(NOTIFICATIONS_PAGE_SIZE + 5)
+        ]
+
+        response = self.client.get('/accounts/notifications/')
+        first_page = response.context['notifications']
+        self.assertEqual([n.id for n in first_page], [n.id for n in reversed(created)][:NOTIFICATIONS_PAGE_SIZE])
+        self.assertEqual(Notification.objects.filter(recipient=self.student, is_read=False).count(), 5)
+
+        response = self.client.get('/accounts/notifications/', {'cursor': response.context['next_cursor']})
+        self.assertEqual([n.id for n in response.context['notifications']], [n.id for n in reversed(created[:5])])
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertFalse(Notification.objects.filter(recipient=self.student, is_read=False).exists())
+
+    def test_hire_payload_is_formatted_at_write_time(self):
+        notification = Notification.objects.create(
+            recipient=self.student, sender=self.sender.user, notification_type='hire',
+            data={'job_title': 'Backend Developer', 'message': '<b>Hi</b>'},
+        )
+        self.assertEqual(notification.display_text, 'Job Title: Backend Developer\nMessage: <b>Hi</b>')
+        response = self.client.get('/accounts/notifications/')
+        self.assertContains(response, 'Job Title: Backend Developer<br>Message: &lt;b&gt;Hi&lt;/b&gt;')
+
+    def test_hire_details_are_queryable(self):
+        Notification.objects.create(
+            recipient=self.student, sender=self.sender.user, notification_type='hire',
+            data={'job_title': 'Backend Developer', 'message': 'Hello'},
+        )
+        Notification.objects.create(recipient=self.student, sender=self.sender.user, notification_type='follow')
+
+        rows = Notification.objects.hire_requests().with_job_title('backend').with_hire_details()
+        self.assertEqual(
+            list(rows.values_list('payload_job_title', 'payload_message')),
+            [('Backend Developer', 'Hello')],
+        )
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class BrowseTalentTests(TestCase):
+    def setUp(self):
+        from .recruiter_views import TALENT_PAGE_SIZE
+
+        self.page_size = TALENT_PAGE_SIZE
+        self.recruiter = make_recruiter('mona')
+        self.students = [
+            make_student(f'talent{i}', course_details='Data Science' if i % 2 else 'Python Full Stack')
+            for i in range(TALENT_PAGE_SIZE + 3)
+        ]
+        Project.objects.create(student=self.students[0], title='ML', tags='django, pandas')
+        Project.objects.create(student=self.students[0], title='API')
+        StudentFollow.objects.create(follower=self.students[1].user, following=self.students[0], status='accepted')
+        self.recruiter.saved_students.add(self.students[0])
+        self.client.force_login(self.recruiter.user)
+
+    def test_cursor_pages_cover_every_student_once(self):
+        response = self.client.get('/accounts/browse/talent/', {'sort': 'projects'})
+        first = response.context['students']
+        self.assertEqual(len(first), self.page_size)
+        self.assertEqual(first[0], self.students[0])
+        self.assertEqual((first[0].project_count, first[0].follower_count, first[0].is_saved), (2, 1, True))
+
+        data = self.client.get('/accounts/browse/talent/more/', {
+            'sort': 'projects', 'cursor': response.context['next_cursor'],
+        }).json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['count'], 3)
+        self.assertIsNone(data['next_cursor'])
+        seen = {s.id for s in first} | {int(i) for i in re.findall(r'data-student-id="(\d+)"', data['html'])}
+        self.assertEqual(seen, {s.id for s in self.students})
+
+    def test_search_and_course_filter_run_in_the_query(self):
+        response = self.client.get('/accounts/browse/talent/', {'q': 'pandas'})
+        self.assertEqual(response.context['students'], [self.students[0]])
+
+        response = self.client.get('/accounts/browse/talent/', {'course': 'Data Science'})
+        students = response.context['students']
+        self.assertEqual(len(students), (self.page_size + 3) // 2)
+        self.assertTrue(all(s.course_details == 'Data Science' for s in students))
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        # session, user, recruiter profile, students page, prefetched projects, courses
+        with self.assertNumQueries(6):
+            self.client.get('/accounts/browse/talent/')
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class TopNPrefetchTests(TestCase):
+    def setUp(self):
+        self.recruiter = make_recruiter('nina')
+        self.students = [make_student(f'saved{i}') for i in range(4)]
+        for n, student in enumerate(self.students):
+            for i in range(5):
+                Project.objects.create(student=student, title=f'saved{n} {i}', tags=f'tag{i}',
+                                       visibility='Private' if i == 4 else 'Public')
+            self.recruiter.saved_students.add(student)
+        make_student('lurker')
+        self.client.force_login(self.recruiter.user)
+
+    def test_top_n_keeps_the_latest_rows_of_each_group(self):
+        from .prefetch import top_n
+
+        rows = top_n(Project.objects.filter(visibility='Public'), 'student', 2, ['-created_at', '-id'])
+        titles = [p.title for p in rows if p.student_id == self.students[1].id]
+        self.assertEqual(titles, ['saved1 3', 'saved1 2'])
+        self.assertEqual(len(rows), 8)
+
+    def test_saved_profiles_query_count_is_constant(self):
+        # session, user, recruiter, saved students, their projects, the projects' tags
+        with self.assertNumQueries(6):
+            response = self.client.get('/accounts/saved-profiles/')
+        rows = response.context['students_with_projects']
+        self.assertEqual(len(rows), 4)
+        self.assertEqual([p.title for p in rows[0]['projects']], ['saved0 3', 'saved0 2', 'saved0 1'])
+        self.assertEqual(rows[0]['skills'], {'tag1', 'tag2', 'tag3'})
+
+    def test_developers_page_lists_students_with_public_projects(self):
+        response = self.client.get('/accounts/developers/')
+        students = list(response.context['students'])
+        self.assertEqual(len(students), 4)
+        self.assertEqual(students[0].public_project_count, 4)
+        self.assertEqual([p.title for p in students[0].public_projects], ['saved0 3'])
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AdminProfilesTests(TestCase):
+    def setUp(self):
+        from .admin_views import PROFILES_PAGE_SIZE
+
+        self.page_size = PROFILES_PAGE_SIZE
+        self.students = [
+            make_student(f'adm{i:02d}', course_joined_date=datetime.date(2024, 3 if i % 2 else 7, 1))
+            for i in range(PROFILES_PAGE_SIZE + 2)
+        ]
+        Project.objects.create(student=self.students[0], title='A', views_count=5)
+        Project.objects.create(student=self.students[0], title='B', views_count=2)
+        admin = User.objects.create_superuser('root', 'root@example.com', 'pw')
+        self.client.force_login(admin)
+
+    def test_joined_year_and_month_follow_the_date(self):
+        student = self.students[0]
+        self.assertEqual((student.joined_year, student.joined_month), (2024, 7))
+        student.course_joined_date = '2023-11-05'
+        student.save(update_fields=['course_joined_date'])
+        student.refresh_from_db()
+        self.assertEqual((student.joined_year, student.joined_month), (2023, 11))
+
+    def test_counts_are_annotated_and_pages_are_bounded(self):
+        # session, user, paginator count, page of students (facets are cached from here on)
+        self.client.get('/accounts/admin-profiles/')
+        with self.assertNumQueries(4):
+            response = self.client.get('/accounts/admin-profiles/')
+        page = response.context['students']
+        self.assertEqual(len(page), self.page_size)
+        first = page[0]
+        self.assertEqual((first.projects_count, first.projects_views), (2, 7))
+
+        response = self.client.get('/accounts/admin-profiles/', {'month': 3, 'year': 2024, 'page': 2})
+        self.assertEqual(response.context['filter_query'], 'month=3&year=2024')
+        self.assertEqual(response.context['students'].paginator.count, (self.page_size + 2) // 2)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class AdminProjectsTests(TestCase):
+    def setUp(self):
+        from .admin_views import ADMIN_PROJECTS_PAGE_SIZE
+
+        self.page_size = ADMIN_PROJECTS_PAGE_SIZE
+        self.students = [make_student('ana'), make_student('ben')]
+        for i in range(ADMIN_PROJECTS_PAGE_SIZE + 4):
+            Project.objects.create(
+                student=self.students[i % 2], title=f'P{i}', views_count=i,
+                category='Web' if i % 3 else 'ML', visibility='Private' if i % 4 == 0 else 'Public',
+            )
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'pw'))
+
+    def test_listing_is_paginated_without_per_row_queries(self):
+        self.client.get('/accounts/admin-projects/')
+        # session, user, paginator count, page of projects with their students
+        with self.assertNumQueries(4):
+            response = self.client.get('/accounts/admin-projects/', {'sort': 'views'})
+        page = response.context['projects']
+        self.assertEqual(len(page), self.page_size)
+        self.assertEqual(page[0].title, f'P{self.page_size + 3}')
+
+        response = self.client.get('/accounts/admin-projects/', {
+            'visibility': 'Public', 'category': 'ML', 'student': self.students[1].id,
+        })
+        titles = {p.title for p in response.context['projects']}
+        self.assertEqual(titles, {'P3', 'P9', 'P15', 'P21', 'P27'})
+
+    def test_student_drill_down_uses_the_same_filters(self):
+        data = self.client.get(f'/accounts/student-projects/{self.students[0].id}/', {
+            'visibility': 'Private', 'sort': 'oldest',
+        }).json()
+        self.assertEqual([p['title'] for p in data['projects']], [f'P{i}' for i in range(0, self.page_size + 4, 4)])
+        self.assertFalse(data['has_next'])
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class DeveloperSnapshotTests(TestCase):
+    def setUp(self):
+        import tempfile
+
+        from . import developer_snapshots
+
+        self.snapshots = developer_snapshots
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        overrides = self.settings(DEVELOPERS_SNAPSHOTS=True, DEVELOPERS_SNAPSHOT_ROOT=self.tmp.name,
+                                  DEVELOPERS_SNAPSHOT_DELAY=0, LEADERBOARD_REFRESH_DELAY=0)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.students = [make_student(f'dev{i:02d}') for i in range(developer_snapshots.PAGE_SIZE + 1)]
+        for student in self.students:
+            Project.objects.create(student=student, title=f'{student.user.username} app')
+
+    def test_anonymous_visitors_get_the_snapshot(self):
+        self.assertEqual(self.snapshots.refresh_pages(), [1, 2])
+        with self.assertNumQueries(0):
+            response = self.client.get('/accounts/developers/page/2/')
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
+        self.assertIn(self.students[-1].student_email, b''.join(response.streaming_content).decode())
+
+        response = self.client.get('/accounts/developers/page/2/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_snapshots_leave_out_csrf_tokens_and_trending(self):
+        self.snapshots.refresh_pages()
+        html = (Path(self.tmp.name) / 'page-1.html').read_text()
+        self.assertNotIn('csrfmiddlewaretoken', html)
+        self.assertNotIn('id="trending-view"', html)
+        self.assertIn('href="?page=1#trending-view"', html)
+
+        # The trending link is rendered live
+        response = self.client.get('/accounts/developers/?page=1')
+        self.assertFalse(response.streaming)
+        self.assertContains(response, 'id="trending-view"')
+
+    def test_changes_only_rewrite_affected_pages(self):
+        self.snapshots.refresh_pages()
+        page_one = Path(self.tmp.name) / 'page-1.html'
+        written_at = page_one.stat().st_mtime_ns
+        with self.captureOnCommitCallbacks(execute=True):
+            self.students[-1].student_email = 'renamed@example.com'
+            self.students[-1].save()
+        self.assertIn('renamed@example.com', (Path(self.tmp.name) / 'page-2.html').read_text())
+        self.assertEqual(page_one.stat().st_mtime_ns, written_at)
+
+        # A new student at the front shifts everyone along: both pages change
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(student=make_student('aaron'), title='First')
+        page_two = (Path(self.tmp.name) / 'page-2.html').read_text()
+        self.assertIn(self.students[-2].student_email, page_two)
+
+        Project.objects.filter(student=self.students[0]).delete()
+        Project.objects.filter(student__user__username='aaron').delete()
+        self.snapshots.refresh_pages([])
+        self.assertFalse((Path(self.tmp.name) / 'page-2.html').exists())
+        self.assertEqual(self.client.get('/accounts/developers/page/2/').status_code, 404)
+
+    def test_background_refresh_batches_changes(self):
+        from unittest import mock
+
+        with self.settings(DEVELOPERS_SNAPSHOT_DELAY=0.05), \
+                mock.patch.object(self.snapshots, 'refresh_pages') as refresh_pages:
+            with self.captureOnCommitCallbacks(execute=True):
+                for student in self.students[:3]:
+                    student.save()
+            # The pool has one thread, so this waits for the queued refresh
+            self.snapshots._pool().submit(lambda: None).result()
+        refresh_pages.assert_called_once()
+        self.assertEqual(sorted(refresh_pages.call_args[0][0]), [s.id for s in self.students[:3]])
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.ana, self.ben = make_student('ana'), make_student('ben')
+        Project.objects.create(student=self.ana, title='Shop, "v2"', views_count=4, likes_count=1)
+        Project.objects.create(student=self.ana, title='Blog', views_count=6)
+        StudentFollow.objects.create(follower=self.ben.user, following=self.ana, status='accepted')
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'pw'))
+
+    def test_students_csv_streams_aggregated_counts(self):
+        response = self.client.get('/accounts/admin-export/students/')
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="students-', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 2)
+        ana = rows[0]
+        self.assertEqual(
+            (ana['project_count'], ana['project_views'], ana['project_likes'], ana['follower_count']),
+            ('2', '10', '1', '1'),
+        )
+
+    def test_projects_ndjson_and_bad_requests(self):
+        response = self.client.get('/accounts/admin-export/projects/', {'format': 'ndjson'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([r['title'] for r in rows], ['Shop, "v2"', 'Blog'])
+        self.assertEqual(rows[0]['student_student_name'], 'Ana')
+        self.assertEqual(self.client.get('/accounts/admin-export/users/').status_code, 400)
+        self.assertEqual(self.client.get('/accounts/admin-export/projects/', {'format': 'xml'}).status_code, 400)
+
+    def test_csv_cells_cannot_start_a_formula(self):
+        title = '=HYPERLINK("http://evil.example","Open")'
+        Project.objects.create(student=self.ben, title=title, tags='@import, -x')
+        response = self.client.get('/accounts/admin-export/projects/')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual((rows[-1]['title'], rows[-1]['tags']), ("'" + title, "'@import, -x"))
+        self.assertEqual(rows[0]['title'], 'Shop, "v2"')
+
+        response = self.client.get('/accounts/admin-export/projects/', {'format': 'ndjson'})
+        last = json.loads(b''.join(response.streaming_content).decode().splitlines()[-1])
+        self.assertEqual(last['title'], title)
+
+
+class StudentImportTests(TestCase):
+    def setUp(self):
+        make_student('taken')
+        self.client.force_login(User.objects.create_superuser('root', 'root@example.com', 'pw'))
+
+    def row(self, i, **overrides):
+        row = {
+            'username': f'new{i}', 'password': 's3cret!', 'student_name': f'New {i}',
+            'student_contact': f'+1415555{i:04d}', 'student_email': f'new{i}@example.com',
+            'course_joined_date': '2025-06-01', 'course_details': 'Data Science',
+        }
+        row.update(overrides)
+        return row
+
+    def test_valid_rows_are_created_and_invalid_rows_reported(self):
+        rows = [
+            self.row(1),
+            self.row(2, username='taken'),
+            self.row(3, student_email='new1@example.com'),
+            self.row(4, course_joined_date='2999-01-01', student_contact='12'),
+            self.row(5),
+        ]
+        upload = io.BytesIO(json.dumps(rows).encode())
+        upload.name = 'batch.json'
+        data = self.client.post('/accounts/admin-import-students/', {'file': upload}).json()
+
+        self.assertEqual((data['rows'], data['created']), (5, 2))
+        errors = {e['row']: e['errors'] for e in data['errors']}
+        self.assertEqual(errors[2], ['Username already exists.'])
+        self.assertEqual(errors[3], ['Email duplicates row 1.'])
+        self.assertEqual(len(errors[4]), 2)
+        student = StudentProfile.objects.get(user__username='new5')
+        self.assertEqual((student.joined_year, student.joined_month), (2025, 6))
+        self.assertTrue(student.user.check_password('s3cret!'))
+
+    def test_csv_dry_run_validates_with_a_fixed_number_of_queries(self):
+        from .student_import import import_students, parse
+
+        text = 'username,password,student_name,student_contact,student_email,course_joined_date\n' + ''.join(
+            f'csv{i},pw,Csv {i},+1415666{i:04d},csv{i}@example.com,2025-01-0{i % 9 + 1}\n' for i in range(200)
+        )
+        rows = parse(text.encode(), 'csv')
+        # usernames, emails, contacts
+        with self.assertNumQueries(3):
+            result = import_students(rows, dry_run=True)
+        self.assertEqual(result, {'created': 0, 'errors': []})
+
+    def test_password_pool_matches_inline_hashing(self):
+        from django.contrib.auth.hashers import check_password
+
+        from .student_import import POOL_THRESHOLD, hash_passwords
+
+        passwords = [f'pw{i}' for i in range(POOL_THRESHOLD)]
+        hashes = hash_passwords(passwords, workers=2)
+        self.assertTrue(all(check_password(p, h) for p, h in zip(passwords, hashes)))
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        import tempfile
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        overrides = self.settings(MEDIA_ROOT=self.tmp.name, IMAGE_DERIVATIVE_WORKERS=0, LEADERBOARD_REFRESH_DELAY=0)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        cache.clear()
+
+    def upload(self, name, color='red', size=(900, 600)):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from PIL import Image
+
+        out = io.BytesIO()
+        Image.new('RGB', size, color).save(out, 'PNG')
+        return SimpleUploadedFile(name, out.getvalue(), content_type='image/png')
+
+    def test_uploads_get_shared_derivatives_and_a_srcset(self):
+        from django.template import Context, Template
+
+        student = make_student('pix')
+        with self.captureOnCommitCallbacks(execute=True):
+            first = Project.objects.create(student=student, title='A', screenshot=self.upload('shot.png'))
+        with self.captureOnCommitCallbacks(execute=True):
+            second = Project.objects.create(student=student, title='B', screenshot=self.upload('shot.png'))
+
+        a, b = (ImageDerivatives.objects.get(source=p.screenshot.name) for p in (first, second))
+        # Identical uploads are stored once (accounts.storage)
+        self.assertEqual(first.screenshot.name, second.screenshot.name)
+        self.assertEqual(a.content_hash, b.content_hash)
+        self.assertEqual((a.width, a.widths), (900, [320, 640]))
+        files = sorted(p.name for p in (Path(self.tmp.name) / 'derivatives' / a.content_hash).iterdir())
+        self.assertEqual(files, ['320.jpg', '320.webp', '640.jpg', '640.webp'])
+
+        html = Template('{% load images %}{% picture project.screenshot alt=project.title sizes="33vw" %}').render(
+            Context({'project': first})
+        )
+        self.assertIn(f'/media/derivatives/{a.content_hash}/640.webp 640w', html)
+        self.assertIn('alt="A"', html)
+
+        # Once no upload uses the file, its derivatives go too
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+            second.delete()
+        self.assertFalse(ImageDerivatives.objects.exists())
+        self.assertEqual(list((Path(self.tmp.name) / 'derivatives' / a.content_hash).iterdir()), [])
+
+    def test_grids_look_up_derivatives_in_one_query(self):
+        from django.template import Context, Template
+
+        from .image_derivatives import prefetch_variants
+
+        student = make_student('grid')
+        with self.captureOnCommitCallbacks(execute=True):
+            for color in ('red', 'blue'):
+                Project.objects.create(student=student, title=color, screenshot=self.upload('s.png', color))
+        Project.objects.create(student=student, title='No image')
+        cache.clear()
+
+        projects = list(Project.objects.filter(student=student).order_by('id'))
+        with self.assertNumQueries(1):
+            prefetch_variants(projects, 'screenshot')
+        template = Template('{% load images %}{% for p in projects %}{% srcset p.screenshot %}|{% endfor %}')
+        with self.assertNumQueries(0):
+            html = template.render(Context({'projects': projects}))
+        self.assertEqual(html.count('640.webp 640w'), 2)
+
+        # A second page load is served from the cache
+        projects = list(Project.objects.filter(student=student).order_by('id'))
+        with self.assertNumQueries(0):
+            prefetch_variants(projects, 'screenshot')
+
+    def test_images_without_derivatives_render_the_original(self):
+        from django.template import Context, Template
+
+        project = Project(title='C', screenshot='project_screenshots/missing.png')
+        html = Template('{% load images %}{% picture project.screenshot class="x" %}').render(
+            Context({'project': project})
+        )
+        self.assertEqual(html, '<img src="/media/project_screenshots/missing.png" class="x" loading="lazy">')
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        import tempfile
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        overrides = self.settings(MEDIA_ROOT=self.tmp.name, IMAGE_DERIVATIVE_WORKERS=0, LEADERBOARD_REFRESH_DELAY=0)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def upload(self, name, content):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        return SimpleUploadedFile(name, content, content_type='image/png')
+
+    def test_identical_uploads_share_one_reference_counted_file(self):
+        import hashlib
+
+        student = make_student('dedupe')
+        digest = hashlib.sha256(b'first').hexdigest()
+        with self.captureOnCommitCallbacks(execute=True):
+            # Not valid images, so no derivatives are made
+            a = Project.objects.create(student=student, title='A', screenshot=self.upload('a.png', b'first'))
+            b = Project.objects.create(student=student, title='B', screenshot=self.upload('Other.PNG', b'first'))
+        self.assertEqual(a.screenshot.name, f'cas/{digest[:2]}/{digest}.png')
+        self.assertEqual(b.screenshot.name, a.screenshot.name)
+        self.assertEqual(StoredFile.objects.get(content_hash=digest).refcount, 2)
+        path = Path(self.tmp.name) / a.screenshot.name
+        self.assertEqual(sorted(p.name for p in path.parent.iterdir()), [path.name])
+
+        # Replacing one project's screenshot releases its reference to the old file
+        with self.captureOnCommitCallbacks(execute=True):
+            a.screenshot = self.upload('a.png', b'second')
+            a.save()
+        self.assertEqual(StoredFile.objects.get(content_hash=digest).refcount, 1)
+        self.assertTrue(path.exists())
+
+        # Deleting the last project using it removes the file and its index row
+        with self.captureOnCommitCallbacks(execute=True):
+            b.delete()
+        self.assertFalse(StoredFile.objects.filter(content_hash=digest).exists())
+        self.assertFalse(path.exists())
+        self.assertTrue((Path(self.tmp.name) / a.screenshot.name).exists())
+
+    def test_clearing_or_reassigning_an_image_moves_its_reference(self):
+        student = make_student('clearer')
+        with self.captureOnCommitCallbacks(execute=True):
+            a = Project.objects.create(student=student, title='A', screenshot=self.upload('a.png', b'shared'))
+            b = Project.objects.create(student=student, title='B')
+        name = a.screenshot.name
+
+        # Pointing another project at the stored file adds a reference
+        with self.captureOnCommitCallbacks(execute=True):
+            b.screenshot = name
+            b.save()
+        self.assertEqual(StoredFile.objects.get(name=name).refcount, 2)
+
+        # What the admin's "Clear" checkbox does
+        with self.captureOnCommitCallbacks(execute=True):
+            a.screenshot = ''
+            a.save()
+            b.screenshot = None
+            b.save()
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+        self.assertFalse((Path(self.tmp.name) / name).exists())
+
+    def test_reupload_before_removal_keeps_the_file(self):
+        student = make_student('racer')
+        with self.captureOnCommitCallbacks(execute=True):
+            a = Project.objects.create(student=student, title='A', screenshot=self.upload('a.png', b'again'))
+        name = a.screenshot.name
+        with self.captureOnCommitCallbacks() as releases:
+            a.delete()
+        with self.captureOnCommitCallbacks() as removals:
+            for callback in releases:
+                callback()
+        self.assertEqual(StoredFile.objects.get(name=name).refcount, 0)
+        # The same content is uploaded again before the file removal runs
+        with self.captureOnCommitCallbacks(execute=True):
+            b = Project.objects.create(student=student, title='B', screenshot=self.upload('b.png', b'again'))
+        for callback in removals:
+            callback()
+        self.assertEqual(b.screenshot.name, name)
+        self.assertEqual(StoredFile.objects.get(name=name).refcount, 1)
+        self.assertTrue((Path(self.tmp.name) / name).exists())
+
+
+class FileHashExportTests(TestCase):
+    def test_incremental_export_and_diff(self):
+        import hashlib
+        import tempfile
+        from unittest import mock
+
+        from . import file_hashes
+
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        base, out = Path(root.name), Path(root.name) / 'reports'
+        (base / 'media').mkdir()
+        (base / 'static' / 'css').mkdir(parents=True)
+        (base / 'media' / 'a.png').write_bytes(b'a' * 5000)
+        (base / 'static' / 'css' / 'site.css').write_text('body {}')
+        (base / 'media' / 'gone.txt').write_text('bye')
+
+        def rows(name):
+            with (out / name).open(newline='') as f:
+                return list(csv.reader(f))[1:]
+
+        # A tiny threshold sends a.png through the mmap path
+        with mock.patch.object(file_hashes, 'MMAP_THRESHOLD', 4096):
+            counts = file_hashes.export(root=base, out_dir=out, workers=2)
+        self.assertEqual((counts['files'], counts['hashed'], counts['added']), (3, 3, 3))
+        self.assertIn(['media/a.png', hashlib.sha256(b'a' * 5000).hexdigest()], rows('file_hashes.csv'))
+
+        (base / 'static' / 'css' / 'site.css').write_text('body { margin: 0 }')
+        (base / 'media' / 'gone.txt').unlink()
+        (base / 'templates').mkdir()
+        (base / 'templates' / 'new.html').write_text('<p>')
+        counts = file_hashes.export(root=base, out_dir=out, workers=2)
+        # a.png is unchanged on disk, so it comes from the manifest
+        self.assertEqual(counts['hashed'], 2)
+        self.assertEqual([row[:2] for row in rows('file_hashes_diff.csv')], [
+            ['removed', 'media/gone.txt'],
+            ['changed', 'static/css/site.css'],
+            ['added', 'templates/new.html'],
+        ])
+        self.assertEqual([row[0] for row in rows('file_hashes.csv')],
+                         ['media/a.png', 'static/css/site.css', 'templates/new.html'])
+
+        # A file that changes under the scan is reported as an error, not a removal,
+        # and the rest of the reports are still written
+        (base / 'media' / 'a.png').write_bytes(b'b' * 5000)
+        real_hash = file_hashes.hash_file
+
+        def flaky(path):
+            if path.endswith('a.png'):
+                raise ValueError('cannot mmap an empty file')
+            return real_hash(path)
+
+        with mock.patch.object(file_hashes, 'hash_file', flaky):
+            counts = file_hashes.export(root=base, out_dir=out, workers=2)
+        self.assertEqual((counts['errors'], counts['removed']), (1, 0))
+        self.assertEqual(rows('file_hashes_diff.csv'),
+                         [['error', 'media/a.png', hashlib.sha256(b'a' * 5000).hexdigest(), '']])
+        counts = file_hashes.export(root=base, out_dir=out, workers=2)
+        self.assertEqual((counts['hashed'], counts['changed'], counts['added']), (1, 1, 0))
+
+
+class MediaServingTests(TestCase):
+    def setUp(self):
+        import tempfile
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        overrides = self.settings(MEDIA_ROOT=self.tmp.name, MEDIA_CACHE_MAX_AGE=600)
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.data = bytes(range(256)) * 4
+        for name in ('shots/plain.png', f'derivatives/{"ab" * 32}/320.webp'):
+            path = Path(self.tmp.name) / name
+            path.parent.mkdir(parents=True)
+            path.write_bytes(self.data)
+
+    def get(self, path, **headers):
+        response = self.client.get(f'/media/{path}', **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_full_and_conditional_requests(self):
+        response, body = self.get('shots/plain.png')
+        self.assertEqual((response.status_code, body), (200, self.data))
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=600')
+
+        response, _ = self.get('shots/plain.png', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        response, _ = self.get('shots/plain.png', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+        response, _ = self.get(f'derivatives/{"ab" * 32}/320.webp')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
+        self.assertEqual(self.get('../settings.py')[0].status_code, 400)
+        self.assertEqual(self.get('shots')[0].status_code, 404)
+
+    def test_range_requests(self):
+        response, body = self.get('shots/plain.png', HTTP_RANGE='bytes=10-19')
+        self.assertEqual((response.status_code, body), (206, self.data[10:20]))
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.data)}')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response, body = self.get('shots/plain.png', HTTP_RANGE='bytes=-5')
+        self.assertEqual(body, self.data[-5:])
+        response, _ = self.get('shots/plain.png', HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        response, body = self.get('shots/plain.png', HTTP_RANGE='bytes=0-1', HTTP_IF_RANGE='"stale"')
+        self.assertEqual((response.status_code, body), (200, self.data))
+
+    def test_proxy_handoff(self):
+        with self.settings(MEDIA_SENDFILE='x-accel-redirect', MEDIA_ACCEL_PREFIX='/protected/'):
+            response, body = self.get('shots/plain.png')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/shots/plain.png')
+        self.assertEqual(body, b'')
+
+
+class ProjectSearchTests(TestCase):
+    def setUp(self):
+        self.student = make_student('nora')
+        self.recruiter = make_recruiter('oscar')
+        self.client.force_login(self.recruiter.user)
+
+    def search(self, q, **params):
+        return self.client.get('/accounts/recruiter/projects/search/', {'q': q, **params}).json()
+
+    def test_ranks_title_matches_first_and_highlights(self):
+        described = Project.objects.create(
+            student=self.student, title='Inventory app', description='Built with <b>Django</b> and Postgres'
+        )
+        titled = Project.objects.create(student=self.student, title='Django blog', tags='python')
+
+        data = self.search('djan')
+        self.assertEqual([r['id'] for r in data['results']], [titled.id, described.id])
+        self.assertEqual(data['results'][0]['title_html'], '<mark>Django</mark> blog')
+        self.assertIn('&lt;b&gt;<mark>Django</mark>&lt;/b&gt;', data['results'][1]['snippet_html'])
+
+    def test_index_follows_saves_and_deletes(self):
+        project = Project.objects.create(student=self.student, title='Weather dashboard')
+        self.assertEqual(len(self.search('weather')['results']), 1)
+
+        project.visibility = 'Private'
+        project.save()
+        self.assertEqual(self.search('weather')['results'], [])
+
+        project.visibility = 'Public'
+        project.title = 'Climate dashboard'
+        project.save()
+        self.assertEqual(self.search('weather')['results'], [])
+        self.assertEqual(len(self.search('climate')['results']), 1)
+
+        project.delete()
+        self.assertEqual(self.search('climate')['results'], [])
+
+    def test_paginates_and_ignores_fts_syntax(self):
+        from .project_search import SEARCH_PAGE_SIZE
+
+        for i in range(SEARCH_PAGE_SIZE + 2):
+            Project.objects.create(student=self.student, title=f'Chat bot {i}')
+        first = self.search('chat "bot')
+        self.assertTrue(first['has_next'])
+        second = self.search('chat "bot', page=2)
+        self.assertFalse(second['has_next'])
+        self.assertEqual(len(first['results']) + len(second['results']), SEARCH_PAGE_SIZE + 2)
+
+
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+class ProjectTagTests(TestCase):
+    def setUp(self):
+        self.student = make_student('paula')
+
+    def test_tags_string_is_synced_to_tag_rows(self):
+        project = Project.objects.create(student=self.student, title='API', tags='Django, REST , django,')
+        self.assertEqual(project.tag_names, ['Django', 'REST'])
+        self.assertEqual(list(Project.objects.with_tags().get().tag_names), ['Django', 'REST'])
+
+        project.tags = 'Postgres, Django'
+        project.save()
+        self.assertEqual(Project.objects.with_tags().get().tag_names, ['Postgres', 'Django'])
+        self.assertEqual(list(Project.objects.tagged('DJANGO')), [project])
+        self.assertFalse(Project.objects.tagged('rest').exists())
+
+    def test_facet_counts_and_tag_filter_are_single_queries(self):
+        Project.objects.create(student=self.student, title='A', tags='django, react')
+        Project.objects.create(student=self.student, title='B', tags='Django')
+        Project.objects.create(student=self.student, title='C', tags='react', visibility='Private')
+
+        with self.assertNumQueries(1):
+            counts = [(t.name, t.project_count) for t in Tag.objects.with_project_counts()]
+        self.assertEqual(counts, [('django', 2), ('react', 1)])
+
+        recruiter = make_recruiter('quinn')
+        self.client.force_login(recruiter.user)
+        response = self.client.get('/accounts/recruiter/student-projects/', {'tag': 'Django'})
+        self.assertEqual(
+            sorted(item['project'].title for item in response.context['projects']), ['A', 'B']
+        )
+        self.assertEqual(response.context['active_tag'], 'django')
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_facets_are_cached_until_profiles_or_projects_change(self):
+        from .facets import course_facets, tag_facets, year_facets
+
+        student = make_student('rita', course_details='Data Science')
+        make_student('sam', course_details='Data Science')
+        Project.objects.create(student=student, title='A', tags='pandas')
+
+        with self.assertNumQueries(3):
+            self.assertEqual(course_facets(), [{'value': 'Data Science', 'label': 'Data Science', 'count': 2}])
+            self.assertEqual(year_facets(), [{'value': 2025, 'label': '2025', 'count': 2}])
+            self.assertEqual(tag_facets(), [{'value': 'pandas', 'label': 'pandas', 'count': 1}])
+        with self.assertNumQueries(0):
+            course_facets(), year_facets(), tag_facets()
+
+        make_student('tina', course_details='Python Full Stack', course_joined_date=datetime.date(2024, 6, 1))
+        self.assertEqual([c['value'] for c in course_facets()], ['Data Science', 'Python Full Stack'])
+        self.assertEqual([(y['value'], y['count']) for y in year_facets()], [(2025, 2), (2024, 1)])
+
+        Project.objects.create(student=student, title='B', tags='Pandas, numpy')
+        self.assertEqual([(t['label'], t['count']) for t in tag_facets()], [('numpy', 1), ('pandas', 2)])
+
+
+@override_settings(
+    LEADERBOARD_WEIGHTS={'project_count': 10, 'project_views': 1, 'project_likes': 0,
+                         'profile_views': 0, 'followers': 0},
+)
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        from .leaderboard import refresh_leaderboard, top_students
+
+        self.refresh, self.top = refresh_leaderboard, top_students
+        self.prolific = make_student('uma')
+        self.popular = make_student('vic')
+        self.viewers = [make_student(f'viewer{i}').user for i in range(12)]
+        for i in range(3):
+            project = Project.objects.create(student=self.prolific, title=f'P{i}')
+            ProjectView.objects.create(project=project, user=self.viewers[0])
+            project.adjust_counters(views=1)
+        popular_project = Project.objects.create(student=self.popular, title='Hit')
+        for viewer in self.viewers:
+            ProjectView.objects.create(project=popular_project, user=viewer)
+        popular_project.adjust_counters(views=len(self.viewers))
+
+    def test_ranks_by_weighted_distinct_totals(self):
+        written, students = self.refresh()
+        self.assertEqual(written, students)
+
+        with self.assertNumQueries(1):
+            top = self.top(2)
+        # 10 * 3 projects + 3 views = 33, versus 10 * 1 project + 12 views = 22
+        self.assertEqual(top, [self.prolific, self.popular])
+        self.assertEqual((top[0].project_count, top[0].total_views, top[0].score), (3, 3, 33))
+
+        with override_settings(LEADERBOARD_WEIGHTS={'project_count': 1, 'project_views': 1}):
+            self.refresh()
+            self.assertEqual(self.top(2), [self.popular, self.prolific])
+
+    def test_refresh_only_rewrites_changed_entries(self):
+        self.refresh()
+        self.assertEqual(self.refresh(), (0, StudentProfile.objects.count()))
+
+        Project.objects.create(student=self.popular, title='Another')
+        self.assertEqual(self.refresh()[0], 1)
+
+    @override_settings(
+        LEADERBOARD_REFRESH_DELAY=0,
+        STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage',
+    )
+    def test_changes_refresh_their_students_without_a_full_refresh(self):
+        from .view_buffer import write_project_views
+
+        with self.captureOnCommitCallbacks(execute=True):
+            newcomer = make_student('xena')
+            project = Project.objects.create(student=newcomer, title='Debut')
+        entry = LeaderboardEntry.objects.get(student=newcomer)
+        self.assertEqual((entry.project_count, entry.score), (1, 10))
+        # Students untouched since the last refresh aren't in the table yet
+        self.assertFalse(LeaderboardEntry.objects.filter(student=self.prolific).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            write_project_views([(project.id, viewer.id) for viewer in self.viewers])
+            StudentFollow.objects.create(follower=self.viewers[0], following=newcomer, status='accepted')
+        self.client.force_login(self.viewers[1])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/accounts/project/{project.id}/like/')
+        entry.refresh_from_db()
+        # 10 * 1 project + 12 views (likes and followers weigh 0 here)
+        self.assertEqual((entry.project_views, entry.project_likes, entry.followers, entry.score), (12, 1, 1, 22))
+
+        self.client.force_login(make_recruiter('yusuf').user)
+        response = self.client.get('/accounts/recruiter-home/')
+        self.assertEqual([student.pk for student in response.context['top_students']], [newcomer.pk])
+        self.assertContains(response, newcomer.student_name)
+
+
+@override_settings(TRENDING_HALF_LIFE_HOURS=24, TRENDING_WEIGHTS={'view': 1, 'like': 4, 'new': 1})
+class TrendingTests(TestCase):
+    def setUp(self):
+        self.student = make_student('wade')
+        self.fans = [make_student(f'fan{i}').user for i in range(4)]
+
+    def test_recent_activity_outranks_older_activity(self):
+        from . import trending
+
+        now = timezone.now()
+        old = Project.objects.create(student=self.student, title='Old hit')
+        fresh = Project.objects.create(student=self.student, title='Fresh')
+        # Four likes three days ago (weight 16 / 2^3 = 2) vs one like now (weight 4)
+        for _ in range(4):
+            trending.record_like(old.id, now - datetime.timedelta(days=3))
+        trending.record_like(fresh.id, now)
+        self.assertEqual(list(trending.trending_projects()[:2]), [fresh, old])
+
+    def test_unliking_an_already_deleted_like_changes_nothing(self):
+        from unittest import mock
+
+        project = Project.objects.create(student=self.student, title='Twice')
+        self.client.force_login(self.fans[0])
+        self.client.post(f'/accounts/project/{project.id}/like/')
+        stale = ProjectLike.objects.get(project=project)
+        self.client.post(f'/accounts/project/{project.id}/like/')
+        project.refresh_from_db()
+        score = project.trending_score
+        self.assertEqual(project.likes_count, 0)
+
+        # A second unlike request that fetched the row before the first deleted it
+        with mock.patch.object(ProjectLike.objects, 'get_or_create', return_value=(stale, False)):
+            response = self.client.post(f'/accounts/project/{project.id}/like/')
+        self.assertEqual(response.json()['likeCount'], 0)
+        project.refresh_from_db()
+        self.assertEqual((project.likes_count, project.trending_score), (0, score))
+
+    def test_incremental_updates_match_a_full_rebuild(self):
+        from . import trending
+        from .view_buffer import write_project_views
+
+        project = Project.objects.create(student=self.student, title='API')
+        other = Project.objects.create(student=self.student, title='Site', visibility='Private')
+        for fan in self.fans[:2]:
+            self.client.force_login(fan)
+            self.client.post(f'/accounts/project/{project.id}/like/')
+        self.client.post(f'/accounts/project/{project.id}/like/')  # unlike again
+        write_project_views([(project.id, fan.id) for fan in self.fans] + [(other.id, self.fans[0].id)])
+
+        incremental = dict(Project.objects.values_list('id', 'trending_score'))
+        trending.rebuild_scores()
+        rebuilt = dict(Project.objects.values_list('id', 'trending_score'))
+        self.assertEqual(ProjectLike.objects.count(), 1)
+        for pk, score in rebuilt.items():
+            self.assertAlmostEqual(incremental[pk], score, places=4)
+
+
+@override_settings(LEADERBOARD_REFRESH_DELAY=0)
+class NotificationStreamTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = make_student('gina')
+        self.sender = make_student('hank')
+
+    def test_wsgi_requests_fall_back_to_polling(self):
+        self.client.force_login(self.student.user)
+        self.assertEqual(self.client.get('/accounts/notifications/stream/').status_code, 204)
+
+    async def test_stream_pushes_new_notifications(self):
+        client = AsyncClient()
+        await sync_to_async(client.force_login)(self.student.user)
+        response = await client.get('/accounts/notifications/stream/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        chunks = response.streaming_content.__aiter__()
+
+        async def next_event():
+            while True:
+                chunk = (await asyncio.wait_for(chunks.__anext__(), 5)).decode()
+                if chunk.startswith('data: '):
+                    return json.loads(chunk[len('data: '):])
+
+        self.assertEqual(await next_event(), {'unread_count': 0})
+        self.assertEqual(broker.subscriber_count(self.student.id), 1)
+
+        await sync_to_async(Notification.objects.create)(
+            recipient=self.student, sender=self.sender.user, notification_type='follow'
+        )
+        event = await next_event()
+        self.assertEqual(event['unread_count'], 1)
+        self.assertEqual(event['notification']['type'], 'follow')
+        await chunks.aclose()
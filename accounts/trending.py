@@ -0,0 +1,125 @@
+"""
+Time-decayed trending score for projects.
+
+A project's score is the sum of its events' weights (views, likes and its own
+creation), each decaying exponentially with TRENDING_HALF_LIFE_HOURS. Every
+score decays by the same factor as time passes, so the ranking only needs
+each event's weight scaled up by its age relative to a fixed epoch:
+
+    S = sum(weight * exp((event_time - EPOCH) / tau))
+
+To keep that from overflowing, ``Project.trending_score`` stores ``ln(S)``.
+A new event is folded in with one UPDATE computing log-add-exp in SQL, so
+history is never re-read. ``manage.py rebuild_trending`` recomputes everything,
+for backfills or after changing the weights or half-life.
+"""
+import datetime
+import math
+
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Exp, Greatest, Least, Ln
+from django.utils import timezone
+
+from .models import Project, ProjectLike, ProjectView
+
+EPOCH = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+DEFAULT_HALF_LIFE_HOURS = 48.0
+DEFAULT_WEIGHTS = {'view': 1.0, 'like': 3.0, 'new': 2.0}
+
+# Projects per page of the trending feeds
+FEED_PAGE_SIZE = 12
+
+
+def _tau():
+    """Decay time constant in seconds."""
+    hours = float(getattr(settings, 'TRENDING_HALF_LIFE_HOURS', DEFAULT_HALF_LIFE_HOURS))
+    return hours * 3600 / math.log(2)
+
+
+def weight(kind):
+    return float(getattr(settings, 'TRENDING_WEIGHTS', {}).get(kind, DEFAULT_WEIGHTS[kind]))
+
+
+def event_score(when, kind, count=1):
+    """ln() of the epoch-scaled weight of `count` events of `kind` at `when`."""
+    # A zero weight would be ln(0); treat it as negligible instead
+    return (when - EPOCH).total_seconds() / _tau() + math.log(max(weight(kind) * count, 1e-9))
+
+
+def _logaddexp(a, b):
+    """ln(e^a + e^b) without overflowing."""
+    if a < b:
+        a, b = b, a
+    return a + math.log1p(math.exp(b - a))
+
+
+def _per_project(scores):
+    return Case(
+        *[When(pk=pk, then=Value(score)) for pk, score in scores.items()],
+        output_field=FloatField(),
+    )
+
+
+def _add_events(scores):
+    """Fold per-project event scores into trending_score with one UPDATE."""
+    if not scores:
+        return
+    event = _per_project(scores)
+    high = Greatest(F('trending_score'), event)
+    low = Least(F('trending_score'), event)
+    Project.objects.filter(pk__in=list(scores)).update(
+        trending_score=high + Ln(Value(1.0) + Exp(low - high))
+    )
+
+
+def record_views(project_counts, when=None):
+    """Add newly recorded views, given as {project_id: number of new views}."""
+    when = when or timezone.now()
+    _add_events({pk: event_score(when, 'view', n) for pk, n in project_counts.items() if n > 0})
+
+
+def record_like(project_id, when=None):
+    _add_events({project_id: event_score(when or timezone.now(), 'like')})
+
+
+def remove_like(project_id, liked_at):
+    """Take back a like's contribution: ln(e^S - e^x), floored so it never goes to -inf."""
+    event = Value(event_score(liked_at, 'like'))
+    Project.objects.filter(pk=project_id).update(
+        trending_score=F('trending_score') + Ln(Greatest(Value(1.0) - Exp(event - F('trending_score')), Value(1e-9)))
+    )
+
+
+def initial_score(project):
+    """Score of a project with no activity yet: just its creation event."""
+    return event_score(project.created_at, 'new')
+
+
+def trending_projects():
+    """Public projects, hottest first (served by the (visibility, -trending_score) index)."""
+    return Project.objects.filter(visibility='Public').order_by('-trending_score', '-id')
+
+
+def rebuild_scores(batch_size=2000):
+    """Recompute every project's score from its full like/view history. Returns the number of projects."""
+    scores = {}
+    for pk, created_at in Project.objects.values_list('id', 'created_at').iterator(chunk_size=batch_size):
+        scores[pk] = event_score(created_at, 'new')
+
+    history = (
+        (ProjectView.objects.values_list('project_id', 'viewed_at'), 'view'),
+        (ProjectLike.objects.values_list('project_id', 'created_at'), 'like'),
+    )
+    for rows, kind in history:
+        for pk, when in rows.iterator(chunk_size=batch_size):
+            if pk in scores:
+                scores[pk] = _logaddexp(scores[pk], event_score(when, kind))
+
+    # Group into batched CASE updates
+    pks = sorted(scores)
+    for start in range(0, len(pks), 500):
+        batch = {pk: scores[pk] for pk in pks[start:start + 500]}
+        Project.objects.filter(pk__in=list(batch)).update(trending_score=_per_project(batch))
+    return len(scores)
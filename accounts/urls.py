@@ -2,17 +2,18 @@ from django.urls import path
 
 from . import views
 from .home_view import home
-from .admin_views import (admin_home, admin_projects, admin_profiles, 
+from .admin_views import (admin_home, admin_projects, admin_profiles, export_data, import_students,
                           student_projects_api, student_project_details, public_student_projects)
 from .student_views import (student_home, student_projects, delete_project, 
-                          record_project_view, toggle_project_like, edit_project, 
+                          record_project_view, record_project_views, toggle_project_like, edit_project, 
                           remove_from_recent_uploads)
-from .notification_views import student_project_detail, toggle_follow, notifications, send_hire_notification, notifications_unread_json
+from .notification_views import student_project_detail, toggle_follow, notifications, send_hire_notification, notifications_unread_json, notifications_stream
 from .views import student_profile_view, request_follow, handle_follow_request
 from .recruiter_views import (recruiter_register_view, create_recruiter_order, 
                             complete_recruiter_registration, recruiter_home,
                             toggle_save_student, view_student_profile, view_project_details,
-                            saved_profiles, initiate_hiring_process, browse_talent, student_projects)
+                            saved_profiles, initiate_hiring_process, browse_talent, browse_talent_more,
+                            student_projects, search_projects, trending_projects_feed)
 
 urlpatterns = [
     # Student profile URLs
@@ -23,10 +24,13 @@ urlpatterns = [
     path('logout/', views.logout_view, name='logout'),
     path('add-student/', views.add_student, name='add_student'),
     path('developers/', public_student_projects, name='public_student_projects'),
+    path('developers/page/<int:page>/', public_student_projects, name='public_student_projects_page'),
     path('home/', home, name='home'),
     path('admin-home/', admin_home, name='admin_home'),
     path('admin-projects/', admin_projects, name='admin_projects'),
     path('admin-profiles/', admin_profiles, name='admin_profiles'),
+    path('admin-export/<str:kind>/', export_data, name='export_data'),
+    path('admin-import-students/', import_students, name='import_students'),
     path('student-projects/<int:student_id>/', student_projects_api, name='student_projects_api'),
     path('student/<int:student_id>/projects/', student_project_details, name='student_project_details'),
     path('student-home/', student_home, name='student_home'),
@@ -39,8 +43,10 @@ urlpatterns = [
     path('student/<int:student_id>/follow/', toggle_follow, name='toggle_follow'),
     path('notifications/', notifications, name='notifications'),
     path('notifications/unread-json/', notifications_unread_json, name='notifications_unread_json'),
+    path('notifications/stream/', notifications_stream, name='notifications_stream'),
     path('projects/', student_projects, name='student_projects'),
         path('record-project-view/', record_project_view, name='record_project_view'),
+    path('record-project-views/', record_project_views, name='record_project_views'),
     path('delete-project/<int:project_id>/', delete_project, name='delete_project'),
     path('', views.login_view, name='root'),
     path('recruiter-register/', recruiter_register_view, name='recruiter_register'),
@@ -48,7 +54,10 @@ urlpatterns = [
     path('complete-recruiter-registration/', complete_recruiter_registration, name='complete_recruiter_registration'),
     path('recruiter-home/', recruiter_home, name='recruiter_home'),
     path('recruiter/student-projects/', student_projects, name='recruiter_student_projects'),
+    path('recruiter/projects/search/', search_projects, name='search_projects'),
+    path('recruiter/projects/trending/', trending_projects_feed, name='trending_projects_feed'),
     path('browse/talent/', browse_talent, name='browse_talent'),
+    path('browse/talent/more/', browse_talent_more, name='browse_talent_more'),
     path('saved-profiles/', saved_profiles, name='saved_profiles'),
     path('student/<int:student_id>/save/', toggle_save_student, name='toggle_save_student'),
     path('student/<int:student_id>/recruiter-view/', view_student_profile, name='view_student_profile'),
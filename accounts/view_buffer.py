@@ -0,0 +1,198 @@
+"""
+Write-behind buffer for project views and student profile views.
+
+View events are collected in memory per worker process and written in
+batches by a background thread (and once more at interpreter shutdown):
+
+* ProjectView rows are inserted with ``bulk_create(ignore_conflicts=True)``,
+  ``Project.views_count`` is recounted from them and ``Project.trending_score``
+  is bumped by the rows actually inserted.
+* ``StudentProfile.profile_views`` is bumped with a single ``F()`` update,
+  so concurrent requests can no longer overwrite each other's increments.
+* The leaderboard entries of the students concerned are refreshed once the
+  batch commits (accounts.leaderboard).
+
+Configure with the ``VIEW_BUFFER_FLUSH_INTERVAL`` (seconds, ``0`` writes
+through on every event) and ``VIEW_BUFFER_BATCH_SIZE`` settings.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+
+from . import leaderboard, trending
+from .models import Project, ProjectView, StudentProfile
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_BATCH_SIZE = 500
+
+
+def _increment(model, field, deltas):
+    """Add per-row deltas to `field` with one UPDATE statement."""
+    if not deltas:
+        return
+    model.objects.filter(pk__in=list(deltas)).update(**{
+        field: F(field) + Case(
+            *[When(pk=pk, then=Value(n)) for pk, n in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    })
+
+
+def _view_counts(project_ids):
+    """{project_id: number of ProjectView rows} for `project_ids`."""
+    return dict(
+        ProjectView.objects.filter(project_id__in=project_ids)
+        .values_list('project_id').annotate(n=Count('id')).order_by()
+    )
+
+
+def _existing_views(project_ids, user_ids):
+    return set(ProjectView.objects.filter(
+        project_id__in=project_ids, user_id__in=user_ids
+    ).values_list('project_id', 'user_id'))
+
+
+def write_project_views(pairs):
+    """
+    Insert ProjectView rows for the (project_id, user_id) pairs that don't
+    exist yet and bring views_count up to date for them. Returns the pairs
+    that were missing when checked.
+    """
+    project_ids = {p for p, _ in pairs}
+    user_ids = {u for _, u in pairs}
+    with transaction.atomic():
+        # Lock the projects in id order: a concurrent flush or batch request
+        # for the same projects waits here instead of counting the same views.
+        live = set(Project.objects.select_for_update().filter(id__in=project_ids)
+                   .order_by('id').values_list('id', flat=True))
+        existing = _existing_views(live, user_ids)
+        new = [(p, u) for p, u in pairs if p in live and (p, u) not in existing]
+        if not new:
+            return new
+        touched = {p for p, _ in new}
+        before = _view_counts(touched)
+        ProjectView.objects.bulk_create(
+            [ProjectView(project_id=p, user_id=u) for p, u in new],
+            ignore_conflicts=True,
+        )
+        after = _view_counts(touched)
+        # Count only the rows actually inserted; ignore_conflicts drops the
+        # ones another writer added since the check above.
+        new_views = Counter({p: after.get(p, 0) - before.get(p, 0) for p in touched})
+        Project.objects.filter(id__in=touched).update(views_count=Coalesce(Subquery(
+            ProjectView.objects.filter(project=OuterRef('pk'))
+            .order_by().values('project').annotate(n=Count('id')).values('n')
+        ), Value(0)))
+        trending.record_views(new_views)
+        leaderboard.schedule_refresh(*Project.objects.filter(id__in=touched).values_list('student_id', flat=True))
+    return new
+
+
+class ViewBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._project_views = set()
+        self._profile_views = Counter()
+        self._thread = None
+        self._pid = None
+        self._atexit_registered = False
+
+    @property
+    def flush_interval(self):
+        return float(getattr(settings, 'VIEW_BUFFER_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL))
+
+    @property
+    def batch_size(self):
+        return max(1, int(getattr(settings, 'VIEW_BUFFER_BATCH_SIZE', DEFAULT_BATCH_SIZE)))
+
+    def record_project_view(self, project_id, user_id):
+        with self._lock:
+            self._project_views.add((project_id, user_id))
+            pending = len(self._project_views)
+        self._after_record(pending)
+
+    def record_profile_view(self, student_id):
+        with self._lock:
+            self._profile_views[student_id] += 1
+            pending = len(self._profile_views)
+        self._after_record(pending)
+
+    def pending(self):
+        """Return a snapshot of (project view pairs, profile view counts) not yet written."""
+        with self._lock:
+            return set(self._project_views), Counter(self._profile_views)
+
+    def _after_record(self, pending):
+        if self.flush_interval <= 0:
+            self.flush()
+            return
+        self._ensure_worker()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def _ensure_worker(self):
+        # Threads don't survive fork(), so a pre-forking server gets one
+        # flusher per worker the first time that worker records a view.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='view-buffer-flusher', daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Write all buffered events. Returns the number of events written."""
+        with self._lock:
+            project_views, self._project_views = self._project_views, set()
+            profile_views, self._profile_views = self._profile_views, Counter()
+        if not project_views and not profile_views:
+            return 0
+
+        try:
+            with transaction.atomic():
+                self._write_project_views(project_views)
+                _increment(StudentProfile, 'profile_views', profile_views)
+                leaderboard.schedule_refresh(*profile_views)
+        except Exception:
+            # Put the events back so the next flush retries them.
+            with self._lock:
+                self._project_views |= project_views
+                self._profile_views.update(profile_views)
+            logger.exception('Failed to flush buffered view events')
+            return 0
+        return len(project_views) + sum(profile_views.values())
+
+    def _write_project_views(self, pairs):
+        size = self.batch_size
+        pairs = sorted(pairs)
+        for start in range(0, len(pairs), size):
+            write_project_views(pairs[start:start + size])
+
+
+view_buffer = ViewBuffer()
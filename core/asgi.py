@@ -3,6 +3,13 @@ ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serving the project through this module (instead of core.wsgi) enables the
+Server-Sent Events notification stream at /accounts/notifications/stream/,
+e.g. with: gunicorn core.asgi:application -k uvicorn.workers.UvicornWorker
+The stream's pub/sub is in-process, so run a single worker process to push
+every event; with more workers, streams fall back to re-checking the shared
+unread-count cache on each keepalive.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
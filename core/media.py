@@ -0,0 +1,155 @@
+"""
+Serving of user uploads under MEDIA_URL, replacing django.views.static.serve.
+
+Files are streamed with FileResponse (wsgi.file_wrapper / sendfile where the
+server supports it). The view answers single-range ``Range`` requests with
+206, and conditional requests (``If-None-Match`` / ``If-Modified-Since``) with
+304, using an ETag built from the file's size and mtime.
+
+Names that contain a content hash (``derivatives/<sha256>/...`` or
+``name.<hash>.ext``) can never change, so they are sent with a year-long
+``immutable`` Cache-Control. Everything else may be replaced and gets
+MEDIA_CACHE_MAX_AGE plus revalidation.
+
+Behind nginx or Apache, set MEDIA_SENDFILE to 'x-accel-redirect' or
+'x-sendfile' and the view only checks the path and sets headers, leaving the
+proxy to send the bytes. For nginx, MEDIA_ACCEL_PREFIX must map to an
+``internal`` location aliased to MEDIA_ROOT.
+"""
+import mimetypes
+import os
+import re
+import stat
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_safe
+
+HASHED_NAME = re.compile(r'(?:^|/)[0-9a-f]{16,}(?:/|\.[^/]+$)|\.[0-9a-f]{12,}\.[^./]+$')
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+class _RangeFile:
+    """Read-only view of `length` bytes of an open file, starting at `start`."""
+
+    def __init__(self, f, start, length):
+        f.seek(start)
+        self.f = f
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def _byte_range(header, size):
+    """(start, end) inclusive for a single-range header, None to ignore it, or 'unsatisfiable'."""
+    match = RANGE.match(header.strip())
+    if not match:
+        # Multiple ranges or other units: send the whole file
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0:
+            return 'unsatisfiable'
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return 'unsatisfiable'
+    return start, end
+
+
+def _set_headers(response, headers):
+    for name, value in headers.items():
+        response[name] = value
+
+
+def cache_control(path):
+    if HASHED_NAME.search(path):
+        return IMMUTABLE
+    return f"public, max-age={getattr(settings, 'MEDIA_CACHE_MAX_AGE', 3600)}"
+
+
+@require_safe
+def serve_media(request, path):
+    # Paths escaping MEDIA_ROOT raise SuspiciousFileOperation (a 400)
+    fullpath = safe_join(settings.MEDIA_ROOT, path)
+    try:
+        st = os.stat(fullpath)
+    except OSError:
+        raise Http404('No such file')
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404('No such file')
+
+    etag = quote_etag(f'{st.st_mtime_ns:x}-{st.st_size:x}')
+    last_modified = int(st.st_mtime)
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(last_modified),
+        'Cache-Control': cache_control(path),
+        'Accept-Ranges': 'bytes',
+    }
+
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        _set_headers(not_modified, headers)
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+
+    mode = getattr(settings, 'MEDIA_SENDFILE', '')
+    if mode:
+        response = HttpResponse(content_type=content_type)
+        if mode == 'x-accel-redirect':
+            prefix = getattr(settings, 'MEDIA_ACCEL_PREFIX', '/internal-media/')
+            response['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + path.lstrip('/')
+        else:
+            response['X-Sendfile'] = fullpath
+        # The proxy handles Range itself
+        _set_headers(response, headers)
+        return response
+
+    byte_range = None
+    range_header = request.META.get('HTTP_RANGE')
+    # If-Range: only honour the range if the client's copy is still current
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if range_header and (not if_range or if_range in (etag, headers['Last-Modified'])):
+        byte_range = _byte_range(range_header, st.st_size)
+
+    if byte_range == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{st.st_size}'
+        _set_headers(response, headers)
+        return response
+
+    f = open(fullpath, 'rb')
+    if byte_range is None:
+        response = FileResponse(f, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(_RangeFile(f, start, end - start + 1), content_type=content_type, status=206)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = f'bytes {start}-{end}/{st.st_size}'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    _set_headers(response, headers)
+    return response
@@ -201,6 +201,33 @@ DATABASES = {
 }
 
 
+# Cache
+# Defaults to a per-process local-memory cache. Point DJANGO_CACHE_BACKEND /
+# DJANGO_CACHE_LOCATION at a shared cache (e.g. Redis or the database cache)
+# when running several workers so invalidations are seen by all of them.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'vts-coder'),
+    }
+}
+
+# Seconds a cached unread-notification count may be served before it is
+# recomputed, in case an invalidation was missed by another worker's cache.
+NOTIFICATION_CACHE_TIMEOUT = int(os.environ.get('NOTIFICATION_CACHE_TIMEOUT', '60'))
+
+# Seconds the cached course/year/tag filter options (accounts.facets) are kept.
+# Saves and deletes invalidate them immediately; this only bounds staleness for
+# bulk updates and other workers' per-process caches.
+FACET_CACHE_TIMEOUT = int(os.environ.get('FACET_CACHE_TIMEOUT', '3600'))
+
+# Server-Sent Events notification stream (ASGI only). A comment line is sent
+# every NOTIFICATION_STREAM_KEEPALIVE seconds, and streams are closed after
+# NOTIFICATION_STREAM_MAX_AGE seconds so clients reconnect.
+NOTIFICATION_STREAM_KEEPALIVE = int(os.environ.get('NOTIFICATION_STREAM_KEEPALIVE', '25'))
+NOTIFICATION_STREAM_MAX_AGE = int(os.environ.get('NOTIFICATION_STREAM_MAX_AGE', '300'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -245,6 +272,63 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# /media/ is served by core.media.serve_media. Files whose names contain a
+# content hash are cached for a year; others for MEDIA_CACHE_MAX_AGE seconds.
+# Behind nginx/Apache set MEDIA_SENDFILE to 'x-accel-redirect' (with an
+# internal location at MEDIA_ACCEL_PREFIX aliased to MEDIA_ROOT) or
+# 'x-sendfile' to let the proxy send the files.
+MEDIA_CACHE_MAX_AGE = int(os.environ.get('MEDIA_CACHE_MAX_AGE', '3600'))
+MEDIA_SENDFILE = os.environ.get('MEDIA_SENDFILE', '')
+MEDIA_ACCEL_PREFIX = os.environ.get('MEDIA_ACCEL_PREFIX', '/internal-media/')
+
+# Write-behind buffer for project/profile view events (accounts.view_buffer).
+# Events are flushed every VIEW_BUFFER_FLUSH_INTERVAL seconds, or sooner once
+# VIEW_BUFFER_BATCH_SIZE events are pending. Set the interval to 0 to write
+# every event immediately.
+VIEW_BUFFER_FLUSH_INTERVAL = float(os.environ.get('VIEW_BUFFER_FLUSH_INTERVAL', '5'))
+VIEW_BUFFER_BATCH_SIZE = int(os.environ.get('VIEW_BUFFER_BATCH_SIZE', '500'))
+
+# Top-students leaderboard on the recruiter dashboard (accounts.leaderboard).
+# Each student's score is the weighted sum of these totals. Entries are refreshed
+# as projects, follows, likes and views change (by a background thread, batching
+# the changes made within LEADERBOARD_REFRESH_DELAY seconds; 0 refreshes inline
+# after each commit). `manage.py refresh_leaderboard` recomputes every student.
+LEADERBOARD_WEIGHTS = {
+    'project_count': float(os.environ.get('LEADERBOARD_WEIGHT_PROJECTS', '10')),
+    'project_views': float(os.environ.get('LEADERBOARD_WEIGHT_PROJECT_VIEWS', '1')),
+    'project_likes': float(os.environ.get('LEADERBOARD_WEIGHT_PROJECT_LIKES', '3')),
+    'profile_views': float(os.environ.get('LEADERBOARD_WEIGHT_PROFILE_VIEWS', '0.5')),
+    'followers': float(os.environ.get('LEADERBOARD_WEIGHT_FOLLOWERS', '2')),
+}
+LEADERBOARD_REFRESH_DELAY = float(os.environ.get('LEADERBOARD_REFRESH_DELAY', '5'))
+
+# Trending projects (accounts.trending): every like, view and the project's
+# creation add their weight, decaying with the given half-life. Changing these
+# only affects new events until `manage.py rebuild_trending` is run.
+TRENDING_HALF_LIFE_HOURS = float(os.environ.get('TRENDING_HALF_LIFE_HOURS', '48'))
+TRENDING_WEIGHTS = {
+    'view': float(os.environ.get('TRENDING_WEIGHT_VIEW', '1')),
+    'like': float(os.environ.get('TRENDING_WEIGHT_LIKE', '3')),
+    'new': float(os.environ.get('TRENDING_WEIGHT_NEW', '2')),
+}
+
+# Pre-rendered /developers/ pages for anonymous visitors (accounts.developer_snapshots).
+# When enabled, pages are re-rendered into DEVELOPERS_SNAPSHOT_ROOT as profiles and
+# projects change (by a background thread, batching the changes made within
+# DEVELOPERS_SNAPSHOT_DELAY seconds; 0 re-renders inline after each commit).
+# `manage.py rebuild_developer_snapshots` renders all of them.
+DEVELOPERS_SNAPSHOTS = os.environ.get('DEVELOPERS_SNAPSHOTS', 'False') == 'True'
+DEVELOPERS_SNAPSHOT_ROOT = os.environ.get('DEVELOPERS_SNAPSHOT_ROOT', str(BASE_DIR / 'snapshots' / 'developers'))
+DEVELOPERS_SNAPSHOT_DELAY = float(os.environ.get('DEVELOPERS_SNAPSHOT_DELAY', '2'))
+
+# Processes used to hash passwords during bulk student imports
+# (accounts.student_import); 0 means one per CPU.
+STUDENT_IMPORT_WORKERS = int(os.environ.get('STUDENT_IMPORT_WORKERS', '0'))
+
+# Background threads generating resized screenshot/avatar/logo derivatives on
+# upload (accounts.image_derivatives); 0 generates them inline instead.
+IMAGE_DERIVATIVE_WORKERS = int(os.environ.get('IMAGE_DERIVATIVE_WORKERS', '2'))
+
 # Production security settings controlled by environment variables.
 # Use environment variables on Render to enable these (don't enable blindly in local dev).
 SECURE_SSL_REDIRECT = os.environ.get('SECURE_SSL_REDIRECT', 'False') == 'True'
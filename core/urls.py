@@ -1,6 +1,4 @@
-from django.conf import settings
 from django.conf.urls.static import static
-from django.views.static import serve
 from django.urls import re_path
 """
 URL configuration for core project.
@@ -20,6 +18,7 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from core.media import serve_media
 from core.views import health, maintenance
 
 urlpatterns = [
@@ -34,5 +33,5 @@ urlpatterns = [
 ]
 
 urlpatterns += [
-    re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
+    re_path(r'^media/(?P<path>.*)$', serve_media),
 ]
@@ -1,14 +1,27 @@
 (function(){
     const POLL_INTERVAL = 3000; // 3 seconds - short polling for near-instant updates
     const endpoint = '/accounts/notifications/unread-json/';
+    // Server-Sent Events push channel (ASGI only). When it is unavailable the
+    // server answers 204/403 and we fall back to polling `endpoint`.
+    const streamEndpoint = '/accounts/notifications/stream/';
 
-    function xhrGetJson(url){
-        return fetch(url, {
+    // Conditional polling state: the server answers 304 while `etag` is
+    // current, and `sinceId` limits responses to notifications we haven't seen.
+    let etag = null;
+    let sinceId = 0;
+
+    function pollUnread(){
+        const headers = {'X-Requested-With': 'XMLHttpRequest'};
+        if(etag) headers['If-None-Match'] = etag;
+        return fetch(`${endpoint}?since_id=${sinceId}`, {
             credentials: 'same-origin',
-            headers: {
-                'X-Requested-With': 'XMLHttpRequest'
-            }
-        }).then(r => r.json());
+            cache: 'no-store',
+            headers: headers
+        }).then(r => {
+            if(r.status === 304) return null;
+            etag = r.headers.get('ETag');
+            return r.json();
+        });
     }
 
     function updateBadge(count){
@@ -81,21 +94,27 @@
 
     let lastSeenIds = new Set();
 
+    function prependNotifications(notifications){
+        const listGroup = document.querySelector('.list-group');
+        if(!listGroup) return;
+        // prepend any notification ids we haven't seen yet
+        notifications.slice().reverse().forEach(n => {
+            if(!lastSeenIds.has(n.id)){
+                const node = renderNotificationItem(n);
+                listGroup.insertBefore(node, listGroup.firstChild);
+                lastSeenIds.add(n.id);
+            }
+        });
+    }
+
     function poll(){
-        xhrGetJson(endpoint).then(data => {
+        pollUnread().then(data => {
             if(!data || !data.success) return;
             updateBadge(data.unread_count);
 
-            const listGroup = document.querySelector('.list-group');
-            if(listGroup && Array.isArray(data.notifications) && data.notifications.length){
-                // prepend any notification ids we haven't seen yet
-                data.notifications.reverse().forEach(n => {
-                    if(!lastSeenIds.has(n.id)){
-                        const node = renderNotificationItem(n);
-                        listGroup.insertBefore(node, listGroup.firstChild);
-                        lastSeenIds.add(n.id);
-                    }
-                });
+            if(Array.isArray(data.notifications) && data.notifications.length){
+                prependNotifications(data.notifications);
+                sinceId = Math.max(sinceId, ...data.notifications.map(n => n.id));
             }
         }).catch(err => {
             console.error('Notifications poll error', err);
@@ -104,10 +123,41 @@
         });
     }
 
-    // Start polling after DOM ready
+    function listen(){
+        let opened = false;
+        const source = new EventSource(streamEndpoint, {withCredentials: true});
+        source.onopen = () => { opened = true; };
+        source.onmessage = (e) => {
+            let data;
+            try { data = JSON.parse(e.data); } catch(err) { return; }
+            if(typeof data.unread_count === 'number') updateBadge(data.unread_count);
+            if(data.notification) prependNotifications([data.notification]);
+        };
+        source.onerror = () => {
+            // EventSource reconnects by itself after a dropped connection.
+            // CLOSED means the server refused the stream (e.g. 204 under
+            // WSGI), so switch to polling.
+            if(source.readyState === EventSource.CLOSED || !opened){
+                source.close();
+                poll();
+            }
+        };
+    }
+
+    function start(){
+        // Only users who see the notification bell get updates.
+        if(!document.querySelector('.notification-btn')) return;
+        if(window.EventSource){
+            listen();
+        } else {
+            poll();
+        }
+    }
+
+    // Start after DOM ready
     if(document.readyState === 'loading'){
-        document.addEventListener('DOMContentLoaded', poll);
+        document.addEventListener('DOMContentLoaded', start);
     } else {
-        poll();
+        start();
     }
 })();